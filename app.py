@@ -5,8 +5,12 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 import streamlit as st
+import altair as alt
 import joblib
 from src.datascience.utils.common import dvc_pull_once
+from src.datascience.utils.serving import (
+    WIND_DIRECTION, predict_once, prepare_batch, score_batch, score_grid, what_if_grid
+)
 
 MODEL_PATH = "artifacts/model_trainer/best_model.joblib"
 
@@ -20,6 +24,10 @@ if not Path(MODEL_PATH).exists():
 DEFAULT_MODEL_PATH = "artifacts/model_trainer/best_model.joblib"
 DEFAULT_FEATURES_PATH = "artifacts/model_trainer/feature_names.json"
 
+# Rows scored per predict call in the batch tab, and rows shown in its preview
+BATCH_CHUNK_SIZE = 50_000
+BATCH_PREVIEW_ROWS = 1_000
+
 DEFAULT_FEATURES = [
     "surface_pressure_avg",
     "temperature_2m_avg",
@@ -33,7 +41,8 @@ DEFAULT_FEATURES = [
 ]
 
 @st.cache_resource
-def load_model(model_path: str):
+def load_model(model_path: str, version: str):
+    # version is only part of the cache key, so a replaced model file is loaded again
     return joblib.load(model_path)
 
 def load_feature_names(path: str | Path) -> list[str]:
@@ -45,24 +54,26 @@ def load_feature_names(path: str | Path) -> list[str]:
             pass
     return DEFAULT_FEATURES
 
+def model_version(model_path: str) -> str:
+    # Changes whenever the model file is replaced, so cached sweeps of an older model are not reused
+    stat = os.stat(model_path)
+    return f"{model_path}:{stat.st_mtime_ns}:{stat.st_size}"
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def what_if_scores(version: str, row: dict, features: list[str], axes: dict, _model):
+    grid, X = what_if_grid(row, features, axes)
+    scores, is_prob = score_grid(_model, X)
+    return grid, scores, is_prob
+
+def read_batch(uploaded) -> pd.DataFrame:
+    if uploaded.name.lower().endswith(".parquet"):
+        return pd.read_parquet(uploaded)
+    return pd.read_csv(uploaded)
+
 def compute_wind_components(deg: float) -> tuple[float, float]:
     rad = math.radians(deg % 360.0)
     return math.sin(rad), math.cos(rad)
 
-def predict_once(model, row: dict, features: list[str]):
-    df = pd.DataFrame([row]).apply(pd.to_numeric, errors="coerce")
-    df = df.reindex(columns=features, fill_value=0.0)
-    y = model.predict(df)[0]
-    score = None
-    is_prob = False
-    if hasattr(model, "predict_proba"):
-        score = float(model.predict_proba(df)[:, 1][0])
-        is_prob = True
-    elif hasattr(model, "decision_function"):
-        score = float(model.decision_function(df)[0])
-        is_prob = False
-    return int(y), score, is_prob, df
-
 st.set_page_config(page_title="Rain Prediction", page_icon="🌧️", layout="centered")
 
 st.markdown(
@@ -111,7 +122,7 @@ st.sidebar.markdown(
 )
 
 try:
-    model = load_model(model_path)
+    model = load_model(model_path, model_version(model_path))
     st.sidebar.success("Model loaded")
 except Exception as e:
     st.sidebar.error(f"Failed to load model: {e}")
@@ -119,63 +130,197 @@ except Exception as e:
 
 FEATURES = load_feature_names(features_path)
 
-st.markdown('<div class="bubble user">', unsafe_allow_html=True)
-st.subheader("Input features")
+tab_single, tab_batch = st.tabs(["Single prediction", "Batch scoring"])
+
+with tab_single:
+    st.markdown('<div class="bubble user">', unsafe_allow_html=True)
+    st.subheader("Input features")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        surface_pressure_avg = st.number_input("surface_pressure_avg", value=0.0, step=0.01)
+        temperature_2m_avg = st.number_input("temperature_2m_avg", value=0.0, step=0.01)
+        daily_sunshine = st.number_input(
+            "daily_sunshine", value=0.0, step=0.01,
+        )
+        daily_et0 = st.number_input("daily_et0_fao_evapotranspiration", value=0.0, step=0.01)
+
+    with col2:
+        relative_humidity_2m_avg = st.number_input("relative_humidity_2m_avg", value=0.0, step=0.01)
+        cloud_cover_avg = st.number_input("cloud_cover_avg", value=0.0, step=0.01)
+        wind_speed_10m_avg = st.number_input(
+            "wind_speed_10m_avg", value=0.0, step=0.01,
+        )
+        wind_deg = st.slider("wind_direction (degrees)", min_value=0, max_value=359, value=0)
+
+    wind_sin, wind_cos = compute_wind_components(wind_deg)
+
+    row = {
+        "surface_pressure_avg": surface_pressure_avg,
+        "temperature_2m_avg": temperature_2m_avg,
+        "daily_sunshine": daily_sunshine,
+        "daily_et0_fao_evapotranspiration": daily_et0,
+        "relative_humidity_2m_avg": relative_humidity_2m_avg,
+        "cloud_cover_avg": cloud_cover_avg,
+        "wind_speed_10m_avg": wind_speed_10m_avg,
+        "wind_dir_sin": wind_sin,
+        "wind_dir_cos": wind_cos,
+    }
+
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    with st.expander("Show input row (dict)"):
+        st.json(row)
 
-col1, col2 = st.columns(2)
+    if st.button("Predict"):
+        try:
+            label, score, is_prob, df_used = predict_once(model, row, FEATURES)
+            st.markdown('<div class="bubble assistant">', unsafe_allow_html=True)
+            st.markdown(
+                f"**Prediction:** {'🌧️ Rain' if int(label)==1 else '🌤️ No rain'}"
+            )
+            if score is not None:
+                if is_prob:
+                    st.write(f"**Probability of rain:** {100 * score:.2f}%")
+                else:
+                    st.write(f"**Decision score:** {score:.3f}")
+            st.markdown('</div>', unsafe_allow_html=True)
+            with st.expander("Show DataFrame passed to model (enforced order)"):
+                st.dataframe(df_used)
+        except Exception as e:
+            st.error(f"Prediction failed: {e}")
+
+    st.subheader("What-if sensitivity")
+    st.caption("How the prediction responds when one or two features move around the input row above.")
 
-with col1:
-    surface_pressure_avg = st.number_input("surface_pressure_avg", value=0.0, step=0.01)
-    temperature_2m_avg = st.number_input("temperature_2m_avg", value=0.0, step=0.01)
-    daily_sunshine = st.number_input(
-        "daily_sunshine", value=0.0, step=0.01,
+    wind_available = "wind_dir_sin" in FEATURES and "wind_dir_cos" in FEATURES
+    options = [feat for feat in FEATURES if feat not in ("wind_dir_sin", "wind_dir_cos")]
+    options += [WIND_DIRECTION] if wind_available else []
+    varied = st.multiselect(
+        "Features to vary", options, default=[options[0]] if options else [], max_selections=2
     )
-    daily_et0 = st.number_input("daily_et0_fao_evapotranspiration", value=0.0, step=0.01)
 
-with col2:
-    relative_humidity_2m_avg = st.number_input("relative_humidity_2m_avg", value=0.0, step=0.01)
-    cloud_cover_avg = st.number_input("cloud_cover_avg", value=0.0, step=0.01)
-    wind_speed_10m_avg = st.number_input(
-        "wind_speed_10m_avg", value=0.0, step=0.01,
+    if varied:
+        col1, col2 = st.columns(2)
+        with col1:
+            # Features are standardized, so the span is in standard deviations
+            span = st.slider("Range around the current value", 0.5, 5.0, 3.0, step=0.5)
+        with col2:
+            max_points = 500 if len(varied) == 1 else 100
+            points = st.slider("Points per feature", 10, max_points, min(200, max_points) if len(varied) == 1 else 50)
+
+        current = {**row, WIND_DIRECTION: float(wind_deg)}
+        axes = {}
+        for feat in varied:
+            if feat == WIND_DIRECTION:
+                axes[feat] = np.linspace(0.0, 360.0, points, endpoint=False)
+            else:
+                axes[feat] = np.linspace(current[feat] - span, current[feat] + span, points)
+
+        try:
+            grid, scores, is_prob = what_if_scores(model_version(model_path), row, FEATURES, axes, model)
+        except Exception as e:
+            # No st.stop() here, it would also hide the batch tab
+            st.error(f"Sensitivity sweep failed: {e}")
+            grid = None
+
+        if grid is not None:
+            score_name = "rain_probability" if is_prob else "decision_score"
+            grid[score_name] = scores
+            if len(varied) == 1:
+                feat = varied[0]
+                line = alt.Chart(grid).mark_line().encode(
+                    x=alt.X(f"{feat}:Q", title=feat),
+                    y=alt.Y(f"{score_name}:Q", title=score_name, scale=alt.Scale(domain=[0, 1]) if is_prob else alt.Undefined),
+                )
+                marker = alt.Chart(pd.DataFrame({feat: [current[feat]]})).mark_rule(strokeDash=[4, 4]).encode(x=f"{feat}:Q")
+                st.altair_chart(line + marker)
+            else:
+                x, y = varied
+                heatmap = alt.Chart(grid).mark_rect().encode(
+                    x=alt.X(f"{x}:Q", bin=alt.Bin(maxbins=points), title=x),
+                    y=alt.Y(f"{y}:Q", bin=alt.Bin(maxbins=points), title=y),
+                    color=alt.Color(f"mean({score_name}):Q", title=score_name, scale=alt.Scale(scheme="blues")),
+                    tooltip=[f"{x}:Q", f"{y}:Q", f"{score_name}:Q"],
+                )
+                marker = alt.Chart(pd.DataFrame({x: [current[x]], y: [current[y]]})).mark_point(
+                    color="red", size=80, filled=True
+                ).encode(x=f"{x}:Q", y=f"{y}:Q")
+                st.altair_chart(heatmap + marker)
+            st.caption(f"{len(grid):,} points scored in one batch.")
+
+with tab_batch:
+    st.subheader("Score a file")
+    st.caption(
+        "CSV or Parquet file with the transformed feature columns; any other columns "
+        "(e.g. date or station) are kept in the results."
     )
-    wind_deg = st.slider("wind_direction (degrees)", min_value=0, max_value=359, value=0)
-
-wind_sin, wind_cos = compute_wind_components(wind_deg)
-
-row = {
-    "surface_pressure_avg": surface_pressure_avg,
-    "temperature_2m_avg": temperature_2m_avg,
-    "daily_sunshine": daily_sunshine,
-    "daily_et0_fao_evapotranspiration": daily_et0,
-    "relative_humidity_2m_avg": relative_humidity_2m_avg,
-    "cloud_cover_avg": cloud_cover_avg,
-    "wind_speed_10m_avg": wind_speed_10m_avg,
-    "wind_dir_sin": wind_sin,
-    "wind_dir_cos": wind_cos,
-}
-
-st.markdown("</div>", unsafe_allow_html=True)
-
-with st.expander("Show input row (dict)"):
-    st.json(row)
-
-if st.button("Predict"):
-    try:
-        label, score, is_prob, df_used = predict_once(model, row, FEATURES)
-        st.markdown('<div class="bubble assistant">', unsafe_allow_html=True)
-        st.markdown(
-            f"**Prediction:** {'🌧️ Rain' if int(label)==1 else '🌤️ No rain'}"
+    uploaded = st.file_uploader("Upload a file", type=["csv", "parquet"])
+
+    if uploaded is not None:
+        # Streamlit reruns the script on every widget change, score each file and model only once.
+        # file_id changes with every upload, model_version whenever the model file is replaced
+        batch_key = (uploaded.file_id, model_version(model_path))
+        if st.session_state.get("batch_key") != batch_key:
+            try:
+                data = read_batch(uploaded)
+                X, valid = prepare_batch(data, FEATURES)
+            except Exception as e:
+                st.error(f"Invalid file: {e}")
+                st.stop()
+
+            valid_rows = np.flatnonzero(valid)
+            labels = np.full(len(X), np.nan)
+            scores = np.full(len(X), np.nan)
+            is_prob = hasattr(model, "predict_proba")
+            progress = st.progress(0.0, text="Scoring...")
+            try:
+                scored = 0
+                for done, chunk_labels, chunk_scores in score_batch(model, X.iloc[valid_rows], BATCH_CHUNK_SIZE):
+                    rows = valid_rows[scored:done]
+                    labels[rows] = chunk_labels
+                    if chunk_scores is not None:
+                        scores[rows] = chunk_scores
+                    scored = done
+                    progress.progress(done / len(valid_rows), text=f"Scored {done:,} of {len(valid_rows):,} rows")
+            except Exception as e:
+                st.error(f"Scoring failed: {e}")
+                st.stop()
+            progress.empty()
+
+            results = data.copy()
+            results["prediction"] = pd.Series(labels, index=results.index).astype("Int64")
+            results["rain_probability" if is_prob else "decision_score"] = scores
+            st.session_state["batch_key"] = batch_key
+            st.session_state["batch_results"] = results
+            st.session_state["batch_downloads"] = {}
+
+        results = st.session_state["batch_results"]
+        n_valid = int(results["prediction"].notna().sum())
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Rows", f"{len(results):,}")
+        col2.metric("Scored", f"{n_valid:,}")
+        col3.metric("Predicted rain", f"{results['prediction'].mean():.1%}" if n_valid else "-")
+        if n_valid < len(results):
+            st.warning(f"{len(results) - n_valid:,} rows have missing or non-numeric features and were not scored")
+
+        st.dataframe(results.head(BATCH_PREVIEW_ROWS))
+        if len(results) > BATCH_PREVIEW_ROWS:
+            st.caption(f"Showing the first {BATCH_PREVIEW_ROWS:,} rows, download the file for all of them.")
+
+        file_format = st.radio("Download format", ["CSV", "Parquet"], horizontal=True)
+        downloads = st.session_state["batch_downloads"]
+        if file_format not in downloads:
+            downloads[file_format] = (
+                results.to_csv(index=False).encode() if file_format == "CSV" else results.to_parquet(index=False)
+            )
+        st.download_button(
+            "Download predictions",
+            data=downloads[file_format],
+            file_name=f"{Path(uploaded.name).stem}_predictions.{file_format.lower()}",
+            mime="text/csv" if file_format == "CSV" else "application/octet-stream",
         )
-        if score is not None:
-            if is_prob:
-                st.write(f"**Probability of rain:** {100 * score:.2f}%")
-            else:
-                st.write(f"**Decision score:** {score:.3f}")
-        st.markdown('</div>', unsafe_allow_html=True)
-        with st.expander("Show DataFrame passed to model (enforced order)"):
-            st.dataframe(df_used)
-    except Exception as e:
-        st.error(f"Prediction failed: {e}")
 
 st.markdown(
     '<p class="small">Thanks for using the app :)</p>',
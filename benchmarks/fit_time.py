@@ -0,0 +1,100 @@
+"""
+Fit-time comparison of the ModelTrainer estimator families on a large synthetic dataset.
+
+Each estimator is fitted with a representative configuration from params.yaml on a
+make_classification problem with the same number of features as train.csv, and its fit
+time, predict time and test ROC AUC are reported. Exact RBF SVC scales quadratically, so
+it is skipped above --svc-max-samples.
+
+Usage:
+    python -m benchmarks.fit_time --n-samples 20000 100000
+"""
+
+import argparse
+import time
+from sklearn.datasets import make_classification
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
+from sklearn.kernel_approximation import Nystroem
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+from sklearn.svm import SVC
+
+N_FEATURES = 9
+
+
+def make_estimators() -> dict:
+    return {
+        "logistic_regression": LogisticRegression(C=1.0, max_iter=2000),
+        "random_forest": RandomForestClassifier(n_estimators=300, random_state=42, n_jobs=-1),
+        "svm": SVC(C=1.0, kernel="rbf", probability=True),
+        "hist_gradient_boosting": HistGradientBoostingClassifier(
+            max_iter=500, early_stopping=True, n_iter_no_change=20, random_state=42
+        ),
+        "nystroem_svm": Pipeline([
+            ("nystroem", Nystroem(kernel="rbf", gamma=0.1, n_components=300, random_state=42)),
+            ("clf", LogisticRegression(C=1.0, max_iter=2000))
+        ]),
+    }
+
+
+def make_data(n_samples: int, random_state: int = 42):
+    X, y = make_classification(
+        n_samples=n_samples, n_features=N_FEATURES, n_informative=6, n_redundant=2,
+        weights=[0.6, 0.4], flip_y=0.05, random_state=random_state
+    )
+    return train_test_split(X, y, test_size=0.2, stratify=y, random_state=random_state)
+
+
+def time_estimator(estimator, X_train, X_test, y_train, y_test) -> dict:
+    start = time.perf_counter()
+    estimator.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    y_score = estimator.predict_proba(X_test)[:, 1]
+    predict_seconds = time.perf_counter() - start
+
+    return {
+        "fit_seconds": fit_seconds,
+        "predict_seconds": predict_seconds,
+        "roc_auc": roc_auc_score(y_test, y_score),
+    }
+
+
+def run(n_samples_list, models, svc_max_samples) -> list:
+    rows = []
+    for n_samples in n_samples_list:
+        X_train, X_test, y_train, y_test = make_data(n_samples)
+        for name, estimator in make_estimators().items():
+            if models and name not in models:
+                continue
+            if name == "svm" and n_samples > svc_max_samples:
+                rows.append({"n_samples": n_samples, "model": name, "skipped": True})
+                continue
+            result = time_estimator(estimator, X_train, X_test, y_train, y_test)
+            rows.append({"n_samples": n_samples, "model": name, **result})
+    return rows
+
+
+def print_table(rows):
+    print(f"{'n_samples':>10}  {'model':<24}{'fit (s)':>10}{'predict (s)':>13}{'roc_auc':>9}")
+    for row in rows:
+        if row.get("skipped"):
+            print(f"{row['n_samples']:>10}  {row['model']:<24}{'skipped (quadratic)':>32}")
+            continue
+        print(
+            f"{row['n_samples']:>10}  {row['model']:<24}{row['fit_seconds']:>10.2f}"
+            f"{row['predict_seconds']:>13.3f}{row['roc_auc']:>9.4f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n-samples", type=int, nargs="+", default=[20000, 100000])
+    parser.add_argument("--models", nargs="*", default=None, help="Subset of estimator families to time")
+    parser.add_argument("--svc-max-samples", type=int, default=20000)
+    args = parser.parse_args()
+
+    print_table(run(args.n_samples, args.models, args.svc_max_samples))
@@ -0,0 +1,175 @@
+"""
+Per-worker memory and dispatch overhead of the CV searches, with and without the fold cache.
+
+Modes:
+    dataframe   the trainer before the fold cache: every search gets the train_x/train_y
+                DataFrames and cv=int, so loky pickles the frame to the workers and the
+                folds are split again per search
+    fold_cache  ModelTrainer._prepare_training_data: one contiguous matrix dumped and
+                reloaded with mmap_mode='r', and StratifiedKFold folds shared by all searches
+
+Both modes run the same --searches GridSearchCV calls (a logistic regression grid over C,
+standing in for the estimator families) on a make_classification problem with the width
+of train.csv. Each mode runs in a fresh process, so it starts its own loky worker pool.
+
+Reported per mode:
+    worker_peak_mb      growth of each worker's peak RSS over the searches (max and mean
+                        over workers), i.e. what the data dispatched to it cost
+    dispatch_ms_task    wall time per CV task of the same searches with a DummyClassifier,
+                        whose fit does nothing, so it is the cost of shipping the data and
+                        the fold to a worker and back
+    search_seconds      wall time of the logistic regression searches
+
+Usage:
+    python -m benchmarks.fold_cache --rows 400000 --n-jobs 2
+    python -m benchmarks.fold_cache --rows 400000 --n-jobs 2 --modes fold_cache --dtype float64
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+MODES = ["dataframe", "fold_cache"]
+N_FEATURES = 9
+C_GRID = [0.01, 0.1, 1, 10]
+
+
+def _peak_rss_mb() -> float:
+    from src.datascience.utils.memory import peak_rss_mb
+
+    # VmHWM belongs to the address space and restarts at exec, ru_maxrss (peak_rss_mb) is
+    # inherited from the process that forked the worker, i.e. it starts at the parent's peak
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return peak_rss_mb()
+
+
+def _worker_peak(_) -> tuple:
+    # Long enough for every worker of the pool to pick up a task
+    time.sleep(0.1)
+    return os.getpid(), _peak_rss_mb()
+
+
+def _worker_peaks(n_jobs: int) -> dict:
+    from joblib import Parallel, delayed
+    # By module name, a function of __main__ cannot be unpickled by the loky workers
+    from benchmarks.fold_cache import _worker_peak
+
+    # Same joblib backend and n_jobs as the searches, so it runs on the same worker pool
+    return dict(Parallel(n_jobs=n_jobs)(delayed(_worker_peak)(i) for i in range(4 * n_jobs)))
+
+
+def _make_data(rows: int):
+    import pandas as pd
+    from sklearn.datasets import make_classification
+
+    X, y = make_classification(
+        n_samples=rows, n_features=N_FEATURES, n_informative=6, n_redundant=2,
+        weights=[0.6, 0.4], flip_y=0.05, random_state=42
+    )
+    return pd.DataFrame(X, columns=[f"feature_{i}" for i in range(N_FEATURES)]), pd.Series(y, name="rain")
+
+
+def _run_mode(mode: str, rows: int, searches: int, n_jobs: int, folds: int, dtype: str) -> dict:
+    """
+    Runs in a fresh process: builds the data, warms the worker pool up, runs the searches.
+    """
+    from joblib.externals.loky import get_reusable_executor
+    from sklearn.dummy import DummyClassifier
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.model_selection import GridSearchCV
+    from src.datascience.components.model_training import ModelTrainer
+    from src.datascience.config.configuration import ConfigurationManager
+
+    warnings.filterwarnings("ignore", category=FutureWarning)
+    train_x, train_y = _make_data(rows)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        if mode == "dataframe":
+            X, y, cv = train_x, train_y, folds
+        else:
+            config = ConfigurationManager().get_model_trainer_config()
+            config.root_dir = work_dir
+            config.cross_validation = folds
+            config.fold_cache_dtype = dtype or config.fold_cache_dtype
+            config.score_cache = False
+            config.resume = False
+            trainer = ModelTrainer(config)
+            X, y = trainer._prepare_training_data(train_x, train_y)
+            cv = trainer.cv_folds
+
+        # Workers started and imports done, so the growth below is the searches' data
+        before = _worker_peaks(n_jobs)
+
+        start = time.perf_counter()
+        for _ in range(searches):
+            GridSearchCV(
+                LogisticRegression(max_iter=2000), {"C": C_GRID}, cv=cv, scoring="roc_auc", n_jobs=n_jobs
+            ).fit(X, y)
+        search_seconds = time.perf_counter() - start
+
+        after = _worker_peaks(n_jobs)
+
+        start = time.perf_counter()
+        for _ in range(searches):
+            GridSearchCV(
+                DummyClassifier(), {"strategy": ["prior"] * len(C_GRID)}, cv=cv, scoring="roc_auc", n_jobs=n_jobs
+            ).fit(X, y)
+        dispatch_seconds = time.perf_counter() - start
+
+    # Idle loky workers would otherwise keep this process alive until their timeout
+    get_reusable_executor().shutdown(wait=True)
+
+    growth = [after[pid] - before[pid] for pid in after if pid in before]
+    return {
+        "workers": len(after),
+        "worker_peak_mb_max": max(growth) if growth else float("nan"),
+        "worker_peak_mb_mean": sum(growth) / len(growth) if growth else float("nan"),
+        "dispatch_ms_task": 1000 * dispatch_seconds / (searches * len(C_GRID) * folds),
+        "search_seconds": search_seconds,
+        "data_mb": X.nbytes / 1024 ** 2 if mode == "fold_cache" else train_x.memory_usage(deep=True).sum() / 1024 ** 2,
+    }
+
+
+def run(rows: int, searches: int, n_jobs: int, folds: int, modes: list, dtype: str = None) -> dict:
+    results = {}
+    for mode in modes:
+        # spawn, so every mode starts its own interpreter and loky worker pool
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+            results[mode] = executor.submit(_run_mode, mode, rows, searches, n_jobs, folds, dtype).result()
+        result = results[mode]
+        print(
+            f"{mode:<12}{result['data_mb']:>10.1f}{result['worker_peak_mb_max']:>14.1f}"
+            f"{result['worker_peak_mb_mean']:>14.1f}{result['dispatch_ms_task']:>16.1f}{result['search_seconds']:>12.2f}",
+            flush=True
+        )
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=400_000)
+    parser.add_argument("--searches", type=int, default=3, help="GridSearchCV calls, one per simulated family")
+    parser.add_argument("--n-jobs", type=int, default=2)
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES)
+    parser.add_argument("--dtype", default=None, help="dtype of the fold cache, model_trainer.fold_cache_dtype by default")
+    parser.add_argument("--output", default=None, help="Also write the results to this JSON file")
+    args = parser.parse_args()
+
+    print(f"{args.rows} rows x {N_FEATURES} features, {args.searches} searches, n_jobs={args.n_jobs}")
+    print(f"{'mode':<12}{'data (MB)':>10}{'worker max':>14}{'worker mean':>14}{'dispatch ms':>16}{'seconds':>12}")
+    results = run(args.rows, args.searches, args.n_jobs, args.folds, args.modes, args.dtype)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
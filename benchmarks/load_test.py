@@ -0,0 +1,212 @@
+"""
+End-to-end load test of the ETL and ingestion against local stand-ins.
+
+Starts the mock archive API (benchmarks.mock_open_meteo) with the given latency and error
+rate, and a disposable PostgreSQL (benchmarks.local_postgres) unless --postgres env uses
+the POSTGRES_* variables already set, then runs three phases with the real components:
+
+    extraction   DataExtraction + ETLDataTransformation for --locations coordinates,
+                 --concurrency requests at a time: latency percentiles, throughput, errors
+    loading      DataLoading.create_weather_table + insert_data of every extracted location
+    ingestion    the next --incremental-days are extracted and loaded, then
+                 DataIngestion.ingest_data exports the whole table
+
+Usage:
+    python -m benchmarks.load_test --locations 50 --concurrency 8 --latency-ms 150 --error-rate 0.02
+    python -m benchmarks.load_test --api-url http://127.0.0.1:8085/v1/archive --postgres env
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from dataclasses import replace
+import numpy as np
+import pandas as pd
+import psycopg2
+import requests
+from benchmarks.local_postgres import LocalPostgres
+from benchmarks.mock_open_meteo import MockOpenMeteo
+from src.datascience.components.data_ingestion import DataIngestion
+from src.datascience.components.data_loading import DataLoading
+from src.datascience.components.etl_data_transformation import ETLDataTransformation
+from src.datascience.components.etl_extraction import DataExtraction
+from src.datascience.config.configuration import ConfigurationManager
+from src.datascience.utils.common import get_env
+
+# Distance in degrees between the coordinates of consecutive locations
+GRID_STEP = 0.25
+
+
+def _extract(config) -> dict:
+    start = time.perf_counter()
+    try:
+        data = ETLDataTransformation(None, DataExtraction(config).extract()).transform()
+        return {"seconds": time.perf_counter() - start, "data": data, "error": None}
+    except requests.HTTPError as e:
+        error = str(e.response.status_code)
+    except Exception as e:
+        error = type(e).__name__
+    return {"seconds": time.perf_counter() - start, "data": None, "error": error}
+
+
+def run_extraction(base_config, locations: int, concurrency: int) -> tuple:
+    configs = [
+        replace(base_config, lat=base_config.lat + GRID_STEP * (i // 10), lon=base_config.lon + GRID_STEP * (i % 10))
+        for i in range(locations)
+    ]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(_extract, configs))
+    wall_seconds = time.perf_counter() - start
+
+    latencies = np.array([result["seconds"] for result in results])
+    errors = pd.Series([result["error"] for result in results if result["error"]], dtype=object)
+    frames = [result["data"] for result in results if result["data"] is not None]
+    summary = {
+        "requests": locations,
+        "concurrency": concurrency,
+        "errors": int(len(errors)),
+        "error_rate": len(errors) / locations,
+        "errors_by_kind": errors.value_counts().to_dict(),
+        "latency_p50_s": float(np.percentile(latencies, 50)),
+        "latency_p95_s": float(np.percentile(latencies, 95)),
+        "latency_p99_s": float(np.percentile(latencies, 99)),
+        "requests_per_s": locations / wall_seconds,
+        "rows": int(sum(len(frame) for frame in frames)),
+        "wall_seconds": wall_seconds,
+    }
+    return summary, frames
+
+
+def _table_rows() -> int:
+    connection = psycopg2.connect(
+        host=get_env("POSTGRES_HOST"), port=get_env("POSTGRES_PORT", "5432"), dbname=get_env("POSTGRES_DB"),
+        user=get_env("POSTGRES_USER"), password=get_env("POSTGRES_PASSWORD")
+    )
+    try:
+        with connection.cursor() as cur:
+            cur.execute("SELECT count(*) FROM weather_data")
+            return int(cur.fetchone()[0])
+    finally:
+        connection.close()
+
+
+def run_loading(loading_config, frames: list) -> dict:
+    start = time.perf_counter()
+    for data in frames:
+        loader = DataLoading(config=loading_config, data=data)
+        loader.create_weather_table()
+        loader.insert_data()
+        loader.disconnect()
+    seconds = time.perf_counter() - start
+    rows_sent = sum(len(frame) for frame in frames)
+    return {
+        "rows_sent": rows_sent,
+        # weather_data is keyed by date, so the days of further locations are skipped by ON CONFLICT
+        "rows_in_table": _table_rows(),
+        "seconds": seconds,
+        "rows_per_s": rows_sent / seconds if seconds else float("inf"),
+    }
+
+
+def run_ingestion(extraction_config, loading_config, ingestion_config, incremental_days: int) -> dict:
+    start = time.perf_counter()
+    result = _extract(replace(
+        extraction_config,
+        start_offset_days=incremental_days - 1,
+        end_offset_days=extraction_config.end_offset_days - incremental_days
+    ))
+    extract_seconds = time.perf_counter() - start
+    if result["error"]:
+        raise RuntimeError(f"Extraction of the incremental days failed: {result['error']}")
+
+    start = time.perf_counter()
+    loader = DataLoading(config=loading_config, data=result["data"])
+    loader.insert_data()
+    loader.disconnect()
+    load_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    DataIngestion(ingestion_config).ingest_data()
+    ingest_seconds = time.perf_counter() - start
+    return {
+        "new_days": int(len(result["data"])),
+        "extract_seconds": extract_seconds,
+        "load_seconds": load_seconds,
+        "ingest_seconds": ingest_seconds,
+        "ingested_rows": int(sum(1 for _ in open(ingestion_config.local_data_file)) - 1),
+    }
+
+
+def main(args) -> dict:
+    manager = ConfigurationManager()
+    incremental_days = args.incremental_days
+    # The history stops incremental_days before the usual end, the ingestion phase adds them
+    extraction_config = replace(
+        manager.get_data_extraction_config(),
+        start_offset_days=args.days - 1,
+        end_offset_days=manager.get_data_extraction_config().end_offset_days + incremental_days
+    )
+    loading_config = manager.get_etl_data_loading_config()
+
+    report = {}
+    with ExitStack() as stack, tempfile.TemporaryDirectory() as work_dir:
+        if args.api_url:
+            os.environ["OPEN_METEO_API_URL"] = args.api_url
+            api = None
+        else:
+            api = stack.enter_context(MockOpenMeteo(
+                latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate, seed=args.seed
+            ))
+            os.environ["OPEN_METEO_API_URL"] = api.url
+        print(f"Archive API: {os.environ['OPEN_METEO_API_URL']}")
+
+        report["extraction"], frames = run_extraction(extraction_config, args.locations, args.concurrency)
+        print(json.dumps({"extraction": report["extraction"]}, indent=2))
+
+        if args.postgres == "none":
+            return report
+        if args.postgres == "local":
+            stack.enter_context(LocalPostgres(port=args.postgres_port, bin_dir=args.bin_dir))
+        print(f"PostgreSQL: {get_env('POSTGRES_HOST')}:{get_env('POSTGRES_PORT', '5432')}/{get_env('POSTGRES_DB')}")
+
+        report["loading"] = run_loading(loading_config, frames)
+        print(json.dumps({"loading": report["loading"]}, indent=2))
+
+        if api is not None:
+            # The incremental request should measure the pipeline, not the injected errors
+            api.error_rate = 0.0
+        ingestion_config = replace(
+            manager.get_data_ingestion_config(), root_dir=work_dir, local_data_file=os.path.join(work_dir, "data.csv")
+        )
+        report["ingestion"] = run_ingestion(extraction_config, loading_config, ingestion_config, incremental_days)
+        print(json.dumps({"ingestion": report["ingestion"]}, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--locations", type=int, default=20, help="Coordinates extracted, one request each")
+    parser.add_argument("--days", type=int, default=730, help="Days of history per location")
+    parser.add_argument("--incremental-days", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--api-url", default=None, help="Use this archive API instead of starting the mock")
+    parser.add_argument("--postgres", choices=["local", "env", "none"], default="local",
+                        help="local: disposable server, env: the POSTGRES_* variables, none: extraction only")
+    parser.add_argument("--postgres-port", type=int, default=55432)
+    parser.add_argument("--bin-dir", default=None, help="Directory with initdb and pg_ctl if they are not on PATH")
+    parser.add_argument("--output", default=None, help="Also write the report to this JSON file")
+    args = parser.parse_args()
+
+    report = main(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
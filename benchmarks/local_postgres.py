@@ -0,0 +1,157 @@
+"""
+Disposable local PostgreSQL for offline runs of DataLoading and DataIngestion.
+
+Creates a throwaway cluster in a temporary directory with the PostgreSQL binaries on PATH
+(or --bin-dir), or, when they are missing, a throwaway postgres container with docker.
+It exports POSTGRES_HOST, POSTGRES_PORT, POSTGRES_DB, POSTGRES_USER and POSTGRES_PASSWORD,
+the variables the pipeline already reads, and removes everything on exit. PostgreSQL
+refuses to run as root, so run the binaries as a regular user.
+
+Usage:
+    python -m benchmarks.local_postgres --port 55432   # prints the env variables and waits
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import psycopg2
+
+ENV_VARIABLES = ["POSTGRES_HOST", "POSTGRES_PORT", "POSTGRES_DB", "POSTGRES_USER", "POSTGRES_PASSWORD"]
+
+
+class LocalPostgres:
+    """
+    Context manager around a disposable PostgreSQL server:
+
+        with LocalPostgres(port=55432):
+            DataIngestion(config).ingest_data()
+
+    Raises:
+        RuntimeError: If neither the PostgreSQL binaries nor docker are available, or the
+        server does not accept connections within startup_timeout seconds
+    """
+
+    def __init__(self, port: int = 55432, database: str = "weather", user: str = "weather",
+                 password: str = "weather", bin_dir: str = None, image: str = "postgres:16", startup_timeout: float = 60.0):
+        self.port = port
+        self.database = database
+        self.user = user
+        self.password = password
+        self.bin_dir = bin_dir
+        self.image = image
+        self.startup_timeout = startup_timeout
+        self._data_dir = None
+        self._container = None
+        self._previous_env = {}
+
+    def _binary(self, name: str):
+        return shutil.which(name, path=self.bin_dir) if self.bin_dir else shutil.which(name)
+
+    @property
+    def env(self) -> dict:
+        return {
+            "POSTGRES_HOST": "127.0.0.1",
+            "POSTGRES_PORT": str(self.port),
+            "POSTGRES_DB": self.database,
+            "POSTGRES_USER": self.user,
+            "POSTGRES_PASSWORD": self.password,
+        }
+
+    def _start_cluster(self):
+        self._data_dir = tempfile.mkdtemp(prefix="weather_pg_")
+        password_file = os.path.join(self._data_dir, "password")
+        with open(password_file, "w") as f:
+            f.write(self.password)
+        cluster = os.path.join(self._data_dir, "data")
+        subprocess.run(
+            [self._binary("initdb"), "-D", cluster, "-U", self.user, "--pwfile", password_file, "-A", "md5", "-E", "UTF8"],
+            check=True, stdout=subprocess.DEVNULL
+        )
+        # fsync off: the cluster is thrown away, only throughput matters
+        options = f"-p {self.port} -k {self._data_dir} -c listen_addresses=127.0.0.1 -c fsync=off"
+        subprocess.run(
+            [self._binary("pg_ctl"), "-D", cluster, "-o", options, "-l", os.path.join(self._data_dir, "server.log"), "-w", "start"],
+            check=True, stdout=subprocess.DEVNULL
+        )
+
+    def _start_container(self):
+        self._container = subprocess.run(
+            ["docker", "run", "--rm", "-d", "-p", f"127.0.0.1:{self.port}:5432",
+             "-e", f"POSTGRES_USER={self.user}", "-e", f"POSTGRES_PASSWORD={self.password}",
+             "-e", f"POSTGRES_DB={self.database}", self.image],
+            check=True, capture_output=True, text=True
+        ).stdout.strip()
+
+    def _wait_until_ready(self, database: str):
+        deadline = time.monotonic() + self.startup_timeout
+        while True:
+            try:
+                psycopg2.connect(host="127.0.0.1", port=self.port, dbname=database, user=self.user, password=self.password).close()
+                return
+            except psycopg2.OperationalError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"PostgreSQL did not accept connections on port {self.port} in {self.startup_timeout}s")
+                time.sleep(0.5)
+
+    def start(self) -> "LocalPostgres":
+        if self._binary("initdb") and self._binary("pg_ctl"):
+            self._start_cluster()
+            self._wait_until_ready("postgres")
+            connection = psycopg2.connect(host="127.0.0.1", port=self.port, dbname="postgres", user=self.user, password=self.password)
+            connection.autocommit = True
+            with connection.cursor() as cur:
+                cur.execute(f'CREATE DATABASE "{self.database}"')
+            connection.close()
+        elif shutil.which("docker"):
+            self._start_container()
+            self._wait_until_ready(self.database)
+        else:
+            raise RuntimeError("Neither the PostgreSQL binaries (initdb, pg_ctl) nor docker were found, use --bin-dir")
+
+        for key, value in self.env.items():
+            self._previous_env[key] = os.environ.get(key)
+            os.environ[key] = value
+        return self
+
+    def stop(self):
+        for key, value in self._previous_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        if self._data_dir:
+            subprocess.run(
+                [self._binary("pg_ctl"), "-D", os.path.join(self._data_dir, "data"), "-m", "immediate", "stop"],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            shutil.rmtree(self._data_dir, ignore_errors=True)
+            self._data_dir = None
+        if self._container:
+            subprocess.run(["docker", "stop", self._container], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            self._container = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=55432)
+    parser.add_argument("--bin-dir", default=None, help="Directory with initdb and pg_ctl if they are not on PATH")
+    args = parser.parse_args()
+
+    with LocalPostgres(port=args.port, bin_dir=args.bin_dir) as db:
+        for key, value in db.env.items():
+            print(f"export {key}={value}")
+        print("Ctrl+C to stop and delete the database")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,213 @@
+"""
+Local stand-in for the Open-Meteo archive API, for offline and load testing of the ETL.
+
+Serves GET /v1/archive with the same query parameters and response layout as
+https://archive-api.open-meteo.com/v1/archive (latitude, longitude, start_date,
+end_date, hourly, timezone), filled with data from src.datascience.utils.synthetic.
+Each coordinate gets its own climate, and a day has the same values whatever range it is
+requested in, so overlapping and incremental requests agree.
+
+Every request waits a normally distributed latency, and a share of them fails with one of
+--error-codes and the API's error body ({"error": true, "reason": ...}).
+
+Point the pipeline at it with OPEN_METEO_API_URL, e.g.:
+    python -m benchmarks.mock_open_meteo --port 8085 --latency-ms 200 --error-rate 0.05
+    OPEN_METEO_API_URL=http://127.0.0.1:8085/v1/archive python main.py
+"""
+
+import argparse
+import json
+import threading
+import time
+import zlib
+from datetime import date
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+import numpy as np
+import pandas as pd
+from src.datascience.utils.synthetic import HOURLY_FEATURES, generate_hourly
+
+UNITS = {
+    "temperature_2m": "°C",
+    "relative_humidity_2m": "%",
+    "precipitation": "mm",
+    "cloud_cover": "%",
+    "wind_speed_10m": "km/h",
+    "wind_direction_10m": "°",
+    "shortwave_radiation": "W/m²",
+    "surface_pressure": "hPa",
+    "sunshine_duration": "s",
+    "et0_fao_evapotranspiration": "mm",
+}
+
+ERROR_REASONS = {
+    400: "Parameter is invalid",
+    429: "Too many concurrent requests",
+    500: "Internal server error",
+    503: "Service unavailable",
+}
+
+
+def _location(latitude: float, longitude: float) -> int:
+    # Stable index of a coordinate on a ~1 km grid, it picks the climate of the location
+    return zlib.crc32(f"{latitude:.2f},{longitude:.2f}".encode())
+
+
+@lru_cache(maxsize=512)
+def _year(location: int, year: int, seed: int) -> pd.DataFrame:
+    # Generated a year at a time so any date range is a slice of the same series
+    days = (date(year + 1, 1, 1) - date(year, 1, 1)).days
+    return generate_hourly(days, location=location, start_date=f"{year}-01-01", seed=seed * 10000 + year)
+
+
+def archive_payload(latitude: float, longitude: float, start_date: str, end_date: str, hourly: list, seed: int = 42) -> dict:
+    """
+    Response body of an archive request.
+
+    Raises:
+        ValueError: If the dates or the hourly variables are invalid
+    """
+    start, end = date.fromisoformat(start_date), date.fromisoformat(end_date)
+    if end < start:
+        raise ValueError(f"end_date {end_date} is before start_date {start_date}")
+    unknown = [feat for feat in hourly if feat not in HOURLY_FEATURES]
+    if unknown:
+        raise ValueError(f"Cannot initialize WeatherVariable from invalid String value {unknown[0]}")
+
+    location = _location(latitude, longitude)
+    frame = pd.concat([_year(location, year, seed) for year in range(start.year, end.year + 1)], ignore_index=True)
+    # time is "YYYY-MM-DDTHH:MM", so the first 10 characters are the day
+    days = frame["time"].str[:10]
+    frame = frame[(days >= start_date) & (days <= end_date)]
+
+    return {
+        "latitude": latitude,
+        "longitude": longitude,
+        "generationtime_ms": 0.0,
+        "utc_offset_seconds": 0,
+        "timezone": "GMT",
+        "timezone_abbreviation": "GMT",
+        "elevation": 0.0,
+        "hourly_units": {"time": "iso8601", **{feat: UNITS[feat] for feat in hourly}},
+        "hourly": {col: frame[col].tolist() for col in ["time"] + hourly},
+    }
+
+
+class MockOpenMeteo:
+    """
+    Threaded mock archive server, usable as a context manager:
+
+        with MockOpenMeteo(latency_ms=100, error_rate=0.1) as api:
+            os.environ["OPEN_METEO_API_URL"] = api.url
+
+    Attributes:
+        requests (int): Requests served so far
+        errors (int): Requests answered with an injected error
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, error_codes=(429, 500), seed: int = 42):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_codes = list(error_codes)
+        self.seed = seed
+        self.requests = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._rng = np.random.default_rng(seed)
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1/archive"
+
+    def _draw(self):
+        # numpy generators are not thread safe
+        with self._lock:
+            self.requests += 1
+            delay = max(0.0, self._rng.normal(self.latency_ms, self.jitter_ms)) / 1000 if self.latency_ms else 0.0
+            error = None
+            if self.error_rate and self._rng.random() < self.error_rate:
+                error = int(self._rng.choice(self.error_codes))
+                self.errors += 1
+        return delay, error
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, status: int, body: dict):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path != "/v1/archive":
+                    return self._reply(404, {"error": True, "reason": f"Unknown path {url.path}"})
+
+                delay, error = mock._draw()
+                time.sleep(delay)
+                if error:
+                    return self._reply(error, {"error": True, "reason": ERROR_REASONS.get(error, "Injected error")})
+
+                query = {key: values[0] for key, values in parse_qs(url.query).items()}
+                try:
+                    hourly = query.get("hourly", "")
+                    body = archive_payload(
+                        float(query["latitude"]), float(query["longitude"]),
+                        query["start_date"], query["end_date"],
+                        [feat for feat in hourly.split(",") if feat],
+                        mock.seed
+                    )
+                except (KeyError, ValueError) as e:
+                    return self._reply(400, {"error": True, "reason": f"{ERROR_REASONS[400]}: {e}"})
+                self._reply(200, body)
+
+            def log_message(self, format, *args):
+                # One line per request would drown the load test output
+                pass
+
+        return Handler
+
+    def start(self) -> "MockOpenMeteo":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8085)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Mean latency of a request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Standard deviation of the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with an error")
+    parser.add_argument("--error-codes", type=int, nargs="+", default=[429, 500])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    api = MockOpenMeteo(args.host, args.port, args.latency_ms, args.jitter_ms, args.error_rate, args.error_codes, args.seed)
+    print(f"Mock Open-Meteo archive at {api.url} (Ctrl+C to stop)")
+    try:
+        api._server.serve_forever()
+    except KeyboardInterrupt:
+        api.stop()
@@ -0,0 +1,234 @@
+"""
+Timing and peak-memory benchmark of the pipeline stages on synthetic Open-Meteo data.
+
+Stages:
+    etl_transform       ETLDataTransformation.transform on the hourly data of every location
+    feature_extraction  DataTransformation.feature_extraction on days x locations rows
+    model_training      ModelTrainer.train with a small fixed grid and a local MLflow file store
+    predict_once        app.py single-row scoring, time per call
+
+Every stage runs in a fresh process on data from src.datascience.utils.synthetic. The
+reported time is the median of --repeats runs; the peak memory comes from one extra run
+under tracemalloc (numpy and pandas buffers included), so it is not skewed by imports or
+by the data generation. The CV workers of model_training run in their own processes, so
+its peak only covers the process that drives the search.
+
+Baselines are stored in benchmarks/baselines.json per scale (e.g. 730x5). With --check,
+a stage whose time or memory exceeds its baseline by more than --threshold is reported
+as a regression and the exit code is 1. Timings depend on the machine, so record the
+baselines on the machine that runs the check.
+
+Usage:
+    python -m benchmarks.stages --days 730 --locations 5
+    python -m benchmarks.stages --days 730 --locations 5 --save-baseline
+    python -m benchmarks.stages --days 730 --locations 5 --check --threshold 0.25
+"""
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+STAGES = ["etl_transform", "feature_extraction", "model_training", "predict_once"]
+BASELINES_PATH = Path(__file__).with_name("baselines.json")
+
+# Peaks below this are noise (a few arrays more or less), compare them as if they were this size
+MIN_PEAK_MB = 1.0
+PREDICT_CALLS = 200
+
+TRAINING_GRID = {
+    "model_params": {
+        "logistic_regression": [{"solver": ["lbfgs"], "C": [0.01, 0.1, 1, 10], "max_iter": [2000]}],
+        "random_forest": {"n_estimators": [100], "max_depth": [10, None]},
+    }
+}
+
+
+def _setup_etl_transform(days, locations, work_dir):
+    from src.datascience.components.etl_data_transformation import ETLDataTransformation
+    from src.datascience.utils.synthetic import generate_hourly
+
+    hourly = [generate_hourly(days, location=location) for location in range(locations)]
+    return lambda: [ETLDataTransformation(None, data.copy()).transform() for data in hourly]
+
+
+def _transformation_config(days, locations, work_dir):
+    from src.datascience.constants import CONFIG_FILE_PATH, SCHEMA_FILE_PATH
+    from src.datascience.entity.config_entity import DataTransformationConfig
+    from src.datascience.utils.common import read_yaml
+    from src.datascience.utils.synthetic import generate_daily
+
+    data_path = os.path.join(work_dir, "data.csv")
+    generate_daily(days, locations).to_csv(data_path, index=False)
+    return DataTransformationConfig(
+        root_dir=work_dir,
+        data_path=data_path,
+        test_size=0.2,
+        random_state=42,
+        float_dtype=read_yaml(CONFIG_FILE_PATH).float_dtype,
+        all_schema=read_yaml(SCHEMA_FILE_PATH),
+        chunk_size=0
+    )
+
+
+def _setup_feature_extraction(days, locations, work_dir):
+    from src.datascience.components.data_transformation import DataTransformation
+
+    transformation = DataTransformation(_transformation_config(days, locations, work_dir))
+    raw = transformation.df
+
+    def run():
+        # extract_features copies, so the raw frame is the same on every repeat
+        transformation.df = raw
+        transformation.feature_extraction()
+    return run
+
+
+def _setup_model_training(days, locations, work_dir):
+    from box import ConfigBox
+    from src.datascience.components.data_transformation import DataTransformation
+    from src.datascience.components.model_training import ModelTrainer
+    from src.datascience.config.configuration import ConfigurationManager
+
+    transformation = DataTransformation(_transformation_config(days, locations, work_dir))
+    transformation.feature_extraction()
+    transformation.feature_transformation()
+    transformation.train_test_split_()
+
+    os.environ["MLFLOW_TRACKING_URI"] = f"file:{os.path.join(work_dir, 'mlruns')}"
+    runs = itertools.count()
+
+    def run():
+        # A fresh root per run, so no cache or checkpoint of an earlier repeat is reused
+        root_dir = os.path.join(work_dir, f"trainer_{next(runs)}")
+        config = ConfigurationManager().get_model_trainer_config()
+        config.root_dir = root_dir
+        config.train_data_path = os.path.join(work_dir, "train.csv")
+        config.test_data_path = os.path.join(work_dir, "test.csv")
+        config.available_models = list(TRAINING_GRID["model_params"])
+        config.params = ConfigBox(TRAINING_GRID)
+        config.score_cache = False
+        config.resume = False
+        config.checkpoint_dir = os.path.join(root_dir, "checkpoints")
+        config.use_selected_features = False
+        os.makedirs(root_dir, exist_ok=True)
+        ModelTrainer(config).train()
+    return run
+
+
+def _setup_predict_once(days, locations, work_dir):
+    from sklearn.ensemble import RandomForestClassifier
+    from src.datascience.components.data_transformation import extract_features, transform_features
+    from src.datascience.utils.serving import predict_once
+    from src.datascience.utils.synthetic import generate_daily
+
+    data = transform_features(extract_features(generate_daily(days, locations)))
+    features = [col for col in data.columns if col != "rain"]
+    model = RandomForestClassifier(n_estimators=300, max_depth=20, random_state=42, n_jobs=-1)
+    model.fit(data[features].to_numpy(), data["rain"].to_numpy())
+    rows = data[features].sample(PREDICT_CALLS, replace=True, random_state=0).to_dict(orient="records")
+
+    # The app passes a DataFrame with feature names, the model was fitted on arrays like ModelTrainer's
+    warnings.filterwarnings("ignore", message="X has feature names")
+    predict_once(model, rows[0], features)
+
+    def run():
+        for row in rows:
+            predict_once(model, row, features)
+    run.calls = len(rows)
+    return run
+
+
+def _run_stage(stage: str, days: int, locations: int, repeats: int) -> dict:
+    """
+    Runs in a fresh worker process: sets the stage up, times it and measures its peak.
+    """
+    with tempfile.TemporaryDirectory() as work_dir:
+        run = globals()[f"_setup_{stage}"](days, locations, work_dir)
+        calls = getattr(run, "calls", 1)
+
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - start) / calls)
+
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {"seconds": statistics.median(timings), "peak_mb": peak / 1024 ** 2}
+
+
+def run(days: int, locations: int, stages: list, repeats: int) -> dict:
+    results = {}
+    for stage in stages:
+        # spawn, so every stage starts from a clean interpreter whatever the platform default is
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+            results[stage] = executor.submit(_run_stage, stage, days, locations, repeats).result()
+        print(f"{stage:<20}{results[stage]['seconds']:>12.4f}{results[stage]['peak_mb']:>14.1f}", flush=True)
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Returns:
+        list: One message per stage and measure above baseline * (1 + threshold)
+    """
+    regressions = []
+    for stage, current in results.items():
+        if stage not in baseline:
+            continue
+        for measure, floor in (("seconds", 0.0), ("peak_mb", MIN_PEAK_MB)):
+            before, now = max(baseline[stage][measure], floor), max(current[measure], floor)
+            if before > 0 and now > before * (1 + threshold):
+                regressions.append(f"{stage} {measure}: {current[measure]:.4g} vs baseline {baseline[stage][measure]:.4g} (+{now / before - 1:.0%})")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=730)
+    parser.add_argument("--locations", type=int, default=5)
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative increase over the baseline")
+    parser.add_argument("--save-baseline", action="store_true", help="Store the results as the baseline of this scale")
+    parser.add_argument("--check", action="store_true", help="Exit with 1 if a stage regressed against the baseline")
+    args = parser.parse_args()
+
+    scale = f"{args.days}x{args.locations}"
+    print(f"Scale {scale} (days x locations), median of {args.repeats} runs")
+    print(f"{'stage':<20}{'seconds':>12}{'peak (MB)':>14}")
+    results = run(args.days, args.locations, args.stages, args.repeats)
+
+    baselines = json.loads(BASELINES_PATH.read_text()) if BASELINES_PATH.exists() else {}
+    if args.save_baseline:
+        stored = baselines.get(scale, {}).get("stages", {})
+        baselines[scale] = {
+            "machine": {"platform": platform.platform(), "python": platform.python_version(), "cpus": os.cpu_count()},
+            "stages": {**stored, **results},
+        }
+        BASELINES_PATH.write_text(json.dumps(baselines, indent=2) + "\n")
+        print(f"Baseline of {scale} saved to {BASELINES_PATH}")
+
+    if args.check:
+        if scale not in baselines:
+            sys.exit(f"No baseline for {scale}, run with --save-baseline first")
+        regressions = compare(results, baselines[scale]["stages"], args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No stage slower or larger than its baseline by more than {args.threshold:.0%}")
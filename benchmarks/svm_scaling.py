@@ -0,0 +1,40 @@
+"""
+Wall-clock time versus n_samples of exact RBF SVC and the Nystroem approximation.
+
+Both families are fitted on the same synthetic problems of growing size. Exact SVC is
+skipped once a fit exceeds --svc-timeout seconds, since the next size would only be slower.
+
+Usage:
+    python -m benchmarks.svm_scaling --n-samples 2000 5000 10000 20000 50000
+"""
+
+import argparse
+from benchmarks.fit_time import make_data, make_estimators, time_estimator
+
+
+def run(n_samples_list, svc_timeout) -> list:
+    rows = []
+    svc_too_slow = False
+    for n_samples in n_samples_list:
+        X_train, X_test, y_train, y_test = make_data(n_samples)
+        estimators = make_estimators()
+        for name in ("svm", "nystroem_svm"):
+            if name == "svm" and svc_too_slow:
+                rows.append({"n_samples": n_samples, "model": name, "skipped": True})
+                continue
+            result = time_estimator(estimators[name], X_train, X_test, y_train, y_test)
+            rows.append({"n_samples": n_samples, "model": name, **result})
+            if name == "svm" and result["fit_seconds"] > svc_timeout:
+                svc_too_slow = True
+    return rows
+
+
+if __name__ == "__main__":
+    from benchmarks.fit_time import print_table
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n-samples", type=int, nargs="+", default=[2000, 5000, 10000, 20000, 50000])
+    parser.add_argument("--svc-timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    print_table(run(args.n_samples, args.svc_timeout))
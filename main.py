@@ -3,9 +3,17 @@ from src.datascience.pipeline.data_extraction import DataExtractionTrainingPipel
 from src.datascience.pipeline.etl_data_transformation import ETLDataTransformationDataPipeline
 from src.datascience.pipeline.data_loading import DataLoadingTrainingPipeline
 from src.datascience.pipeline.data_ingestion import DataIngestionTrainingPipeline
+from src.datascience.pipeline.data_validation import DataValidationTrainingPipeline
 from src.datascience.pipeline.data_transformation import DataTransformationDataPipeline
 from src.datascience.pipeline.model_trainer import ModelTrainingPipeline
 from src.datascience.pipeline.model_evaluation import ModelEvaluationPipeline
+from src.datascience.pipeline.incremental_update import IncrementalUpdatePipeline
+from src.datascience.pipeline.backtesting import BacktestingPipeline
+from src.datascience.constants import CONFIG_FILE_PATH
+from src.datascience.utils.common import read_yaml
+
+# Stages that only run when listed in optional_stages of config.yaml
+optional_stages = read_yaml(CONFIG_FILE_PATH).get("optional_stages") or []
 
 
 STAGE_NAME = "ETL Data Extraction Stage"
@@ -53,6 +61,17 @@ except Exception as e:
     logger.exception(e)
     raise e 
 
+STAGE_NAME = "Data Validation Stage"
+
+try:
+    logger.info(f"----- Stage {STAGE_NAME} started -----")
+    obj = DataValidationTrainingPipeline()
+    obj.run()
+    logger.info(f"----- Stage {STAGE_NAME} completed ----- \n\n")
+except Exception as e:
+    logger.exception(e)
+    raise e 
+
 STAGE_NAME = "Data Transformation Stage"
 
 try:
@@ -85,4 +104,32 @@ try:
     logger.info(f"----- Stage {STAGE_NAME} completed ----- \n\n")
 except Exception as e:
     logger.exception(e)
-    raise e 
\ No newline at end of file
+    raise e 
+
+
+STAGE_NAME = "Backtesting Stage"
+
+if "backtesting" in optional_stages:
+    try:
+        logger.info(f"----- Stage {STAGE_NAME} started -----")
+        obj = BacktestingPipeline()
+        obj.run()
+        logger.info(f"----- Stage {STAGE_NAME} completed ----- \n\n")
+    except Exception as e:
+        logger.exception(e)
+        raise e 
+
+
+# Resets the online model to the fresh training data. Daily refreshes only run this stage:
+# python -m src.datascience.pipeline.incremental_update
+STAGE_NAME = "Incremental Update Stage"
+
+if "incremental_update" in optional_stages:
+    try:
+        logger.info(f"----- Stage {STAGE_NAME} started -----")
+        obj = IncrementalUpdatePipeline()
+        obj.run()
+        logger.info(f"----- Stage {STAGE_NAME} completed ----- \n\n")
+    except Exception as e:
+        logger.exception(e)
+        raise e 
@@ -44,5 +44,10 @@ setup(
     author="Armando Albornoz",
     author_email="albornoz.armando31416@gmail.com",
     packages=find_packages(),
-    install_requires= get_requirements()
+    install_requires= get_requirements(),
+    # Optional joblib backends of the model trainer (model_trainer.parallel_backend)
+    extras_require={
+        "dask": ["dask[distributed]"],
+        "ray": ["ray[default]"],
+    }
 )
\ No newline at end of file
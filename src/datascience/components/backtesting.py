@@ -0,0 +1,248 @@
+import os
+import json
+import time
+import joblib
+import numpy as np
+import pandas as pd
+import mlflow
+from pathlib import Path
+from joblib import Parallel, delayed, cpu_count
+from dotenv import load_dotenv
+from sklearn.base import clone
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.preprocessing import StandardScaler
+from src.datascience import logger
+from src.datascience.entity.config_entity import BacktestingConfig
+from src.datascience.components.data_transformation import extract_features, transform_features, FEATURES_TO_STANDARDIZE
+from src.datascience.components.model_search import positive_scores
+from src.datascience.utils.common import get_env
+from src.datascience.utils.metrics import binary_curves, confusion_from_labels, report_from_confusion
+from src.datascience.utils.mlflow_logging import AsyncMlflowLogger
+
+load_dotenv()
+
+
+def _supports_warm_start(estimator) -> bool:
+    """
+    Whether refitting with warm_start=True starts from the previous solution. Only linear
+    models qualify: for forests and boosting warm_start adds trees or iterations instead.
+    """
+    if isinstance(estimator, LogisticRegression):
+        return estimator.solver != "liblinear"
+    return isinstance(estimator, SGDClassifier)
+
+
+def _run_chain(estimator, df: pd.DataFrame, features: list, target: str, windows: list, warm_start: bool) -> list:
+    """
+    Fits and scores consecutive windows in one worker. With warm_start, each window's fit
+    starts from the coefficients of the previous window.
+
+    Returns:
+        list: One metrics dict per window
+    """
+    results = []
+    model = None
+    # A model trained on the pruned features (use_selected_features) lacks some of them
+    standardize = [col for col in FEATURES_TO_STANDARDIZE if col in features]
+    for window in windows:
+        train = df.iloc[window["train"][0]:window["train"][1]]
+        test = df.iloc[window["test"][0]:window["test"][1]]
+
+        # The scaler only sees the training window, so no future statistics leak in
+        X_train, X_test = train[features].copy(), test[features].copy()
+        if standardize:
+            scaler = StandardScaler().fit(train[standardize])
+            X_train[standardize] = scaler.transform(X_train[standardize])
+            X_test[standardize] = scaler.transform(X_test[standardize])
+        y_train, y_test = train[target].to_numpy(), test[target].to_numpy()
+
+        warm_started = warm_start and model is not None
+        if warm_started:
+            model.set_params(warm_start=True)
+        else:
+            model = clone(estimator)
+
+        start = time.perf_counter()
+        model.fit(X_train.to_numpy(), y_train)
+        fit_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        y_score = positive_scores(model, X_test.to_numpy())
+        predict_seconds = time.perf_counter() - start
+        y_pred = model.classes_[(y_score > (0.5 if hasattr(model, "predict_proba") else 0)).astype(int)]
+
+        report = report_from_confusion(confusion_from_labels(y_test, y_pred))
+        results.append({
+            "window": window["index"],
+            "train_start": str(train["date"].iloc[0].date()),
+            "train_end": str(train["date"].iloc[-1].date()),
+            "test_start": str(test["date"].iloc[0].date()),
+            "test_end": str(test["date"].iloc[-1].date()),
+            "n_train": int(len(train)),
+            "n_test": int(len(test)),
+            "roc_auc": binary_curves(y_test, y_score)["roc_auc"],
+            "accuracy": report["accuracy"],
+            "f1_weighted": report["weighted avg"]["f1-score"],
+            "fit_seconds": fit_seconds,
+            "predict_seconds": predict_seconds,
+            "warm_started": warm_started,
+        })
+    return results
+
+
+class Backtesting:
+    """
+    Rolling-origin backtest of the chosen model over time.
+
+    The random stratified split of DataTransformation mixes future days into training and
+    gives a single estimate. Here the model is refitted at successive origins, on an
+    expanding window (all days so far) or a sliding window (the last train_window_days),
+    and scored on the following test_days.
+
+    Windows are grouped into consecutive chains that run in parallel processes. Estimators
+    that can warm start (linear models) refit each window from the previous window's
+    solution inside a chain; the others get one chain per window.
+    """
+
+    def __init__(self, config: BacktestingConfig):
+        self.config = config
+        self.tracker = None
+
+    def _init_mlflow(self):
+        # authentication
+        os.environ["MLFLOW_TRACKING_USERNAME"] = get_env("MLFLOW_TRACKING_USERNAME")
+        os.environ["MLFLOW_TRACKING_PASSWORD"] = get_env("MLFLOW_TRACKING_PASSWORD")
+        mlflow.set_tracking_uri(get_env("MLFLOW_TRACKING_URI", "http://localhost:5000"))
+        experiment = mlflow.set_experiment(self.config.experiment_name)
+        self.tracker = AsyncMlflowLogger(experiment.experiment_id)
+
+    def _load_data(self) -> pd.DataFrame:
+        """
+        Raw data with the same features as DataTransformation, unscaled and sorted by date.
+        """
+        df = transform_features(extract_features(pd.read_csv(self.config.data_path), keep_date=True))
+        df["date"] = pd.to_datetime(df["date"])
+        return df.sort_values("date", kind="mergesort", ignore_index=True)
+
+    def _load_estimator(self):
+        """
+        Unfitted copy of the chosen model. A stacked ensemble refits its base models and
+        meta-learner in fit, like the single models.
+        """
+        return clone(joblib.load(self.config.model_path))
+
+    def _make_windows(self, dates: pd.Series) -> list:
+        """
+        Row ranges of every (train, test) window, cut on calendar days so all rows of a day
+        fall on the same side of the origin.
+
+        Raises:
+            ValueError: If there are not enough days for a single window
+        """
+        days = dates.dt.normalize()
+        unique_days = days.unique()
+        # First row of every day, plus the end of the data
+        day_starts = np.r_[np.searchsorted(days.to_numpy(), unique_days.to_numpy()), len(days)]
+
+        windows = []
+        origin = self.config.initial_train_days
+        while origin + self.config.test_days <= len(unique_days):
+            first_day = 0 if self.config.window_type == "expanding" else max(0, origin - self.config.train_window_days)
+            windows.append({
+                "index": len(windows),
+                "train": (int(day_starts[first_day]), int(day_starts[origin])),
+                "test": (int(day_starts[origin]), int(day_starts[origin + self.config.test_days])),
+            })
+            origin += self.config.step_days
+
+        if not windows:
+            raise ValueError(
+                f"Only {len(unique_days)} days of data, need initial_train_days + test_days = "
+                f"{self.config.initial_train_days + self.config.test_days}"
+            )
+        return windows
+
+    def backtest(self) -> pd.DataFrame:
+        """
+        Runs the backtest, saves the per-window metrics and logs them to MLflow.
+
+        Returns:
+            pd.DataFrame: One row per window
+
+        Raises:
+            ValueError: If the window type is unknown or the data is too short
+            Exception: If there is an error during backtesting
+        """
+        try:
+            if self.config.window_type not in ("expanding", "sliding"):
+                raise ValueError(f"Unknown window_type '{self.config.window_type}', expected expanding or sliding")
+
+            self._init_mlflow()
+            df = self._load_data()
+            estimator = self._load_estimator()
+            features = json.loads(Path(self.config.feature_names_path).read_text())
+            windows = self._make_windows(df["date"])
+
+            warm_start = self.config.warm_start and _supports_warm_start(estimator)
+            n_jobs = cpu_count() if self.config.n_jobs in (None, -1) else self.config.n_jobs
+            if warm_start:
+                # Consecutive windows share a worker so each fit can start from the previous one
+                chains = [list(chain) for chain in np.array_split(np.array(windows, dtype=object), min(n_jobs, len(windows)))]
+            else:
+                chains = [[window] for window in windows]
+            logger.info(
+                f"Backtesting {type(estimator).__name__} on {len(windows)} {self.config.window_type} windows "
+                f"in {len(chains)} chains (warm start: {warm_start})"
+            )
+
+            start = time.perf_counter()
+            chain_results = Parallel(n_jobs=min(n_jobs, len(chains)))(
+                delayed(_run_chain)(estimator, df, features, self.config.target_column, chain, warm_start)
+                for chain in chains
+            )
+            total_seconds = time.perf_counter() - start
+            results = pd.DataFrame([row for chain in chain_results for row in chain]).sort_values("window", ignore_index=True)
+
+            results_path = Path(self.config.root_dir) / "backtest.json"
+            summary = {
+                "window_type": self.config.window_type,
+                "windows": len(results),
+                "roc_auc_mean": float(results["roc_auc"].mean()),
+                "roc_auc_std": float(results["roc_auc"].std()),
+                "accuracy_mean": float(results["accuracy"].mean()),
+                "total_seconds": total_seconds,
+            }
+            results_path.write_text(json.dumps({"summary": summary, "windows": results.to_dict(orient="records")}, indent=2))
+
+            run_id = self.tracker.start_run(run_name=f"backtest:{self.config.window_type}")
+            self.tracker.log_params(run_id, {
+                "model": type(estimator).__name__,
+                "window_type": self.config.window_type,
+                "initial_train_days": self.config.initial_train_days,
+                "train_window_days": self.config.train_window_days,
+                "test_days": self.config.test_days,
+                "step_days": self.config.step_days,
+                "warm_start": warm_start
+            })
+            for row in results.itertuples():
+                self.tracker.log_metrics(run_id, {
+                    "window_roc_auc": row.roc_auc,
+                    "window_accuracy": row.accuracy,
+                    "window_fit_seconds": row.fit_seconds,
+                    "window_predict_seconds": row.predict_seconds
+                }, step=row.window)
+            self.tracker.log_metrics(run_id, {key: value for key, value in summary.items() if key != "window_type"})
+            self.tracker.log_artifact(run_id, str(results_path))
+            self.tracker.close()
+
+            logger.info(
+                f"Backtest ROC AUC {summary['roc_auc_mean']:.4f} ± {summary['roc_auc_std']:.4f} over "
+                f"{len(results)} windows in {total_seconds:.1f}s, saved at {results_path}"
+            )
+            return results
+
+        except Exception as e:
+            logger.error(f"Error during backtesting: {e}")
+            if self.tracker is not None:
+                self.tracker.close(status="FAILED")
+            raise
@@ -7,6 +7,7 @@ from dotenv import load_dotenv
 from src.datascience.utils.common import get_env 
 from src.datascience import logger
 from src.datascience.entity.config_entity import DataIngestionConfig
+from src.datascience.utils.memory import apply_dtype_policy
 
 load_dotenv()
 
@@ -33,13 +34,15 @@ class DataIngestion:
         try:
             conn = psycopg2.connect(
                 host=get_env("POSTGRES_HOST"),
+                port=get_env("POSTGRES_PORT", "5432"),
                 database=get_env("POSTGRES_DB"),
                 user= get_env("POSTGRES_USER"),
                 password= get_env("POSTGRES_PASSWORD")
             )   
         
             df = pd.read_sql("SELECT * FROM weather_data", conn) # Get data from databases
-            df.to_csv(self.config.local_data_file, index=False) # Save data to csv
+            df = apply_dtype_policy(df, self.config.all_schema, self.config.float_dtype) # hourly block as float_dtype, native dates
+            df.to_csv(self.config.local_data_file, index=False, date_format="%Y-%m-%d") # Save data to csv
 
                 
         except Exception as e:
@@ -20,7 +20,7 @@ class DataLoading:
 
         self.config = {
             'host': get_env("POSTGRES_HOST"),
-            'port': int(self.config.port),
+            'port': int(get_env("POSTGRES_PORT", str(self.config.port))),
             'database': get_env("POSTGRES_DB"),
             'user': get_env("POSTGRES_USER"),
             'password': get_env("POSTGRES_PASSWORD")
@@ -5,12 +5,140 @@ import pandas as pd
 import numpy as np
 from sklearn.preprocessing import StandardScaler
 from src.datascience.entity.config_entity import DataTransformationConfig
+from src.datascience.utils.memory import read_weather_csv
+import joblib
+import json
+from datetime import datetime, timezone
+
+# Features standardized by the scaler, the circular wind features are left as they are
+FEATURES_TO_STANDARDIZE = [
+    "temperature_2m_avg",
+    "surface_pressure_avg",
+    "relative_humidity_2m_avg",
+    "cloud_cover_avg",
+    "daily_et0_fao_evapotranspiration",
+    "daily_sunshine",
+    "wind_speed_10m_avg"
+]
+
+
+def extract_features(df: pd.DataFrame, keep_date: bool = False) -> pd.DataFrame:
+    """
+    Turns the hourly columns obtained from the API into daily features and the rain target.
+    Shared by DataTransformation and the incremental update so both see the same features.
+
+    Args:
+        df (pd.DataFrame): Raw rows, one per location and day
+        keep_date (bool): Keep the date column, e.g. to track a watermark
+
+    Returns:
+        pd.DataFrame: Rows with the daily features and the rain target
+    """
+    df = df.copy()
+
+    # Obtain target 
+    precipitation_cols =[f"precipitation_{i}" for i in range(1, 25)]
+    df["precipitation"] = df[precipitation_cols].sum(axis=1)  # Sum the precipitation cols along the rows
+    df["rain"] = (df["precipitation"] > 0).astype(int) # If precipitation is greater than 0 it likely rained
+    df = df.drop(columns=precipitation_cols)
+    df = df.drop(columns=["precipitation"])
+
+    # Remove date  column
+    if not keep_date:
+        df = df.drop(columns=["date"])
+
+    # extracting avg from surfa_pressure and temperature_2m
+    temp_cols = [col for col in df.columns if col.startswith("temperature_2m_")]
+    pressure_cols = [col for col in df.columns if col.startswith("surface_pressure_")]
+    df["surface_pressure_avg"] = df[pressure_cols].mean(axis=1)
+    df["temperature_2m_avg"] = df[temp_cols].mean(axis=1)
+    df = df.drop(columns=pressure_cols)
+    df = df.drop(columns=temp_cols)
+
+    # Eliminating shortwave_radiation_ due to high correlation with sunshine
+    cols = [col for col in df.columns if col.startswith("shortwave_radiation_")]
+    df = df.drop(columns=cols)
+
+    # getting daily det0_fao_evapotranspiration and sunshine
+    sunshine_cols = [col for col in df.columns if col.startswith("sunshine_duration_")] 
+    df["daily_sunshine"] = df[sunshine_cols].sum(axis=1)
+    df = df.drop(columns=sunshine_cols)
+
+    det0_fao_evapotranspiration_cols = [col for col in df.columns if col.startswith("et0_fao_evapotranspiration_")]
+    df["daily_et0_fao_evapotranspiration"] = df[det0_fao_evapotranspiration_cols].sum(axis=1)
+    df = df.drop(columns=det0_fao_evapotranspiration_cols)
+
+    # Summarizing instant features
+
+    features = [
+    "relative_humidity_2m", "cloud_cover",
+    "wind_speed_10m", "wind_direction_10m"
+    ]
+
+    for col_name in features:
+        cols = [col for col in df.columns if col.startswith(col_name)]
+        df[f"{col_name}_avg"] = df[cols].mean(axis=1)
+        df = df.drop(columns=cols)
+
+    return df
+
+
+def transform_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Log transforms skewed features and replaces the wind direction by its sine and cosine.
+    """
+    df = df.copy()
+
+    # Log transform features
+    df["daily_sunshine"] = np.log1p(df["daily_sunshine"])
+    df["wind_speed_10m_avg"] = np.log1p(df["wind_speed_10m_avg"])
+
+    ## Fixes circular feature
+    wind_direction_angles = df["wind_direction_10m_avg"]
+    df["wind_dir_sin"] = np.sin(np.radians(wind_direction_angles))
+    df["wind_dir_cos"] = np.cos(np.radians(wind_direction_angles))
+    df = df.drop(columns=["wind_direction_10m_avg"])
+    return df
+
+
+def stratified_test_mask(labels: pd.Series, test_size: float, random_state: int, seen: dict) -> np.ndarray:
+    """
+    Stratified split for streamed data: a quota per class instead of a per-row draw.
+
+    The i-th row of class c in the file goes to test when floor(i * test_size + offset_c)
+    steps up at i, with offset_c in [0, 1) drawn from random_state. After n rows of a class,
+    floor(n * test_size + offset_c) of them are in test, so each class is split at
+    test_size up to one row, like train_test_split(stratify=y). Rows are numbered within
+    their class across chunks, so the split does not depend on chunk_size.
+
+    Args:
+        labels (pd.Series): Class of each row of the chunk
+        test_size (float): Fraction of each class that goes to test
+        random_state (int): Seed of the per-class offsets
+        seen (dict): Rows per class in the previous chunks, updated in place
+
+    Returns:
+        np.ndarray: True for the test rows
+    """
+    labels = labels.to_numpy()
+    is_test = np.zeros(len(labels), dtype=bool)
+    for label in np.unique(labels):
+        rows = np.flatnonzero(labels == label)
+        offset = np.random.default_rng([random_state, int(label)]).random()
+        i = seen.get(label, 0) + np.arange(len(rows))
+        is_test[rows] = np.floor((i + 1) * test_size + offset) > np.floor(i * test_size + offset)
+        seen[label] = seen.get(label, 0) + len(rows)
+    return is_test
+
 
 class DataTransformation:
     """
     Component for data transformation operations including feature extraction,
     data transformation, and train-test split.
 
+    With chunk_size set, stream_transform does the same in two passes over chunks of
+    the file instead, so memory does not grow with the length of the history.
+
     Raises:
         FileNotFoundError: If the data file doesn't exists
 
@@ -18,10 +146,16 @@ class DataTransformation:
  
     def __init__(self, config: DataTransformationConfig):
         self.config = config
+        self.df = None
+
+        if self.config.chunk_size:
+            # stream_transform reads the file itself
+            return
 
         try:
             ## Load data
-            self.df  = pd.read_csv(self.config.data_path)
+            # Hourly block parsed straight into float_dtype and dates as datetime64
+            self.df  = read_weather_csv(self.config.data_path, self.config.all_schema, self.config.float_dtype)
             logger.info(f"Loading data from: {self.config.data_path}")
         except Exception as e:
             logger.error(f"Error when loading data during data transformation: {e}")
@@ -37,55 +171,14 @@ class DataTransformation:
             Exception: If there is an error during extraction
         """
         try:
-            # Obtain target 
-            logger.info(f"Adding target to the loaded data")
-            precipitation_cols =[f"precipitation_{i}" for i in range(1, 25)]
-            self.df["precipitation"] = self.df[precipitation_cols].sum(axis=1)  # Sum the precipitation cols along the rows
-            self.df["rain"] = (self.df["precipitation"] > 0).astype(int) # If precipitation is greater than 0 it likely rained
-            self.df = self.df.drop(columns=precipitation_cols)
-            self.df = self.df.drop(columns=["precipitation"])
-
-            # Remove date  column
-            logger.info(f"Removing date column")
-            self.df = self.df.drop(columns=["date"])
-
-            # extracting avg from surfa_pressure and temperature_2m
+            # Latest day used for training, the incremental update starts after it
+            self.watermark = str(pd.Timestamp(self.df["date"].max()).date())
+
             logger.info(f"Performing feature extraction")
-            temp_cols = [col for col in self.df.columns if col.startswith("temperature_2m_")]
-            pressure_cols = [col for col in self.df.columns if col.startswith("surface_pressure_")]
-            self.df["surface_pressure_avg"] = self.df[pressure_cols].mean(axis=1)
-            self.df["temperature_2m_avg"] = self.df[temp_cols].mean(axis=1)
-            self.df = self.df.drop(columns=pressure_cols)
-            self.df = self.df.drop(columns=temp_cols)
-
-            # Eliminating shortwave_radiation_ due to high correlation with sunshine
-            cols = [col for col in self.df.columns if col.startswith("shortwave_radiation_")]
-            print(cols)
-            self.df = self.df.drop(columns=cols)
-
-            # getting daily det0_fao_evapotranspiration and sunshine
-            sunshine_cols = [col for col in self.df.columns if col.startswith("sunshine_duration_")] 
-            self.df["daily_sunshine"] = self.df[sunshine_cols].sum(axis=1)
-            self.df = self.df.drop(columns=sunshine_cols)
-
-            det0_fao_evapotranspiration_cols = [col for col in self.df.columns if col.startswith("et0_fao_evapotranspiration_")]
-            self.df["daily_et0_fao_evapotranspiration"] = self.df[det0_fao_evapotranspiration_cols].sum(axis=1)
-            self.df = self.df.drop(columns=det0_fao_evapotranspiration_cols)
-
-            # Summarizing instant features
-
-            features = [
-            "relative_humidity_2m", "cloud_cover",
-            "wind_speed_10m", "wind_direction_10m"
-            ]
-
-            for col_name in features:
-                cols = [col for col in self.df.columns if col.startswith(col_name)]
-                self.df[f"{col_name}_avg"] = self.df[cols].mean(axis=1)
-                self.df = self.df.drop(columns=cols)
+            self.df = extract_features(self.df)
 
         except Exception as e:
-            logger.error("An error occured while performing feature extraction: {e}")
+            logger.error(f"An error occured while performing feature extraction: {e}")
             raise 
 
     def feature_transformation(self):
@@ -95,15 +188,7 @@ class DataTransformation:
 
         Exception: If there is an error during transformation
         """
-        # Log transform features
-        self.df["daily_sunshine"] = np.log1p(self.df["daily_sunshine"])
-        self.df["wind_speed_10m_avg"] = np.log1p(self.df["wind_speed_10m_avg"])
-    
-        ## Fixes circular feature
-        wind_direction_angles = self.df["wind_direction_10m_avg"]
-        self.df["wind_dir_sin"] = np.sin(np.radians(wind_direction_angles))
-        self.df["wind_dir_cos"] = np.cos(np.radians(wind_direction_angles))
-        self.df = self.df.drop(columns=["wind_direction_10m_avg"])
+        self.df = transform_features(self.df)
 
 
     def train_test_split_(self):
@@ -133,21 +218,13 @@ class DataTransformation:
 
             # Scaling
 
-            features_to_standardize = [
-                "temperature_2m_avg",
-                "surface_pressure_avg",
-                "relative_humidity_2m_avg",
-                "cloud_cover_avg",
-                "daily_et0_fao_evapotranspiration",
-                "daily_sunshine",
-                "wind_speed_10m_avg"
-            ]
-
             scaler =  StandardScaler()
-            X_train[features_to_standardize] = scaler.fit_transform(X_train[features_to_standardize])
-            X_test[features_to_standardize] = scaler.transform(X_test[features_to_standardize])
+            X_train[FEATURES_TO_STANDARDIZE] = scaler.fit_transform(X_train[FEATURES_TO_STANDARDIZE])
+            X_test[FEATURES_TO_STANDARDIZE] = scaler.transform(X_test[FEATURES_TO_STANDARDIZE])
             logger.info(f"Data has been scaled")
 
+            self._save_scaler(scaler)
+
             # Recombine with target
             train = X_train.copy()
             train["rain"] = y_train.values
@@ -162,4 +239,96 @@ class DataTransformation:
             logger.info(f"Train shape: {train.shape} | Test shape: {test.shape}")
         except Exception as e:
             logger.error(f"Error during train-test split: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    def _save_scaler(self, scaler: StandardScaler):
+        # The incremental update keeps updating these statistics with the new days
+        joblib.dump(scaler, os.path.join(self.config.root_dir, "scaler.joblib"))
+        watermark = {"watermark": self.watermark, "created_at": datetime.now(timezone.utc).isoformat()}
+        with open(os.path.join(self.config.root_dir, "watermark.json"), "w") as f:
+            json.dump(watermark, f, indent=2)
+
+    def stream_transform(self):
+        """
+        Out-of-core version of feature_extraction, feature_transformation and train_test_split_.
+
+        The first pass reads the raw file in chunks of chunk_size rows, computes the daily
+        features, assigns every row to train or test with stratified_test_mask and fits the
+        scaler on the train rows with partial_fit. The unscaled features (10 columns
+        instead of 241) are spilled to a temporary file, and the second pass scales them
+        and appends them to train.csv and test.csv.
+
+        Raises:
+            Exception: If there is an error while streaming the data
+        """
+        root_dir = self.config.root_dir
+        spill_path = os.path.join(root_dir, "features.tmp.csv")
+        train_path = os.path.join(root_dir, "train.csv")
+        test_path = os.path.join(root_dir, "test.csv")
+
+        try:
+            logger.info(f"Streaming {self.config.data_path} in chunks of {self.config.chunk_size} rows")
+            scaler = StandardScaler()
+            watermark = None
+            # rows per (split, rain)
+            counts = {(split, label): 0 for split in ("train", "test") for label in (0, 1)}
+            # rows per rain class read so far, numbers the rows of each class for the split
+            seen = {}
+
+            chunks = read_weather_csv(
+                self.config.data_path, self.config.all_schema, self.config.float_dtype, chunksize=self.config.chunk_size
+            )
+            for i, chunk in enumerate(chunks):
+                features = transform_features(extract_features(chunk, keep_date=True))
+                chunk_max = features["date"].max()
+                watermark = chunk_max if watermark is None else max(watermark, chunk_max)
+
+                is_test = stratified_test_mask(features["rain"], self.config.test_size, self.config.random_state, seen)
+                if (~is_test).any():
+                    scaler.partial_fit(features.loc[~is_test, FEATURES_TO_STANDARDIZE])
+                for split, mask in (("train", ~is_test), ("test", is_test)):
+                    labels = features.loc[mask, "rain"]
+                    counts[(split, 1)] += int(labels.sum())
+                    counts[(split, 0)] += int(len(labels) - labels.sum())
+
+                features = features.drop(columns=["date"])
+                features["is_test"] = is_test
+                features.to_csv(spill_path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+
+            if watermark is None:
+                raise ValueError(f"No rows in {self.config.data_path}")
+            if counts[("train", 0)] + counts[("train", 1)] == 0:
+                raise ValueError("The split sent every row to test, the file is too small to stream")
+            self.watermark = str(pd.Timestamp(watermark).date())
+            logger.info(f"Scaler fitted on {int(scaler.n_samples_seen_)} train rows")
+
+            # Second pass: scale and write the same columns as train_test_split_, rain last
+            header = pd.read_csv(spill_path, nrows=0).columns
+            columns = [col for col in header if col not in ("rain", "is_test")] + ["rain"]
+            spilled = pd.read_csv(
+                spill_path,
+                dtype={col: self.config.float_dtype for col in columns if col != "rain"},
+                chunksize=self.config.chunk_size
+            )
+            for i, chunk in enumerate(spilled):
+                is_test = chunk["is_test"].to_numpy(dtype=bool)
+                chunk = chunk[columns]
+                chunk[FEATURES_TO_STANDARDIZE] = scaler.transform(chunk[FEATURES_TO_STANDARDIZE])
+                chunk[~is_test].to_csv(train_path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+                chunk[is_test].to_csv(test_path, mode="w" if i == 0 else "a", header=i == 0, index=False)
+            os.remove(spill_path)
+
+            self._save_scaler(scaler)
+
+            n_train = counts[("train", 0)] + counts[("train", 1)]
+            n_test = counts[("test", 0)] + counts[("test", 1)]
+            logger.info(f"Saved train/test to {root_dir}")
+            logger.info(
+                f"Train rows: {n_train} ({counts[('train', 1)] / n_train:.3f} rain) | "
+                f"Test rows: {n_test} ({counts[('test', 1)] / max(n_test, 1):.3f} rain)"
+            )
+        except Exception as e:
+            logger.error(f"Error while streaming the data transformation: {e}")
+            if os.path.exists(spill_path):
+                os.remove(spill_path)
+            raise
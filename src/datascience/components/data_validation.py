@@ -0,0 +1,183 @@
+import json
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from src.datascience import logger
+from src.datascience.entity.config_entity import DataValidationConfig
+
+# Failures listed in the report, the rest are only counted
+MAX_REPORTED_FAILURES = 20
+
+
+class DataValidationError(Exception):
+    """
+    Raised when the ingested data does not match the schema.
+    """
+
+
+class DataValidation:
+    """
+    Component that validates the ingested data against schema.yaml before transformation.
+
+    The file is streamed in chunks and every check is vectorized over the hourly block of
+    a chunk: columns, dtypes (castable to the schema dtype), null ratios, physical ranges, hour completeness (all 24
+    hours of a feature present on a day) and duplicated rows of the primary key: the date,
+    or (location, date) when the optional location column is present. The stage stops at the
+    first chunk where a check fails, writes a compact report and the status file, and raises
+    so a bad backfill never reaches training.
+    """
+
+    def __init__(self, config: DataValidationConfig):
+        self.config = config
+        schema = self.config.all_schema
+        self.features = list(schema.HOURLY_FEATURES.keys())
+        self.hours = int(schema.HOURS)
+        self.date_column = schema.DATE_COLUMN
+        self.location_column = schema.get("LOCATION_COLUMN")
+
+        # Column order of the hourly block: feature-major, hours 1..24
+        self.hourly_columns = [f"{feat}_{hour}" for feat in self.features for hour in range(1, self.hours + 1)]
+        specs = [schema.HOURLY_FEATURES[feat] for feat in self.features]
+        self.lower = np.repeat([float(spec["min"]) for spec in specs], self.hours)
+        self.upper = np.repeat([float(spec["max"]) for spec in specs], self.hours)
+        self.max_null_ratio = np.repeat([float(spec["max_null_ratio"]) for spec in specs], self.hours)
+        self.expected_dtypes = [np.dtype(spec["dtype"]) for spec in specs for _ in range(self.hours)]
+
+    def _check_columns(self, columns) -> list:
+        expected = [self.date_column] + self.hourly_columns
+        missing = [col for col in expected if col not in columns]
+        unexpected = [col for col in columns if col not in expected and col != self.location_column]
+        failures = []
+        if missing:
+            failures.append(f"{len(missing)} missing columns: {missing[:10]}")
+        if unexpected:
+            failures.append(f"{len(unexpected)} unexpected columns: {unexpected[:10]}")
+        return failures
+
+    def _check_dtypes(self, chunk: pd.DataFrame) -> list:
+        # A column passes when its parsed values cast to the schema dtype without changing kind,
+        # e.g. int64 (a chunk of whole numbers) or float32 to float64, but not text or booleans
+        mismatched = [
+            f"{col} ({dtype} -> {expected})"
+            for col, dtype, expected in zip(self.hourly_columns, chunk[self.hourly_columns].dtypes, self.expected_dtypes)
+            if not pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype)
+            or not np.can_cast(dtype, expected, casting="same_kind")
+        ]
+        failures = []
+        if mismatched:
+            failures.append(f"{len(mismatched)} hourly columns do not match the schema dtype: {mismatched[:10]}")
+        dates = pd.to_datetime(chunk[self.date_column], errors="coerce")
+        if dates.isna().any():
+            failures.append(f"{int(dates.isna().sum())} unparseable or missing dates")
+        return failures
+
+    def validate(self) -> bool:
+        """
+        Validates the ingested data file.
+
+        Returns:
+            bool: True when every check passed
+
+        Raises:
+            DataValidationError: If a check failed (the report says which)
+            Exception: If there is an error while reading the data
+        """
+        rows = 0
+        null_counts = np.zeros(len(self.hourly_columns), dtype=np.int64)
+        out_of_range = np.zeros(len(self.hourly_columns), dtype=np.int64)
+        incomplete_days = np.zeros(len(self.features), dtype=np.int64)
+        seen_keys = set()
+        duplicated_keys = 0
+        failures = []
+
+        try:
+            for chunk in pd.read_csv(self.config.unzip_data_dir, chunksize=self.config.chunk_size):
+                if rows == 0:
+                    failures += self._check_columns(chunk.columns)
+                    if failures:
+                        break
+                failures += self._check_dtypes(chunk)
+                if failures:
+                    break
+
+                values = chunk[self.hourly_columns].to_numpy(dtype=np.float64)
+                missing = np.isnan(values)
+                rows += len(chunk)
+
+                null_counts += missing.sum(axis=0)
+                # nan compares False, so missing values are not counted as out of range
+                out_of_range += ((values < self.lower) | (values > self.upper)).sum(axis=0)
+                incomplete_days += missing.reshape(len(chunk), len(self.features), self.hours).any(axis=2).sum(axis=0)
+
+                # Primary key of the rows, across chunks as well as within one
+                key_columns = [pd.to_datetime(chunk[self.date_column]).dt.date]
+                if self.location_column in chunk.columns:
+                    key_columns.insert(0, chunk[self.location_column])
+                keys = pd.MultiIndex.from_arrays(key_columns)
+                duplicated_keys += int(keys.duplicated().sum()) + int(keys.isin(seen_keys).sum())
+                seen_keys.update(keys.unique())
+
+                # Fail fast on the running totals
+                failures += self._threshold_failures(rows, null_counts, out_of_range, incomplete_days, duplicated_keys)
+                if failures:
+                    break
+
+            if rows == 0 and not failures:
+                failures.append("No rows in the data file")
+
+        except Exception as e:
+            logger.error(f"Error while validating data: {e}")
+            raise
+
+        status = not failures
+        self._write_report(status, rows, failures, null_counts, out_of_range, incomplete_days, duplicated_keys)
+        if not status:
+            raise DataValidationError(f"Data validation failed after {rows} rows: {'; '.join(failures[:3])}")
+        logger.info(f"Data validation passed on {rows} rows")
+        return status
+
+    def _threshold_failures(self, rows, null_counts, out_of_range, incomplete_days, duplicated_keys) -> list:
+        failures = []
+        null_ratio = null_counts / rows
+        for i in np.flatnonzero(null_ratio > self.max_null_ratio):
+            failures.append(f"{self.hourly_columns[i]}: null ratio {null_ratio[i]:.3f} > {self.max_null_ratio[i]}")
+
+        range_ratio = out_of_range / rows
+        for i in np.flatnonzero(range_ratio > self.config.max_out_of_range_ratio):
+            failures.append(
+                f"{self.hourly_columns[i]}: {out_of_range[i]} values outside [{self.lower[i]:g}, {self.upper[i]:g}]"
+            )
+
+        incomplete_ratio = incomplete_days / rows
+        for i in np.flatnonzero(incomplete_ratio > self.config.max_incomplete_day_ratio):
+            failures.append(f"{self.features[i]}: {incomplete_days[i]} days without all {self.hours} hours")
+
+        if duplicated_keys:
+            failures.append(f"{duplicated_keys} duplicated rows (same date, or same location and date)")
+        return failures[:MAX_REPORTED_FAILURES]
+
+    def _write_report(self, status, rows, failures, null_counts, out_of_range, incomplete_days, duplicated_keys):
+        rows_checked = max(rows, 1)
+        per_feature = {}
+        for i, feat in enumerate(self.features):
+            block = slice(i * self.hours, (i + 1) * self.hours)
+            per_feature[feat] = {
+                "max_null_ratio": float(null_counts[block].max() / rows_checked),
+                "out_of_range": int(out_of_range[block].sum()),
+                "incomplete_days": int(incomplete_days[i]),
+            }
+
+        report = {
+            "status": status,
+            "rows_checked": rows,
+            "duplicated_keys": duplicated_keys,
+            "failures": failures,
+            "features": per_feature,
+        }
+        root_dir = Path(self.config.root_dir)
+        (root_dir / "validation_report.json").write_text(json.dumps(report, indent=2))
+        with open(self.config.STATUS_FILE, "w") as f:
+            f.write(f"Validation status: {status}")
+
+        for failure in failures:
+            logger.error(f"Data validation: {failure}")
@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 import os 
 from src.datascience import logger
 from src.datascience.entity.config_entity import DataExtractionConfig
+from src.datascience.utils.common import get_env
 
 class DataExtraction:
     """
@@ -50,7 +51,7 @@ class DataExtraction:
                 "et0_fao_evapotranspiration"
             ]
 
-            url = "https://archive-api.open-meteo.com/v1/archive"
+            url = get_env("OPEN_METEO_API_URL", self.config.api_url)
 
             params = {
                 "latitude": self.config.lat,
@@ -61,7 +62,9 @@ class DataExtraction:
                 "timezone": "auto"
             }
 
-            response = requests.get(url=url, params=params)
+            response = requests.get(url=url, params=params, timeout=self.config.timeout_seconds)
+            # Errors come back as {"error": true, "reason": ...} with a 4xx/5xx status
+            response.raise_for_status()
             return pd.DataFrame(response.json()["hourly"])
         
         except Exception as e:
@@ -0,0 +1,148 @@
+import hashlib
+import json
+import sqlite3
+import time
+import numpy as np
+from pathlib import Path
+from src.datascience import logger
+
+
+def fingerprint_data(X, y) -> str:
+    """
+    Computes a hash of the training data so cached scores are only reused on identical data.
+
+    Args:
+        X (np.ndarray): Training matrix
+        y (np.ndarray): Training target
+
+    Returns:
+        str: Hex digest identifying the data
+    """
+    digest = hashlib.sha256()
+    for array in (X, y):
+        array = np.ascontiguousarray(array)
+        digest.update(str((array.shape, array.dtype.str)).encode())
+        digest.update(memoryview(array).cast("B"))
+    return digest.hexdigest()
+
+
+class FoldScoreCache:
+    """
+    On-disk cache of cross-validation fold scores backed by SQLite.
+
+    Each entry is keyed by (estimator, params, fold, scoring, training-data hash, search
+    strategy), so a candidate is only refitted when it has never been evaluated on
+    identical data in the same way. The least recently used entries are evicted once
+    max_entries is exceeded.
+
+    Only the main process reads and writes the cache; workers just fit and score.
+    """
+
+    def __init__(self, path: Path, max_entries: int = 100000):
+        self.path = Path(path)
+        self.max_entries = int(max_entries)
+        self.hits = 0
+        self.misses = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS fold_scores (
+                    key TEXT PRIMARY KEY,
+                    score REAL,
+                    fit_time REAL,
+                    score_time REAL,
+                    last_access REAL
+                )
+                """
+            )
+            # Caches that also stored the out-of-fold predictions of every candidate
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(fold_scores)")]
+            if "predictions" in columns:
+                conn.execute("ALTER TABLE fold_scores DROP COLUMN predictions")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON fold_scores (last_access)")
+
+    def _connect(self):
+        return sqlite3.connect(self.path)
+
+    @staticmethod
+    def make_key(estimator, params: dict, test_indices, scoring, data_hash: str, strategy: str = "fit") -> str:
+        """
+        Builds the cache key of one (estimator, params, fold, data) evaluation.
+
+        The fold is identified by a hash of its test indices, so the key does not depend
+        on how many folds were requested, only on which rows were held out. strategy tells
+        how the candidate was fitted (e.g. "fit" from scratch or "warm_start_path"), since
+        warm-started solutions only match independent fits within solver tolerance.
+        """
+        base_params = {k: v for k, v in estimator.get_params(deep=False).items() if k not in params}
+        blob = json.dumps(
+            {
+                "estimator": type(estimator).__name__,
+                "base_params": sorted((k, repr(v)) for k, v in base_params.items()),
+                "params": sorted((k, repr(v)) for k, v in params.items()),
+                "fold": hashlib.sha1(np.ascontiguousarray(test_indices)).hexdigest(),
+                "scoring": repr(scoring),
+                "data": data_hash,
+                "strategy": strategy,
+            }
+        )
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+    def get_many(self, keys: list) -> dict:
+        """
+        Looks up several keys at once and refreshes their access time.
+
+        Returns:
+            dict: key -> (score, fit_time, score_time) for the keys found
+        """
+        found = {}
+        with self._connect() as conn:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ", ".join(["?"] * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, score, fit_time, score_time FROM fold_scores WHERE key IN ({placeholders})",
+                    chunk
+                ).fetchall()
+                for key, score, fit_time, score_time in rows:
+                    found[key] = (np.nan if score is None else score, fit_time, score_time)
+
+            now = time.time()
+            conn.executemany("UPDATE fold_scores SET last_access = ? WHERE key = ?", [(now, key) for key in found])
+
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, entries: dict):
+        """
+        Stores key -> (score, fit_time, score_time) entries and evicts the least recently used.
+        """
+        if not entries:
+            return
+        now = time.time()
+        rows = [
+            (key, None if np.isnan(score) else float(score), float(fit_time), float(score_time), now)
+            for key, (score, fit_time, score_time) in entries.items()
+        ]
+        with self._connect() as conn:
+            conn.executemany("INSERT OR REPLACE INTO fold_scores VALUES (?, ?, ?, ?, ?)", rows)
+
+            count = conn.execute("SELECT COUNT(*) FROM fold_scores").fetchone()[0]
+            if count > self.max_entries:
+                conn.execute(
+                    """
+                    DELETE FROM fold_scores WHERE key IN (
+                        SELECT key FROM fold_scores ORDER BY last_access ASC LIMIT ?
+                    )
+                    """,
+                    (count - self.max_entries,)
+                )
+                logger.info(f"Evicted {count - self.max_entries} entries from the fold score cache")
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
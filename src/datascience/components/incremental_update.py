@@ -0,0 +1,195 @@
+import os
+import json
+import joblib
+import numpy as np
+import pandas as pd
+import psycopg2
+from pathlib import Path
+from datetime import datetime, timezone
+from dotenv import load_dotenv
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score, log_loss
+from src.datascience import logger
+from src.datascience.entity.config_entity import IncrementalUpdateConfig
+from src.datascience.components.data_transformation import extract_features, transform_features, FEATURES_TO_STANDARDIZE
+from src.datascience.utils.common import get_env
+
+load_dotenv()
+
+CLASSES = np.array([0, 1])
+
+
+class IncrementalModelUpdater:
+    """
+    Component that updates an online model with the days ingested after the last training
+    watermark, instead of rerunning DataTransformation and ModelTrainer.
+
+    The online model is an SGDClassifier with logistic loss, bootstrapped from the train.csv
+    of the last full run, and the scaler of that run keeps updating its running mean and
+    variance with every new day. The full pipeline (main.py) remains the periodic fallback:
+    each full retrain resets the online model to its new training data.
+    """
+
+    def __init__(self, config: IncrementalUpdateConfig):
+        self.config = config
+        self.model_path = Path(self.config.root_dir) / self.config.model_name
+        self.scaler_path = Path(self.config.root_dir) / "scaler.joblib"
+        self.state_path = Path(self.config.root_dir) / "state.json"
+
+    def _load_base(self) -> dict:
+        """
+        Watermark of the last full DataTransformation run.
+
+        Raises:
+            FileNotFoundError: If the full pipeline never ran
+        """
+        with open(self.config.watermark_path) as f:
+            return json.load(f)
+
+    def _bootstrap(self, base: dict):
+        """
+        Starts a fresh online model from the training data of the last full run.
+        """
+        logger.info(f"Bootstrapping online model from {self.config.train_data_path}")
+        train = pd.read_csv(self.config.train_data_path)
+        X = train.drop(columns=[self.config.target_column])
+        y = train[self.config.target_column].astype(int).to_numpy()
+
+        model = SGDClassifier(loss="log_loss", alpha=self.config.alpha, random_state=42)
+        rng = np.random.default_rng(42)
+        for _ in range(self.config.bootstrap_epochs):
+            order = rng.permutation(len(y))
+            model.partial_fit(X.iloc[order], y[order], classes=CLASSES)
+
+        scaler = joblib.load(self.config.scaler_path)
+        state = {
+            "watermark": base["watermark"],
+            "base_watermark": base["watermark"],
+            "base_created_at": base["created_at"],
+            "updates": 0,
+            "rows_seen": int(len(y))
+        }
+        return model, scaler, state
+
+    def _load_state(self, base: dict):
+        """
+        Loads the online model, or bootstraps it when missing or older than the last full run.
+        """
+        if self.model_path.exists() and self.state_path.exists():
+            state = json.loads(self.state_path.read_text())
+            if state["base_watermark"] == base["watermark"] and state["base_created_at"] == base["created_at"]:
+                return joblib.load(self.model_path), joblib.load(self.scaler_path), state
+            logger.info("A full retrain happened since the last update, resetting the online model")
+        return self._bootstrap(base)
+
+    def _read_new_rows(self, watermark: str) -> pd.DataFrame:
+        """
+        Reads only the raw rows dated after the watermark, from the database or from the
+        ingested csv (streamed in chunks so old days are never held in memory).
+        """
+        if self.config.source == "database":
+            conn = psycopg2.connect(
+                host=get_env("POSTGRES_HOST"),
+                database=get_env("POSTGRES_DB"),
+                user=get_env("POSTGRES_USER"),
+                password=get_env("POSTGRES_PASSWORD"),
+                port=get_env("POSTGRES_PORT", "5432")
+            )
+            try:
+                return pd.read_sql(
+                    "SELECT * FROM weather_data WHERE date > %(watermark)s ORDER BY date",
+                    conn,
+                    params={"watermark": watermark}
+                )
+            finally:
+                conn.close()
+
+        if self.config.source == "csv":
+            chunks = []
+            for chunk in pd.read_csv(self.config.data_path, chunksize=10000):
+                chunks.append(chunk[pd.to_datetime(chunk["date"]) > pd.Timestamp(watermark)])
+            return pd.concat(chunks, ignore_index=True).sort_values("date", ignore_index=True)
+
+        raise ValueError(f"Unknown incremental update source '{self.config.source}', expected database or csv")
+
+    def _save(self, model, scaler, state: dict):
+        """
+        Publishes the updated model, scaler and state. Each file is written then renamed,
+        so a reader never sees a half-written artifact.
+        """
+        for obj, path in ((model, self.model_path), (scaler, self.scaler_path)):
+            tmp_path = path.with_suffix(".tmp")
+            joblib.dump(obj, tmp_path)
+            os.replace(tmp_path, path)
+
+        tmp_path = self.state_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(state, indent=2))
+        os.replace(tmp_path, self.state_path)
+
+    def update(self) -> dict:
+        """
+        Applies the days after the watermark to the online model and publishes it.
+
+        Returns:
+            dict: State of the online model (watermark, number of updates, last update metrics)
+
+        Raises:
+            FileNotFoundError: If the full pipeline never produced a watermark, scaler or train.csv
+            Exception: If there is an error during the update
+        """
+        try:
+            base = self._load_base()
+            model, scaler, state = self._load_state(base)
+
+            new_rows = self._read_new_rows(state["watermark"])
+            if new_rows.empty:
+                logger.info(f"No rows after watermark {state['watermark']}, online model unchanged")
+                self._save(model, scaler, state)
+                return state
+
+            df = transform_features(extract_features(new_rows, keep_date=True))
+            watermark = str(df["date"].max())
+            y = df[self.config.target_column].astype(int).to_numpy()
+            X = df.drop(columns=[self.config.target_column, "date"])
+            X = X.reindex(columns=model.feature_names_in_)
+
+            # Update the running statistics first so the new days are scaled consistently
+            scaler.partial_fit(X[FEATURES_TO_STANDARDIZE])
+            X[FEATURES_TO_STANDARDIZE] = scaler.transform(X[FEATURES_TO_STANDARDIZE])
+
+            # Test-then-train: score the new days before the model learns from them
+            proba = model.predict_proba(X)[:, 1]
+            metrics = {
+                "rows": int(len(y)),
+                "log_loss": float(log_loss(y, proba, labels=CLASSES)),
+                "accuracy": float(accuracy_score(y, (proba >= 0.5).astype(int)))
+            }
+            model.partial_fit(X, y, classes=CLASSES)
+
+            state.update({
+                "watermark": watermark,
+                "updates": state["updates"] + 1,
+                "rows_seen": state["rows_seen"] + len(y),
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+                "last_update": metrics
+            })
+
+            # The online model drifts from the full search, flag when the periodic retrain is due
+            base_age = datetime.now(timezone.utc) - datetime.fromisoformat(base["created_at"])
+            state["full_retrain_due"] = base_age.days >= self.config.full_retrain_every_days
+            if state["full_retrain_due"]:
+                logger.warning(f"Last full retrain was {base_age.days} days ago, run the full pipeline (main.py)")
+
+            self._save(model, scaler, state)
+            logger.info(
+                f"Online model updated with {len(y)} rows up to {watermark} "
+                f"(pre-update log loss {metrics['log_loss']:.4f}, accuracy {metrics['accuracy']:.3f})"
+            )
+            return state
+
+        except FileNotFoundError as e:
+            logger.error(f"Missing artifact of the full pipeline, run main.py first: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Error during incremental update: {e}")
+            raise
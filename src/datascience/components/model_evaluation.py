@@ -1,25 +1,70 @@
 import os
 import pandas as pd
-from sklearn.metrics import (
-    classification_report,
-    roc_auc_score,
-    average_precision_score,
-    RocCurveDisplay,
-    PrecisionRecallDisplay,
-    ConfusionMatrixDisplay,
-)
-import matplotlib.pyplot as plt
 from urllib.parse import urlparse
 import mlflow
 from pathlib import Path
-import mlflow.sklearn
 import numpy as np
 import joblib
 import json
+import time
+from joblib import Parallel, delayed
 from dotenv import load_dotenv
 from src.datascience.entity.config_entity import ModelEvaluationConfig
 load_dotenv()
 from src.datascience.utils.common import get_env
+from src.datascience.utils.mlflow_logging import AsyncMlflowLogger
+from src.datascience.utils.metrics import binary_curves, confusion_from_labels, report_from_confusion, StreamingBinaryMetrics
+from src.datascience.utils.plotting import BackgroundPlotRenderer
+from src.datascience.utils.importance import permutation_importance_parallel
+from src.datascience.utils.serving import score_and_label
+from src.datascience import logger
+
+
+def _score_candidate(entry: dict, source: str, checkpoint_dir: str, tracking_uri: str, X, y, latency_repeats: int) -> dict:
+    """
+    Loads one leaderboard model and scores it on the shared test matrix (a memmap, so
+    every worker reads the same pages instead of receiving a copy).
+
+    The model is loaded from its MLflow run when source is mlflow (only available for
+    logged models), otherwise, or when that fails, from the local checkpoint of its family.
+    """
+    name = entry["model"]
+    model, loaded_from = None, "local"
+    if source == "mlflow" and entry.get("run_id"):
+        try:
+            import mlflow.sklearn
+            mlflow.set_tracking_uri(tracking_uri)
+            model, loaded_from = mlflow.sklearn.load_model(f"runs:/{entry['run_id']}/{name}"), "mlflow"
+        except Exception as e:
+            logger.warning(f"Could not load {name} from MLflow run {entry['run_id']}, using the local checkpoint: {e}")
+    if model is None:
+        model = joblib.load(os.path.join(checkpoint_dir, f"{name}.joblib"))["best_estimator"]
+
+    start = time.perf_counter()
+    y_score, y_pred, _ = score_and_label(model, X)
+    batch_seconds = time.perf_counter() - start
+
+    single_ms = []
+    for _ in range(latency_repeats):
+        start = time.perf_counter()
+        score_and_label(model, X[:1])
+        single_ms.append((time.perf_counter() - start) * 1000)
+
+    report = report_from_confusion(confusion_from_labels(y, y_pred))
+    curves = binary_curves(y, y_score) if y_score is not None else None
+    return {
+        "model": name,
+        "source": loaded_from,
+        "cv_best_score": entry["cv_best_score"],
+        "test_roc_auc": curves["roc_auc"] if curves else None,
+        "test_average_precision": curves["average_precision"] if curves else None,
+        "test_accuracy": report["accuracy"],
+        "test_f1_weighted": report["weighted avg"]["f1-score"],
+        "batch_predict_ms": batch_seconds * 1000,
+        "batch_rows_per_s": len(y) / batch_seconds if batch_seconds > 0 else float("inf"),
+        "single_predict_ms": float(np.median(single_ms)),
+    }
+
 
 class ModelEvaluation:
     """
@@ -30,12 +75,19 @@ class ModelEvaluation:
             Initializes MLflow authentication, tracking URI, and experiment name.
         
         evaluate():
-            - Loads the trained model and test dataset.
-            - Generates predictions and probability scores.
-            - Computes metrics: accuracy, precision, recall, F1, and ROC AUC.
-            - Logs metrics and plots (ROC, PR curve, confusion matrix) to MLflow.
+            - Loads the trained model and test dataset, whole or in chunks of chunk_size rows.
+            - Runs inference once and derives the predicted labels from the scores, except
+              for SVC, whose predict does not always agree with its probabilities.
+            - Computes metrics: accuracy, precision, recall, F1, ROC AUC and average precision,
+              with the ROC and PR curves from a single sort of the scores.
+            - Logs metrics and plots (ROC, PR curve, confusion matrix) to MLflow. The plots are
+              rendered in a separate process while the rest is logged, unless plots is off.
             - Saves metrics locally as JSON.
             - Logs the evaluated model to MLflow.
+            - Optionally computes permutation importance in parallel and writes the features
+              worth keeping for the next ModelTrainer run.
+            - Optionally scores the top compare_top_k leaderboard models concurrently and
+              saves a comparison table of test metrics and inference latency.
     """
 
     def __init__(self, config: ModelEvaluationConfig):
@@ -46,22 +98,163 @@ class ModelEvaluation:
         os.environ["MLFLOW_TRACKING_USERNAME"] = get_env("MLFLOW_TRACKING_USERNAME")
         os.environ["MLFLOW_TRACKING_PASSWORD"] = get_env("MLFLOW_TRACKING_PASSWORD")
         mlflow.set_tracking_uri(get_env("MLFLOW_TRACKING_URI", "http://localhost:5000"))
-        mlflow.set_experiment(self.config.experiment_name)
+        experiment = mlflow.set_experiment(self.config.experiment_name)
+        self.tracker = AsyncMlflowLogger(experiment.experiment_id)
+
+
+    def _feature_columns(self, columns) -> list:
+        """
+        Columns the model was trained on (feature_names.json of the trainer, in training
+        order), or every non-target column when the file is missing.
+        """
+        path = Path(self.config.feature_names_path)
+        if path.exists():
+            return json.loads(path.read_text())
+        return [col for col in columns if col != self.config.target_column]
+
+    def _evaluate_in_memory(self, model):
+        """
+        Scores the whole test set at once, the curves are exact.
+
+        Returns:
+            tuple: (curves or None, confusion matrix)
+        """
+        test_df = pd.read_csv(self.config.test_data_path)
+        X_test = test_df[self._feature_columns(test_df.columns)]
+        y_test = test_df[self.config.target_column].astype(int).to_numpy()
+
+        y_score, y_pred, _ = score_and_label(model, X_test)
+        curves = binary_curves(y_test, y_score) if y_score is not None else None
+        return curves, confusion_from_labels(y_test, y_pred)
+
+    def _evaluate_chunked(self, model):
+        """
+        Streams the test file in chunks of chunk_size rows and accumulates the confusion
+        matrix and histogram-binned scores, so the test set never has to fit in memory.
+        Decision scores go through a sigmoid to be binned like probabilities.
+
+        Returns:
+            tuple: (curves or None, confusion matrix)
+        """
+        accumulator = StreamingBinaryMetrics(n_bins=self.config.score_bins)
+        n_rows = 0
+        for chunk in pd.read_csv(self.config.test_data_path, chunksize=self.config.chunk_size):
+            X_chunk = chunk[self._feature_columns(chunk.columns)]
+            y_chunk = chunk[self.config.target_column].astype(int).to_numpy()
+
+            y_score, y_pred, is_proba = score_and_label(model, X_chunk)
+            if y_score is not None and not is_proba:
+                y_score = 1 / (1 + np.exp(-y_score))
+            accumulator.update(y_chunk, y_pred, y_score)
+            n_rows += len(chunk)
+
+        logger.info(f"Evaluated {n_rows} rows in chunks of {self.config.chunk_size}")
+        return accumulator.curves(), accumulator.confusion
 
+    def _permutation_importance(self, model, run_id):
+        """
+        Permutation importance of every feature on the test set (at most importance_max_rows
+        rows), computed in parallel across features. With prune_features, the features whose
+        mean importance is above importance_threshold are written to selected_features_path
+        for the next training run.
+        """
+        if not hasattr(model, "fit"):
+            # sklearn scorers only accept estimators
+            logger.warning(f"Skipping permutation importance: {type(model).__name__} is not an sklearn estimator")
+            return
+
+        test_df = pd.read_csv(self.config.test_data_path, nrows=self.config.importance_max_rows)
+        features = self._feature_columns(test_df.columns)
+        X = test_df[features].to_numpy()
+        y = test_df[self.config.target_column].astype(int).to_numpy()
+
+        result = permutation_importance_parallel(
+            model, X, y,
+            scoring=self.config.importance_scoring,
+            n_repeats=self.config.importance_repeats,
+            n_jobs=self.config.importance_n_jobs
+        )
+
+        table = sorted(
+            (
+                {"feature": feature, "importance_mean": float(mean), "importance_std": float(std)}
+                for feature, mean, std in zip(features, result["importances_mean"], result["importances_std"])
+            ),
+            key=lambda row: row["importance_mean"],
+            reverse=True
+        )
+        importance_path = Path(os.path.join(self.config.root_dir, "permutation_importance.json"))
+        importance_path.write_text(json.dumps(
+            {"scoring": self.config.importance_scoring, "baseline_score": result["baseline_score"], "features": table},
+            indent=2
+        ))
+        self.tracker.log_artifact(run_id, str(importance_path))
+        self.tracker.log_metrics(run_id, {f"importance_{row['feature']}": row["importance_mean"] for row in table})
+        logger.info("Permutation importance: " + ", ".join(f"{row['feature']}={row['importance_mean']:.4f}" for row in table))
+
+        if self.config.prune_features:
+            # Keep the training order so feature_names.json stays aligned with the columns
+            kept = [f for f, mean in zip(features, result["importances_mean"]) if mean > self.config.importance_threshold]
+            dropped = [f for f in features if f not in kept]
+            Path(self.config.selected_features_path).write_text(json.dumps(kept, indent=2))
+            self.tracker.log_params(run_id, {"pruned_features": ",".join(dropped) or "none"})
+            logger.info(f"Kept {len(kept)} of {len(features)} features, dropped {dropped}, saved at {self.config.selected_features_path}")
+
+    def _compare_top_k(self, run_id):
+        """
+        Scores the compare_top_k best models of cv_leaderboard.json in parallel against one
+        memory-mapped copy of the test matrix, so choosing the production model does not
+        need k evaluation runs.
+
+        Returns:
+            pd.DataFrame: One row per model, sorted by test ROC AUC, or None when the
+            leaderboard is missing or empty
+        """
+        leaderboard_path = Path(self.config.leaderboard_path)
+        leaderboard = json.loads(leaderboard_path.read_text()) if leaderboard_path.exists() else []
+        top_k = sorted(leaderboard, key=lambda entry: entry["cv_best_score"], reverse=True)[:self.config.compare_top_k]
+        if not top_k:
+            logger.warning(f"Skipping the top-k comparison: no models in {leaderboard_path}")
+            return None
+
+        test_df = pd.read_csv(self.config.test_data_path)
+        X = np.ascontiguousarray(test_df[self._feature_columns(test_df.columns)].to_numpy(dtype=np.float64))
+        y = test_df[self.config.target_column].astype(int).to_numpy()
+        matrix_path = os.path.join(self.config.root_dir, "test_matrix.joblib")
+        joblib.dump((X, y), matrix_path)
+        X, y = joblib.load(matrix_path, mmap_mode="r")
+
+        n_jobs = max(1, min(len(top_k), self.config.compare_n_jobs)) if self.config.compare_n_jobs > 0 else -1
+        rows = Parallel(n_jobs=n_jobs)(
+            delayed(_score_candidate)(
+                entry, self.config.model_source, str(self.config.checkpoint_dir),
+                mlflow.get_tracking_uri(), X, y, self.config.latency_repeats
+            )
+            for entry in top_k
+        )
+        comparison = pd.DataFrame(rows).sort_values("test_roc_auc", ascending=False, na_position="last", ignore_index=True)
+
+        comparison_path = Path(os.path.join(self.config.root_dir, "model_comparison.json"))
+        comparison_path.write_text(json.dumps(comparison.to_dict(orient="records"), indent=2))
+        self.tracker.log_artifact(run_id, str(comparison_path))
+        for row in rows:
+            self.tracker.log_metrics(run_id, {
+                f"{row['model']}_test_roc_auc": row["test_roc_auc"] if row["test_roc_auc"] is not None else float("nan"),
+                f"{row['model']}_single_predict_ms": row["single_predict_ms"]
+            })
+        logger.info(f"Top {len(rows)} models on the test set:\n{comparison.to_string(index=False)}")
+        return comparison
 
     def evaluate(self):
         self._init_mlflow()
 
-        # Load the model and data
+        # Load the model
         model = joblib.load(self.config.model_path)
-        test_df = pd.read_csv(self.config.test_data_path)
-
-        X_test = test_df.drop(columns=[self.config.target_column])
-        y_test = test_df[self.config.target_column].astype(int)
 
         # Start Evaluation
 
-        with mlflow.start_run(run_name="evaluation"):
+        run_id = self.tracker.start_run(run_name="evaluation")
+        try:
             # Link to training run if available
 
             train_run_id = ""
@@ -70,16 +263,18 @@ class ModelEvaluation:
             except Exception:
                 pass
             
-            # Predictions
-            if hasattr(model, "predict_proba"):
-                y_score = model.predict_proba(X_test)[:, 1]
-            elif hasattr(model, "decision_function"):
-                y_score = model.decision_function(X_test)
+            # Predictions, one inference pass over the test data
+            if self.config.chunk_size:
+                curves, confusion = self._evaluate_chunked(model)
             else:
-                y_score = None
+                curves, confusion = self._evaluate_in_memory(model)
+
+            # Render the plots in the background from the precomputed curves
+            renderer = None
+            if self.config.plots:
+                renderer = BackgroundPlotRenderer(curves, confusion, os.path.join(self.config.root_dir, "plots"))
 
-            y_pred = model.predict(X_test)
-            report = classification_report(y_test, y_pred, output_dict=True)
+            report = report_from_confusion(confusion)
 
             metrics = {
                         "accuracy": float(report["accuracy"]),
@@ -88,41 +283,45 @@ class ModelEvaluation:
                         "f1_weighted": float(report["weighted avg"]["f1-score"]),
                     }
         
-            # we need y_score not to be none in order to be able to calculate roc_auc
-            if y_score is not None:
-                metrics["roc_auc"] = float(roc_auc_score(y_test, y_score))
+            # we need scores in order to be able to calculate roc_auc
+            if curves is not None:
+                metrics["roc_auc"] = curves["roc_auc"]
+                metrics["average_precision"] = curves["average_precision"]
 
             # Log the metrics to mlflow
-            mlflow.log_metrics(metrics)
+            self.tracker.log_metrics(run_id, metrics)
 
             # save the metrics as artifact
 
             metrics_path = Path(os.path.join(self.config.root_dir, "test_metrics.json"))
-            metrics_blob = {"metrics": metrics, "classification_report": report}
+            metrics_blob = {
+                "metrics": metrics,
+                "classification_report": report,
+                "confusion_matrix": confusion.tolist(),
+                "mode": "chunked" if self.config.chunk_size else "in_memory"
+            }
             metrics_path.write_text(json.dumps(metrics_blob, indent=2)) 
-            mlflow.log_artifact(str(metrics_path))
-
-
-            # Plots
+            self.tracker.log_artifact(run_id, str(metrics_path))
 
-            if y_score is not None:
-                RocCurveDisplay.from_predictions(y_test, y_score)
-                mlflow.log_figure(plt.gcf(), "roc_curve.png")
-                plt.close()
-
-                PrecisionRecallDisplay.from_predictions(y_test, y_score)
-                mlflow.log_figure(plt.gcf(), "pr_curve.png")
-                plt.close()
-
-
-            ConfusionMatrixDisplay.from_predictions(y_test, y_pred)
-            mlflow.log_figure(plt.gcf(), "confusion_matrix.png")
-            plt.close()
 
             # log evaluated model
-            mlflow.sklearn.log_model(model, artifact_path="evaluated_model")
+            if self.config.log_model:
+                self.tracker.log_model(run_id, model, artifact_path="evaluated_model")
+
+            if self.config.permutation_importance:
+                self._permutation_importance(model, run_id)
 
+            if self.config.compare_top_k > 0:
+                self._compare_top_k(run_id)
 
+            # Plots, logged once the rendering process is done
+            if renderer is not None:
+                for plot_path in renderer.wait():
+                    self.tracker.log_artifact(run_id, plot_path)
 
+            # Wait for the background MLflow uploads before finishing the run
+            self.tracker.close()
 
-    
\ No newline at end of file
+        except Exception:
+            self.tracker.close(status="FAILED")
+            raise
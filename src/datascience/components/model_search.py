@@ -0,0 +1,342 @@
+import time
+import numpy as np
+from joblib import Parallel, delayed
+from scipy.stats import rankdata
+from sklearn.base import clone
+from sklearn.metrics import check_scoring
+from sklearn.model_selection import ParameterGrid, check_cv
+from src.datascience import logger
+from src.datascience.components.fold_score_cache import FoldScoreCache
+from src.datascience.utils.parallel import supports_streaming
+
+# Finished (candidate, fold) results are written to the cache every CHECKPOINT_EVERY
+# results or CHECKPOINT_SECONDS seconds, whichever comes first
+CHECKPOINT_EVERY = 25
+CHECKPOINT_SECONDS = 10
+
+
+def _build_cv_results(candidates, scores, fit_times, score_times) -> dict:
+    """
+    Builds a dictionary with the same layout as GridSearchCV.cv_results_.
+
+    Args:
+        candidates (list): Parameter dicts, one per candidate
+        scores (np.ndarray): Test scores with shape (n_candidates, n_splits)
+        fit_times (np.ndarray): Fit times with shape (n_candidates, n_splits)
+        score_times (np.ndarray): Score times with shape (n_candidates, n_splits)
+    """
+    n_candidates, n_splits = scores.shape
+    results = {
+        "mean_fit_time": fit_times.mean(axis=1),
+        "std_fit_time": fit_times.std(axis=1),
+        "mean_score_time": score_times.mean(axis=1),
+        "std_score_time": score_times.std(axis=1),
+    }
+
+    # param_<name> columns are masked where a candidate does not use the parameter
+    names = sorted({name for params in candidates for name in params})
+    for name in names:
+        column = np.ma.MaskedArray(np.empty(n_candidates, dtype=object), mask=True)
+        for i, params in enumerate(candidates):
+            if name in params:
+                column[i] = params[name]
+        results[f"param_{name}"] = column
+    results["params"] = candidates
+
+    for split in range(n_splits):
+        results[f"split{split}_test_score"] = scores[:, split]
+
+    mean_scores = scores.mean(axis=1)
+    results["mean_test_score"] = mean_scores
+    results["std_test_score"] = scores.std(axis=1)
+
+    # Failed candidates (nan) are ranked last, like GridSearchCV does
+    ranking_scores = np.where(np.isnan(mean_scores), -np.inf, mean_scores)
+    results["rank_test_score"] = rankdata(-ranking_scores, method="min").astype(np.int32)
+    return results
+
+
+def positive_scores(model, X) -> np.ndarray:
+    """
+    Scores of the positive class: predict_proba[:, 1], or decision_function when the model
+    has no probabilities. Used for out-of-fold predictions and by the stacked ensemble.
+    """
+    if hasattr(model, "predict_proba"):
+        return model.predict_proba(X)[:, 1]
+    return model.decision_function(X)
+
+
+def _fit_and_score(estimator, params, X, y, train, test, scorer):
+    """
+    Fits one candidate on one fold.
+
+    Returns:
+        tuple: (score, fit_time, score_time), with a nan score if the fit failed
+    """
+    start = time.perf_counter()
+    try:
+        est = clone(estimator).set_params(**params)
+        est.fit(X[train], y[train])
+    except Exception as e:
+        logger.warning(f"Fit failed for {params}: {e}")
+        return np.nan, time.perf_counter() - start, 0.0
+    fit_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    score = scorer(est, X[test], y[test])
+    score_time = time.perf_counter() - start
+    return score, fit_time, score_time
+
+
+def _fit_path(estimator, fixed_params, Cs, X, y, train, test, scorer):
+    """
+    Fits one fold along the whole C path, warm starting each fit from the previous solution.
+
+    Returns:
+        list: (score, fit_time, score_time) for every C in Cs
+    """
+    est = clone(estimator).set_params(**fixed_params, warm_start=True)
+    X_train, y_train = X[train], y[train]
+    X_test, y_test = X[test], y[test]
+
+    results = []
+    for C in Cs:
+        start = time.perf_counter()
+        try:
+            est.set_params(C=C)
+            est.fit(X_train, y_train)
+        except Exception as e:
+            logger.warning(f"Fit failed for {fixed_params} with C={C}: {e}")
+            results.append((np.nan, time.perf_counter() - start, 0.0))
+            # Start the next C from scratch since this solution is unusable
+            est = clone(estimator).set_params(**fixed_params, warm_start=True)
+            continue
+        fit_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        score = scorer(est, X_test, y_test)
+        score_time = time.perf_counter() - start
+        results.append((score, fit_time, score_time))
+    return results
+
+
+def _tagged(task, fn, *args):
+    return task, fn(*args)
+
+
+class _BaseSearchCV:
+    """
+    Shared logic of the custom searches: fold handling, fold score caching, building
+    GridSearchCV-shaped results and refitting the best candidate.
+
+    When a FoldScoreCache and a data_hash are given, (candidate, fold) pairs already
+    evaluated on identical data with the same cache_strategy are read from the cache
+    instead of being refitted.
+    """
+
+    # Part of the cache keys: how each candidate is fitted
+    cache_strategy = "fit"
+
+    def __init__(self, estimator, param_grid, cv=5, scoring=None, n_jobs=None,
+                 cache: FoldScoreCache = None, data_hash: str = None):
+        self.estimator = estimator
+        self.param_grid = param_grid
+        self.cv = cv
+        self.scoring = scoring
+        self.n_jobs = n_jobs
+        self.cache = cache
+        self.data_hash = data_hash
+
+    def _cache_keys(self, candidates, folds) -> list:
+        """
+        Returns a (n_candidates, n_folds) nested list of cache keys, or None without a cache.
+        """
+        if self.cache is None or self.data_hash is None:
+            return None
+        return [
+            [
+                FoldScoreCache.make_key(self.estimator, params, test, self.scoring, self.data_hash, self.cache_strategy)
+                for _, test in folds
+            ]
+            for params in candidates
+        ]
+
+    def _lookup(self, keys) -> dict:
+        if keys is None:
+            return {}
+        return self.cache.get_many([key for row in keys for key in row])
+
+    def _store(self, keys, results):
+        """
+        Writes freshly computed (candidate, fold) results to the cache.
+        """
+        if keys is None:
+            return
+        self.cache.put_many({keys[c][f]: result for (c, f), result in results.items()})
+
+    def _run(self, jobs, keys, expand) -> dict:
+        """
+        Runs the jobs in parallel and checkpoints their results to the cache as they finish,
+        so an interrupted search only loses the candidates that were still running.
+
+        Args:
+            jobs: delayed(_tagged)(task, fn, ...) calls
+            keys: Cache keys from _cache_keys
+            expand: Maps (task, result) to {(candidate, fold): (score, fit_time, score_time)}
+        """
+        # Backends that cannot stream results (e.g. ray) checkpoint once the search is done
+        return_as = "generator_unordered" if supports_streaming() else "list"
+
+        computed, unsaved = {}, {}
+        last_store = time.monotonic()
+        for task, result in Parallel(n_jobs=self.n_jobs, return_as=return_as)(jobs):
+            entries = expand(task, result)
+            computed.update(entries)
+            unsaved.update(entries)
+            if len(unsaved) >= CHECKPOINT_EVERY or time.monotonic() - last_store >= CHECKPOINT_SECONDS:
+                self._store(keys, unsaved)
+                unsaved, last_store = {}, time.monotonic()
+        self._store(keys, unsaved)
+        return computed
+
+    def _finalize(self, X, y, candidates, results, folds):
+        """
+        Builds cv_results_ from {(candidate, fold): (score, fit_time, score_time)} and refits
+        the best candidate on the full training data.
+        """
+        n_folds = len(folds)
+        table = np.array(
+            [[results[(c, f)] for f in range(n_folds)] for c in range(len(candidates))],
+            dtype=float
+        )
+        self.cv_results_ = _build_cv_results(candidates, table[:, :, 0], table[:, :, 1], table[:, :, 2])
+        self.n_splits_ = n_folds
+        self.best_index_ = int(np.nanargmax(self.cv_results_["mean_test_score"]))
+        self.best_params_ = candidates[self.best_index_]
+        self.best_score_ = float(self.cv_results_["mean_test_score"][self.best_index_])
+
+        # Refit on the full training data with the original X so feature names are kept
+        self.best_estimator_ = clone(self.estimator).set_params(**self.best_params_).fit(X, y)
+        return self
+
+    def _prepare(self, X, y):
+        # Arrays (including memmaps) are passed through untouched so the joblib backend can
+        # recognise them, e.g. to reuse the copy scattered to dask workers
+        X_array = X if isinstance(X, np.ndarray) else np.asarray(X)
+        y_array = y if isinstance(y, np.ndarray) else np.asarray(y)
+        scorer = check_scoring(self.estimator, scoring=self.scoring)
+        folds = list(check_cv(self.cv, y_array, classifier=True).split(X_array, y_array))
+        return X_array, y_array, scorer, folds
+
+
+class CachedGridSearchCV(_BaseSearchCV):
+    """
+    Exhaustive grid search equivalent to GridSearchCV that only fits the (candidate, fold)
+    pairs missing from the fold score cache.
+
+    Attributes set by fit: cv_results_, best_index_, best_score_, best_params_,
+    best_estimator_, cache_hits_ and cache_misses_.
+    """
+
+    def fit(self, X, y):
+        X_array, y_array, scorer, folds = self._prepare(X, y)
+        candidates = list(ParameterGrid(self.param_grid))
+
+        keys = self._cache_keys(candidates, folds)
+        cached = self._lookup(keys)
+
+        results, pending = {}, []
+        for c in range(len(candidates)):
+            for f in range(len(folds)):
+                if keys is not None and keys[c][f] in cached:
+                    results[(c, f)] = cached[keys[c][f]]
+                else:
+                    pending.append((c, f))
+
+        self.cache_hits_, self.cache_misses_ = len(results), len(pending)
+        logger.info(f"Fitting {len(pending)} of {len(candidates) * len(folds)} (candidate, fold) pairs")
+
+        computed = self._run(
+            (
+                delayed(_tagged)((c, f), _fit_and_score, self.estimator, candidates[c], X_array, y_array, *folds[f], scorer)
+                for c, f in pending
+            ),
+            keys,
+            lambda task, result: {task: result}
+        )
+        results.update(computed)
+
+        return self._finalize(X, y, candidates, results, folds)
+
+
+class LogisticPathSearchCV(_BaseSearchCV):
+    """
+    Grid search for LogisticRegression that computes the whole regularization path per fold.
+
+    Instead of fitting every C independently, the Cs of each (solver, penalty, l1_ratio, ...)
+    combination are fitted in increasing order with warm_start=True so every solution
+    initialises the next one. Solvers that do not support warm starts (liblinear) simply
+    refit. The scores match GridSearchCV within solver tolerance, not exactly, because a
+    warm-started solver stops at a slightly different point than a cold one.
+
+    With a fold score cache, a (path, fold) pair is only refitted when one of its Cs is
+    missing from the cache. Its entries are keyed as warm-started, so they are never
+    returned to a CachedGridSearchCV of the same candidates, and the other way round.
+
+    The fitted object exposes the GridSearchCV attributes used by ModelTrainer:
+    cv_results_, best_index_, best_score_, best_params_ and best_estimator_.
+    """
+
+    cache_strategy = "warm_start_path"
+
+    def _paths(self) -> list:
+        """
+        Splits the grid into (fixed params, sorted Cs) paths.
+        """
+        grids = self.param_grid if isinstance(self.param_grid, list) else [self.param_grid]
+        paths = []
+        for grid in grids:
+            grid = dict(grid)
+            Cs = sorted(grid.pop("C", [self.estimator.C]))
+            for fixed_params in ParameterGrid(grid):
+                paths.append((fixed_params, Cs))
+        return paths
+
+    def fit(self, X, y):
+        X_array, y_array, scorer, folds = self._prepare(X, y)
+        paths = self._paths()
+
+        # Candidate c of path p lives at index offsets[p] + c
+        candidates, offsets = [], []
+        for fixed_params, Cs in paths:
+            offsets.append(len(candidates))
+            candidates.extend({**fixed_params, "C": C} for C in Cs)
+
+        keys = self._cache_keys(candidates, folds)
+        cached = self._lookup(keys)
+
+        results, pending = {}, []
+        for p, (_, Cs) in enumerate(paths):
+            for f in range(len(folds)):
+                indices = range(offsets[p], offsets[p] + len(Cs))
+                if keys is not None and all(keys[c][f] in cached for c in indices):
+                    results.update({(c, f): cached[keys[c][f]] for c in indices})
+                else:
+                    pending.append((p, f))
+
+        self.cache_hits_ = len(results)
+        self.cache_misses_ = len(candidates) * len(folds) - len(results)
+
+        computed = self._run(
+            (
+                delayed(_tagged)((p, f), _fit_path, self.estimator, paths[p][0], paths[p][1], X_array, y_array, *folds[f], scorer)
+                for p, f in pending
+            ),
+            keys,
+            lambda task, path_results: {
+                (offsets[task[0]] + c, task[1]): result for c, result in enumerate(path_results)
+            }
+        )
+        results.update(computed)
+
+        return self._finalize(X, y, candidates, results, folds)
@@ -1,23 +1,41 @@
 import pandas as pd
+import numpy as np
 from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
 from sklearn.svm import SVC
-from sklearn.model_selection import GridSearchCV
+from sklearn.kernel_approximation import Nystroem
+from sklearn.pipeline import Pipeline
+from sklearn.base import clone
+from sklearn.model_selection import GridSearchCV, StratifiedKFold, train_test_split
 from src.datascience import logger
 import joblib
 from typing import List
 from pathlib import Path
 import mlflow
-import mlflow.sklearn
 import os
 from dotenv import load_dotenv
 import json
+import time
+import hashlib
 from src.datascience.entity.config_entity import ModelTrainerConfig
+from src.datascience.components.model_search import LogisticPathSearchCV, CachedGridSearchCV
+from src.datascience.components.fold_score_cache import FoldScoreCache, fingerprint_data
+from src.datascience.components.stacking import StackedEnsemble, fit_meta_learner, out_of_fold_scores
 from src.datascience.utils.common import get_env
+from src.datascience.utils.mlflow_logging import AsyncMlflowLogger
+from src.datascience.utils.cv_results import save_cv_results
+from src.datascience.utils.parallel import check_backend, parallel_backend
+from src.datascience.utils.profiling import profile_model, within_budget
 load_dotenv()
 
 EXPERIMENT_NAME = "rain-prediction"
 
+# Families that fit float32 input as is (saga/liblinear, trees, Nystroem features). libsvm
+# and HistGradientBoosting convert it to float64 on every fit, so svm and
+# hist_gradient_boosting always get a float64 matrix: float32 folds would only add a
+# converted copy per fit
+FLOAT32_FAMILIES = ("logistic_regression", "random_forest", "nystroem_svm")
+
 
 class ModelTrainer:
     """
@@ -26,13 +44,28 @@ class ModelTrainer:
     def __init__(self, config: ModelTrainerConfig):
         self.config = config
         self.estimators = {}
+        self.cv_folds = None
+        self.fold_matrices = {}
+        self.fold_cache_stats = {}
+        self.tracker = None
+        self.data_hash = None
+        self.strata = None
+        self.score_cache = None
+        if self.config.score_cache:
+            self.score_cache = FoldScoreCache(self.config.score_cache_path, self.config.score_cache_max_entries)
+        elif self.config.resume:
+            # Resuming needs per-candidate checkpoints, kept in a cache local to the checkpoints
+            self.score_cache = FoldScoreCache(
+                Path(self.config.checkpoint_dir) / "candidates.sqlite", self.config.score_cache_max_entries
+            )
 
     def __init_mlflow(self):
         # authentication
         os.environ["MLFLOW_TRACKING_USERNAME"] = get_env("MLFLOW_TRACKING_USERNAME")
         os.environ["MLFLOW_TRACKING_PASSWORD"] = get_env("MLFLOW_TRACKING_PASSWORD")
         mlflow.set_tracking_uri(get_env("MLFLOW_TRACKING_URI", "http://localhost:5000"))
-        mlflow.set_experiment(EXPERIMENT_NAME)
+        experiment = mlflow.set_experiment(EXPERIMENT_NAME)
+        self.tracker = AsyncMlflowLogger(experiment.experiment_id)
 
     def _make_estimators(self):
         """
@@ -47,7 +80,410 @@ class ModelTrainer:
             elif name == "svm":
                 # probability=True so we can use predict_proba for ROC AUC
                 self.estimators[name] = SVC(probability=True)
-        
+            elif name == "hist_gradient_boosting":
+                # Native early stopping on an internal validation split keeps fits short on large data
+                self.estimators[name] = HistGradientBoostingClassifier(early_stopping=True, random_state=42)
+            elif name == "nystroem_svm":
+                # RBF kernel approximated with Nystroem features + linear classifier: linear in n_samples
+                # instead of the quadratic exact SVC. Logistic loss gives predict_proba for ROC AUC.
+                self.estimators[name] = Pipeline([
+                    ("nystroem", Nystroem(kernel="rbf", random_state=42)),
+                    ("clf", LogisticRegression(max_iter=2000))
+                ])
+
+    def _family_dtype(self, name) -> str:
+        """
+        dtype of the CV matrix of a family: fold_cache_dtype where the estimator fits it
+        without converting, float64 otherwise.
+        """
+        return np.dtype(self.config.fold_cache_dtype).name if name in FLOAT32_FAMILIES else "float64"
+
+    def _prepare_training_data(self, train_x: pd.DataFrame, train_y: pd.Series, dtype: str = None):
+        """
+        Converts the training data once into a contiguous array of the given dtype
+        (fold_cache_dtype by default), dumps it as a memory-mapped file and computes the CV
+        folds shared by every search. Workers attach to the same pages of the memmap instead
+        of receiving a pickled copy of the DataFrame per search.
+
+        Returns:
+            tuple: (X, y) memory-mapped arrays
+        """
+        start = time.perf_counter()
+        dtype = np.dtype(dtype or self.config.fold_cache_dtype)
+
+        X = np.ascontiguousarray(train_x.to_numpy(dtype=dtype))
+        y = np.ascontiguousarray(train_y.to_numpy())
+
+        cache_path = os.path.join(self.config.root_dir, f"train_matrix_{dtype.name}.joblib")
+        joblib.dump((X, y), cache_path)
+        X, y = joblib.load(cache_path, mmap_mode="r")
+
+        # Same splits GridSearchCV would use for cv=int, computed once for all estimators
+        self.cv_folds = list(StratifiedKFold(n_splits=self.config.cross_validation).split(X, y))
+        self.data_hash = fingerprint_data(X, y)
+        self.fold_matrices[dtype.name] = (X, y, self.data_hash)
+
+        stats = {
+            "train_matrix_mb": X.nbytes / 1024 ** 2,
+            "dataframe_mb": train_x.memory_usage(deep=True).sum() / 1024 ** 2,
+            "fold_cache_seconds": time.perf_counter() - start,
+        }
+        self.fold_cache_stats[dtype.name] = stats
+        logger.info(
+            f"Fold cache ready at {cache_path}: {stats['train_matrix_mb']:.2f} MB "
+            f"{X.dtype} matrix (DataFrame was {stats['dataframe_mb']:.2f} MB), "
+            f"built in {stats['fold_cache_seconds']:.2f}s"
+        )
+        return X, y
+
+    def _make_search(self, name, estimator, param_grid, cv=None, data_hash=None):
+        """
+        Returns the search object used for the given estimator family.
+
+        Logistic regression uses a warm-started regularization path over C when
+        logistic_regularization_path is enabled. With the fold score cache enabled the other
+        families use CachedGridSearchCV, otherwise plain GridSearchCV.
+
+        cv and data_hash default to the folds and fingerprint of the full training data.
+        """
+        cv = self.cv_folds if cv is None else cv
+        data_hash = self.data_hash if data_hash is None else data_hash
+
+        if name == "logistic_regression" and self.config.logistic_regularization_path:
+            return LogisticPathSearchCV(
+                estimator=estimator,
+                param_grid=param_grid,
+                cv=cv,
+                scoring=self.config.scoring,
+                n_jobs=-1,
+                cache=self.score_cache,
+                data_hash=data_hash
+            )
+
+        if self.score_cache is not None:
+            return CachedGridSearchCV(
+                estimator=estimator,
+                param_grid=param_grid,
+                cv=cv,
+                scoring=self.config.scoring,
+                n_jobs=-1,
+                cache=self.score_cache,
+                data_hash=data_hash
+            )
+
+        return GridSearchCV(
+            estimator=estimator,
+            param_grid=param_grid,
+            cv=cv,
+            scoring=self.config.scoring,
+            n_jobs=-1
+        )
+
+    def _search_fingerprint(self, name, estimator, param_grid) -> str:
+        """
+        Identifies a family search: same estimator, grid, folds, scoring and training data,
+        and the same settings that pick the search class or change what the checkpoint holds
+        (out-of-fold predictions for stacking, serving profile).
+        """
+        blob = json.dumps(
+            {
+                "name": name,
+                "estimator": repr(estimator),
+                "param_grid": param_grid,
+                "cross_validation": int(self.config.cross_validation),
+                "scoring": self.config.scoring,
+                "data": self.data_hash,
+                "subsample": [
+                    self.config.search_subsample, self.config.subsample_size, self.config.subsample_top_k,
+                    list(self.config.subsample_stratify_columns)
+                ],
+                "logistic_regularization_path": self.config.logistic_regularization_path,
+                "score_cache": self.config.score_cache,
+                "stacking": self.config.stacking,
+                "profile_batch_size": self.config.profile_batch_size,
+            },
+            default=str,
+            sort_keys=True
+        )
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+    def _load_checkpoint(self, name, fingerprint):
+        """
+        Returns the checkpoint of a finished family search, or None when resume is off or
+        the checkpoint was made with a different grid or different data.
+        """
+        path = Path(self.config.checkpoint_dir) / f"{name}.joblib"
+        if not self.config.resume or not path.exists():
+            return None
+
+        checkpoint = joblib.load(path)
+        if checkpoint.get("fingerprint") != fingerprint:
+            logger.info(f"Checkpoint of {name} is stale (grid or data changed), retraining")
+            return None
+        return checkpoint
+
+    def _save_checkpoint(self, name, fingerprint, entry, best_estimator, run_id, oof_predictions):
+        path = Path(self.config.checkpoint_dir) / f"{name}.joblib"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so an interruption never leaves a half-written checkpoint
+        tmp_path = path.with_suffix(".tmp")
+        joblib.dump(
+            {
+                "fingerprint": fingerprint, "entry": entry, "best_estimator": best_estimator,
+                "run_id": run_id, "oof_predictions": oof_predictions
+            },
+            tmp_path
+        )
+        os.replace(tmp_path, path)
+        logger.info(f"Saved checkpoint of {name} at {path}")
+
+    def _save_outputs(self, leaderboard, best_est, best_run_id):
+        """
+        Writes the best model, the leaderboard and the training run id.
+        """
+        # Save best model locally
+        joblib.dump(best_est, os.path.join(self.config.root_dir, self.config.model_name))
+
+        # Save leaderboard
+        Path(os.path.join(self.config.root_dir, "cv_leaderboard.json")).write_text(json.dumps(leaderboard, indent=2))
+
+        # Record the training run_id of this MLflow run
+        Path(os.path.join(self.config.root_dir, "train_run_id.txt")).write_text(best_run_id)
+
+    def _make_strata(self, train_x: pd.DataFrame, train_y: pd.Series) -> np.ndarray:
+        """
+        Labels used to stratify the search subsample: the target, combined with the
+        subsample_stratify_columns (e.g. location) that are present in the data.
+        """
+        strata = train_y.astype(str)
+        for col in self.config.subsample_stratify_columns:
+            if col in train_x.columns:
+                strata = strata + "|" + train_x[col].astype(str)
+        return strata.to_numpy()
+
+    def _subsample_search(self, name, estimator, param_grid, X, y, run_id):
+        """
+        Searches the whole grid on a stratified subsample of subsample_size rows, then
+        re-scores only the subsample_top_k configurations with CV on the full data and
+        refits the best of them.
+
+        Returns:
+            The fitted full-data search over the top-k configurations
+        """
+        indices = np.arange(len(y))
+        try:
+            sub_idx, _ = train_test_split(indices, train_size=self.config.subsample_size, stratify=self.strata, random_state=42)
+        except ValueError:
+            # Some (target, location) strata are too small to split, stratify on the target only
+            sub_idx, _ = train_test_split(indices, train_size=self.config.subsample_size, stratify=y, random_state=42)
+        sub_idx = np.sort(sub_idx)
+        X_sub, y_sub = np.ascontiguousarray(X[sub_idx]), np.ascontiguousarray(y[sub_idx])
+        sub_folds = list(StratifiedKFold(n_splits=self.config.cross_validation).split(X_sub, y_sub))
+
+        start = time.perf_counter()
+        sub_search = self._make_search(name, estimator, param_grid, cv=sub_folds, data_hash=fingerprint_data(X_sub, y_sub))
+        sub_search.fit(X_sub, y_sub)
+        subsample_seconds = time.perf_counter() - start
+
+        # Not in cv_results/: scores on a fraction of the data must not enter the leaderboard
+        save_cv_results(
+            sub_search.cv_results_,
+            os.path.join(self.config.root_dir, "cv_results_subsample", f"{name}-{run_id}.parquet"),
+            model_name=name,
+            run_id=run_id
+        )
+
+        # Top-k configurations of the subsample, each as a single-point grid
+        order = np.argsort(sub_search.cv_results_["rank_test_score"], kind="stable")[:self.config.subsample_top_k]
+        top_params = [sub_search.cv_results_["params"][i] for i in order]
+
+        start = time.perf_counter()
+        full_search = self._make_search(name, estimator, [{k: [v] for k, v in p.items()} for p in top_params])
+        full_search.fit(X, y)
+        rescore_seconds = time.perf_counter() - start
+
+        winner_changed = full_search.best_params_ != sub_search.best_params_
+        self.tracker.log_params(run_id, {
+            "subsample_size": len(sub_idx),
+            "subsample_top_k": len(top_params),
+            "subsample_best_params": json.dumps(sub_search.best_params_, default=str)
+        })
+        self.tracker.log_metrics(run_id, {
+            "subsample_search_seconds": subsample_seconds,
+            "full_rescore_seconds": rescore_seconds,
+            "subsample_cv_best_score": float(sub_search.best_score_),
+            "subsample_winner_changed": float(winner_changed)
+        })
+        logger.info(
+            f"{name}: searched {len(sub_search.cv_results_['params'])} candidates on {len(sub_idx)} rows in "
+            f"{subsample_seconds:.1f}s, re-scored top {len(top_params)} on {len(y)} rows in {rescore_seconds:.1f}s "
+            f"({'winner changed' if winner_changed else 'same winner'} on full data)"
+        )
+        return full_search
+
+    def _profile(self, model, X) -> dict:
+        """
+        Profiles serialized size, load time and single-row/batch predict latency of a model.
+        """
+        return profile_model(model, X[:self.config.profile_batch_size])
+
+    def _select_best(self, leaderboard: list) -> dict:
+        """
+        Picks the leaderboard entry with the best CV score among those within the configured
+        single-row latency and size budgets, and flags every entry accordingly. Falls back to
+        the best CV score overall when no candidate fits the budget.
+        """
+        for entry in leaderboard:
+            entry["within_budget"] = within_budget(
+                entry["profile"], self.config.max_predict_latency_ms, self.config.max_model_size_mb
+            )
+
+        candidates = [entry for entry in leaderboard if entry["within_budget"]]
+        if not candidates:
+            logger.warning("No model fits the latency/size budget, selecting on CV score only")
+            candidates = leaderboard
+
+        best = max(candidates, key=lambda entry: entry["cv_best_score"])
+        for entry in leaderboard:
+            entry["selected"] = entry is best
+        return best
+
+    def _train_family(self, name, estimator, param_grid, X, y):
+        """
+        Runs the hyperparameter search of one estimator family in its own MLflow run.
+
+        Returns:
+            tuple: (leaderboard entry, best estimator, MLflow run id, out-of-fold predictions
+            of the best candidate or None)
+        """
+        logger.info(f"Training {name} with GridSearchCV")
+
+        run_id = self.tracker.start_run(run_name=f"train:{name}")
+        self.tracker.log_params(run_id, {
+            "model_name": name,
+            "cv_folds": int(self.config.cross_validation),
+            "scoring": self.config.scoring,
+            "grid_size": len(param_grid) if isinstance(param_grid, dict) else 0,
+            "fold_cache_dtype": X.dtype.name
+        })
+        self.tracker.log_metrics(run_id, self.fold_cache_stats[X.dtype.name])
+
+        search_start = time.perf_counter()
+        if self.config.search_subsample and len(y) > self.config.subsample_size:
+            grid_search = self._subsample_search(name, estimator, param_grid, X, y, run_id)
+        else:
+            grid_search = self._make_search(name, estimator, param_grid)
+            grid_search.fit(X, y)
+        self.tracker.log_metrics(run_id, {"search_seconds": time.perf_counter() - search_start})
+
+        if hasattr(grid_search, "cache_hits_"):
+            lookups = grid_search.cache_hits_ + grid_search.cache_misses_
+            self.tracker.log_metrics(run_id, {
+                "cache_hits": grid_search.cache_hits_,
+                "cache_misses": grid_search.cache_misses_,
+                "cache_hit_rate": grid_search.cache_hits_ / lookups if lookups else 0.0
+            })
+            logger.info(f"{name} fold score cache: {grid_search.cache_hits_}/{lookups} hits")
+
+        # Log the best params and CV score
+        self.tracker.log_metrics(run_id, {"cv_best_score": float(grid_search.best_score_)})
+        if hasattr(grid_search.best_estimator_, "n_iter_"):
+            # Iterations actually run, e.g. boosting rounds kept by early stopping
+            self.tracker.log_metrics(run_id, {"best_n_iter": float(np.max(grid_search.best_estimator_.n_iter_))})
+        self.tracker.log_params(run_id, {f"best_{param}": value for param, value in grid_search.best_params_.items()})
+
+        # Let's save the full cv_results as a typed Parquet artifact
+        cv_results_path = save_cv_results(
+            grid_search.cv_results_,
+            os.path.join(self.config.root_dir, "cv_results", f"{name}-{run_id}.parquet"),
+            model_name=name,
+            run_id=run_id
+        )
+        self.tracker.log_artifact(run_id, str(cv_results_path))
+
+        # Log the best estimator for this model, or only the winner's at the end
+        if self.config.log_all_models:
+            self.tracker.log_model(run_id, grid_search.best_estimator_, artifact_path=name)
+
+        # Serving cost of the family winner, used for latency/size-aware selection
+        profile = self._profile(grid_search.best_estimator_, X)
+        self.tracker.log_metrics(run_id, {f"serving_{key}": value for key, value in profile.items()})
+
+        # Out-of-fold scores of the family winner only, on the shared folds, for stacking
+        oof_predictions = None
+        if self.config.stacking:
+            start = time.perf_counter()
+            oof_predictions = out_of_fold_scores(
+                clone(estimator).set_params(**grid_search.best_params_), X, y, self.cv_folds, n_jobs=-1
+            )
+            self.tracker.log_metrics(run_id, {"oof_seconds": time.perf_counter() - start})
+
+        self.tracker.end_run(run_id)
+
+        logger.info(f"{name} best params: {grid_search.best_params_}")
+        logger.info(f"{name} best CV score: {grid_search.best_score_:.4f}")
+        logger.info(
+            f"{name} serving profile: {profile['size_mb']:.2f} MB, load {profile['load_ms']:.1f} ms, "
+            f"single row {profile['single_predict_ms']:.2f} ms, batch {profile['batch_predict_ms']:.1f} ms"
+        )
+
+        entry = {
+            "model": name,
+            "cv_best_score": float(grid_search.best_score_),
+            "best_params": grid_search.best_params_,
+            "profile": profile
+        }
+        return entry, grid_search.best_estimator_, run_id, oof_predictions
+
+    def _train_stacking(self, family_models: dict, oof_predictions: dict, X, y, best_single: dict):
+        """
+        Fits a meta-learner on the out-of-fold predictions of the family winners and wraps
+        it with the already refitted winners into a StackedEnsemble, in its own MLflow run.
+
+        Returns:
+            tuple: (leaderboard entry, ensemble, MLflow run id), or None with fewer than two
+            families that have out-of-fold predictions
+        """
+        oof_predictions = {name: oof for name, oof in oof_predictions.items() if oof is not None}
+        if len(oof_predictions) < 2:
+            logger.info("Skipping stacking: fewer than two families have out-of-fold predictions")
+            return None
+
+        run_id = self.tracker.start_run(run_name="train:stacking")
+        meta_model, score = fit_meta_learner(oof_predictions, y, self.cv_folds, self.config.scoring)
+        ensemble = StackedEnsemble.from_fitted(
+            {name: family_models[name][0] for name in oof_predictions}, meta_model, cv=self.config.cross_validation
+        )
+
+        # Serving cost: every base model predicts, compared with the best single model
+        profile = self._profile(ensemble, X)
+        self.tracker.log_params(run_id, {
+            "model_name": "stacking",
+            "base_models": ",".join(oof_predictions),
+            "meta_learner": "logistic_regression"
+        })
+        self.tracker.log_metrics(run_id, {
+            "cv_best_score": score,
+            "best_single_cv_score": best_single["cv_best_score"],
+            "stacking_gain": score - best_single["cv_best_score"],
+            "latency_overhead_ms": profile["single_predict_ms"] - best_single["profile"]["single_predict_ms"],
+            **{f"serving_{key}": value for key, value in profile.items()}
+        })
+        self.tracker.end_run(run_id)
+
+        logger.info(
+            f"stacking of {list(oof_predictions)}: CV {score:.4f} vs best single {best_single['cv_best_score']:.4f} "
+            f"({best_single['model']}), single row {profile['single_predict_ms']:.2f} ms vs "
+            f"{best_single['profile']['single_predict_ms']:.2f} ms"
+        )
+
+        entry = {
+            "model": "stacking",
+            "cv_best_score": score,
+            "best_params": {"base_models": list(oof_predictions), "meta_coef": meta_model.coef_.ravel().tolist()},
+            "profile": profile
+        }
+        return entry, ensemble, run_id
 
     def train(self):
         """
@@ -58,15 +494,31 @@ class ModelTrainer:
             Exception: If there's an error during training
         """
         try:
+            # A missing dask/ray install fails here, not after the data is prepared
+            check_backend(self.config.parallel_backend)
 
             # Set mlflow
             self.__init_mlflow()
 
             # load data
-            train_data = pd.read_csv(self.config.train_data_path)
+            # Features read directly in float_dtype, the target is cast back to int below
+            train_data = pd.read_csv(self.config.train_data_path, dtype=self.config.float_dtype)
 
             train_x = train_data.drop([self.config.target_column], axis=1)
             train_y = train_data[self.config.target_column].astype(int)
+            self.strata = self._make_strata(train_x, train_y)
+
+            # Features kept by the permutation importance of the last evaluation
+            if self.config.use_selected_features and Path(self.config.selected_features_path).exists():
+                selected = json.loads(Path(self.config.selected_features_path).read_text())
+                logger.info(f"Training on {len(selected)} of {train_x.shape[1]} features from {self.config.selected_features_path}")
+                train_x = train_x[selected]
+
+            # Models are fitted on plain arrays, so keep the column order for serving
+            Path(os.path.join(self.config.root_dir, "feature_names.json")).write_text(json.dumps(list(train_x.columns), indent=2))
+
+            for dtype in sorted({self._family_dtype(name) for name in self.config.available_models}):
+                self._prepare_training_data(train_x, train_y, dtype)
 
             # Obtain estimators
             self._make_estimators()
@@ -75,79 +527,101 @@ class ModelTrainer:
             leaderboard = [] # This will hold a leaderboard of the models we will train
             best_name, best_est, best_score  = None, None, float("-inf")
             best_run_id = ""
+            family_models = {} # name -> (best estimator, run id)
+            oof_predictions = {} # name -> out-of-fold predictions of the family winner
 
              # Use gridSearch with cross validation to train the models and log to MLflow
-            for name, estimator in self.estimators.items():
-                logger.info(f"Training {name} with GridSearchCV")
-
-                param_grid = self.config.params.model_params.get(name, {})
-                grid_search = GridSearchCV(
-                    estimator=estimator,
-                    param_grid=param_grid,
-                    cv=self.config.cross_validation,
-                    scoring=self.config.scoring,
-                    n_jobs=-1
-                )
-
-                with mlflow.start_run(run_name=f"train:{name}") as run:
-                    mlflow.log_param("model_name", name)
-                    mlflow.log_param("cv_folds", int(self.config.cross_validation))
-                    mlflow.log_param("scoring", self.config.scoring)
-                    mlflow.log_param("grid_size", len(param_grid) if isinstance(param_grid, dict) else 0)
-
-                    grid_search.fit(train_x, train_y)
-
-                    # Log the best params and CV score
-                    mlflow.log_metric("cv_best_score", float(grid_search.best_score_))
-                    for param,value in grid_search.best_params_.items():
-                        mlflow.log_param(f"best_{param}", value)
-
-                    # Let's save the full cv_results as an artifact
-                    cv_results_path = os.path.join(self.config.root_dir, f"{name}_cv_results.json")
-                    with open(cv_results_path, "w") as f:
-                        json.dump(grid_search.cv_results_, f, default=str, indent=2)
-                    mlflow.log_artifact(str(cv_results_path))
-
-                    # Log the best estimator for this model 
-                    mlflow.sklearn.log_model(grid_search.best_estimator_, artifact_path=name)
+            # The searches run on the configured joblib backend (local processes, dask or ray)
+            with parallel_backend(
+                self.config.parallel_backend,
+                scheduler_address=self.config.scheduler_address,
+                worker_resources=self.config.worker_resources,
+                scatter=[array for X, y, _ in self.fold_matrices.values() for array in (X, y)]
+            ):
+                for name, estimator in self.estimators.items():
+                    X, y, self.data_hash = self.fold_matrices[self._family_dtype(name)]
+                    param_grid = self.config.params.model_params.get(name, {})
+                    fingerprint = self._search_fingerprint(name, estimator, param_grid)
 
-                    leaderboard.append({
-                        "model": name,
-                        "cv_best_score": float(grid_search.best_score_),
-                        "best_params": grid_search.best_params_
-                    })
+                    checkpoint = self._load_checkpoint(name, fingerprint)
+                    if checkpoint is not None:
+                        logger.info(f"Resuming: {name} already trained in run {checkpoint['run_id']}, skipping its search")
+                        entry, family_best, run_id = checkpoint["entry"], checkpoint["best_estimator"], checkpoint["run_id"]
+                        oof = checkpoint.get("oof_predictions")
+                        if "profile" not in entry:
+                            entry["profile"] = self._profile(family_best, X)
+                    else:
+                        entry, family_best, run_id, oof = self._train_family(name, estimator, param_grid, X, y)
+                        self._save_checkpoint(name, fingerprint, entry, family_best, run_id, oof)
 
-                    # global best tracking 
-                    if grid_search.best_score_ > best_score:
-                        best_score = grid_search.best_score_
-                        best_name, best_est = name, grid_search.best_estimator_
-                        best_run_id = run.info.run_id
+                    # The run id lets the evaluation load each family winner from MLflow
+                    entry["run_id"] = run_id
+                    leaderboard.append(entry)
+                    family_models[name] = (family_best, run_id)
+                    oof_predictions[name] = oof
 
+                    # global best tracking, within the latency/size budget
+                    best = self._select_best(leaderboard)
+                    best_name, best_score = best["model"], best["cv_best_score"]
+                    best_est, best_run_id = family_models[best_name]
 
+                    # Keep the outputs up to date so an interrupted run still leaves a usable model
+                    self._save_outputs(leaderboard, best_est, best_run_id)
 
-                    logger.info(f"{name} best params: {grid_search.best_params_}")
-                    logger.info(f"{name} best CV score: {grid_search.best_score_:.4f}")
+            # The ensemble only replaces best_model.joblib when its CV score beats the best
+            # single model (ties keep the single model) and it fits the serving budget
+            if self.config.stacking:
+                # Only used to profile the ensemble, every base model accepts float64
+                X, y, _ = self.fold_matrices.get("float64", next(iter(self.fold_matrices.values())))
+                stacked = self._train_stacking(family_models, oof_predictions, X, y, self._select_best(leaderboard))
+                if stacked is not None:
+                    entry, ensemble, run_id = stacked
+                    entry["run_id"] = run_id
+                    leaderboard.append(entry)
+                    # Next to the family checkpoints, so the top-k evaluation finds it locally
+                    joblib.dump({"entry": entry, "best_estimator": ensemble, "run_id": run_id},
+                                Path(self.config.checkpoint_dir) / "stacking.joblib")
+                    family_models["stacking"] = (ensemble, run_id)
 
-         
-            # Save best model locally
-            joblib.dump(best_est, os.path.join(self.config.root_dir, self.config.model_name))
+                    best = self._select_best(leaderboard)
+                    best_name, best_score = best["model"], best["cv_best_score"]
+                    best_est, best_run_id = family_models[best_name]
+                    self._save_outputs(leaderboard, best_est, best_run_id)
 
-            # Save leaderboard
-            Path(os.path.join(self.config.root_dir, "cv_leaderboard.json")).write_text(json.dumps(leaderboard, indent=2))
+            # On resume the winner can come from a finished run of an earlier session, whose
+            # params cannot change, so the selection and its budget get a run of their own
+            selection_run_id = self.tracker.start_run(run_name="train:selection")
+            self.tracker.log_params(selection_run_id, {
+                "selected_model": best_name,
+                "selected_run_id": best_run_id,
+                "max_predict_latency_ms": self.config.max_predict_latency_ms,
+                "max_model_size_mb": self.config.max_model_size_mb
+            })
+            self.tracker.log_metrics(selection_run_id, {"cv_best_score": best_score})
+            self.tracker.end_run(selection_run_id)
 
-            # Record the training run_id of this MLflow run
-            Path(os.path.join(self.config.root_dir, "train_run_id.txt")).write_text(best_run_id)
+            # The winner's model goes to its own run, unless an earlier session already logged it there
+            if not self.config.log_all_models and (
+                self.tracker.started(best_run_id) or not self.tracker.client.list_artifacts(best_run_id, best_name)
+            ):
+                self.tracker.log_model(best_run_id, best_est, artifact_path=best_name)
 
             logger.info(f"Training complete. Best model: '{best_name}' (CV={best_score:.4f})")
             logger.info(f"Saved best model")
             logger.info(f"Saved leaderboard")
             logger.info(f"Saved train run id to")
 
+            # Wait for the background MLflow uploads before finishing the runs
+            self.tracker.close()
 
         except FileNotFoundError as e:
             logger.error(f"Data file not found: {e}")
+            if self.tracker is not None:
+                self.tracker.close(status="FAILED")
             raise
         except Exception as e:
             logger.error(f"Error during model training: {e}")
+            if self.tracker is not None:
+                self.tracker.close(status="FAILED")
             raise
         
\ No newline at end of file
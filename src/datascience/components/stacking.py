@@ -0,0 +1,95 @@
+import numpy as np
+from sklearn.base import BaseEstimator, ClassifierMixin, clone
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import check_cv, cross_val_predict, cross_val_score
+from sklearn.utils.validation import check_is_fitted
+from src.datascience.components.model_search import positive_scores
+
+
+def out_of_fold_scores(model, X, y, folds, n_jobs=None) -> np.ndarray:
+    """
+    Positive-class scores of an unfitted copy of model on every held-out fold, in float32.
+    """
+    method = "predict_proba" if hasattr(model, "predict_proba") else "decision_function"
+    scores = cross_val_predict(clone(model), X, y, cv=folds, method=method, n_jobs=n_jobs)
+    return (scores[:, 1] if scores.ndim == 2 else scores).astype(np.float32)
+
+
+class StackedEnsemble(ClassifierMixin, BaseEstimator):
+    """
+    Stacking ensemble classifier.
+
+    Each base model contributes one column of positive-class scores, and a logistic
+    regression meta-learner combines them. fit computes out-of-fold scores of the base
+    models on cv, fits the meta-learner on them and refits the base models on all the data.
+
+    ModelTrainer does not call fit: it builds the ensemble with from_fitted from the family
+    winners (already refitted on the full training data) and the meta-learner fitted on the
+    winners' out-of-fold scores on the search folds. Either way it is a regular sklearn
+    classifier, so it can be saved as best_model.joblib, served by app.py, scored with
+    sklearn scorers and logged with mlflow.sklearn.
+
+    Args:
+        base_models (dict): name -> estimator
+        meta_model: Meta-learner, LogisticRegression(max_iter=1000) when None
+        cv: Folds of the out-of-fold scores in fit, anything check_cv accepts
+    """
+
+    def __init__(self, base_models: dict, meta_model=None, cv=5):
+        self.base_models = base_models
+        self.meta_model = meta_model
+        self.cv = cv
+
+    @classmethod
+    def from_fitted(cls, base_models: dict, meta_model, cv=5) -> "StackedEnsemble":
+        """
+        Ensemble of already fitted base models and meta-learner, without refitting them.
+        """
+        ensemble = cls(base_models, meta_model, cv)
+        ensemble.base_models_ = dict(base_models)
+        ensemble.meta_model_ = meta_model
+        ensemble.classes_ = meta_model.classes_
+        return ensemble
+
+    def fit(self, X, y):
+        folds = list(check_cv(self.cv, y, classifier=True).split(X, y))
+        Z = np.column_stack([out_of_fold_scores(model, X, y, folds) for model in self.base_models.values()])
+        meta_model = LogisticRegression(max_iter=1000) if self.meta_model is None else self.meta_model
+
+        self.base_models_ = {name: clone(model).fit(X, y) for name, model in self.base_models.items()}
+        self.meta_model_ = clone(meta_model).fit(Z, y)
+        self.classes_ = self.meta_model_.classes_
+        return self
+
+    def _meta_features(self, X) -> np.ndarray:
+        check_is_fitted(self, "meta_model_")
+        return np.column_stack([positive_scores(model, X) for model in self.base_models_.values()])
+
+    def predict_proba(self, X) -> np.ndarray:
+        return self.meta_model_.predict_proba(self._meta_features(X))
+
+    def predict(self, X) -> np.ndarray:
+        return self.meta_model_.predict(self._meta_features(X))
+
+
+def fit_meta_learner(oof_predictions: dict, y, folds, scoring):
+    """
+    Fits the meta-learner on the out-of-fold predictions of the base models.
+
+    The predictions are computed on the folds of the hyperparameter searches, and the
+    meta-learner is cross-validated on the same folds, which makes its score comparable
+    with the CV scores of the single models.
+
+    Args:
+        oof_predictions (dict): name -> out-of-fold positive-class scores of the family winner
+        y: Training target
+        folds: CV folds used by the searches
+        scoring: Scoring of the searches
+
+    Returns:
+        tuple: (fitted meta-learner, mean CV score)
+    """
+    Z = np.column_stack(list(oof_predictions.values()))
+    meta_model = LogisticRegression(max_iter=1000)
+    score = float(np.mean(cross_val_score(meta_model, Z, y, cv=folds, scoring=scoring)))
+    return meta_model.fit(Z, y), score
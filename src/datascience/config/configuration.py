@@ -1,12 +1,15 @@
 from src.datascience.constants import * 
 from src.datascience.utils.common import read_yaml, create_directories
 from src.datascience.entity.config_entity import (DataIngestionConfig, 
+                                                  DataValidationConfig,
                                                   DataTransformationConfig, 
                                                   ModelTrainerConfig, 
                                                   ModelEvaluationConfig,
                                                   DataExtractionConfig,
                                                   ETLDataTransformationConfig,
-                                                  ETLDataLoadingConfig)
+                                                  ETLDataLoadingConfig,
+                                                  IncrementalUpdateConfig,
+                                                  BacktestingConfig)
 from src.datascience import logger
 
 
@@ -49,7 +52,9 @@ class ConfigurationManager:
             lat = config.lat,
             lon = config.lon,
             start_offset_days = config.start_offset_days,
-            end_offset_days = config.end_offset_days
+            end_offset_days = config.end_offset_days,
+            api_url = config.api_url,
+            timeout_seconds = config.timeout_seconds
         )
 
         return data_extraction_config
@@ -78,10 +83,27 @@ class ConfigurationManager:
         data_ingestion_config = DataIngestionConfig(
             root_dir = config.root_dir,
             local_data_file = config.local_data_file,
+            float_dtype = self.config.float_dtype,
+            all_schema = self.schema,
         )
 
         return data_ingestion_config
     
+    def get_data_validation_config(self) -> DataValidationConfig:
+        config = self.config.data_validation
+        create_directories([config.root_dir])
+
+        data_validation_config = DataValidationConfig(
+            root_dir = config.root_dir,
+            unzip_data_dir = config.unzip_data_dir,
+            STATUS_FILE = config.STATUS_FILE,
+            all_schema = self.schema,
+            chunk_size = int(config.chunk_size),
+            max_out_of_range_ratio = float(config.max_out_of_range_ratio),
+            max_incomplete_day_ratio = float(config.max_incomplete_day_ratio)
+        )
+        return data_validation_config
+
     def get_data_transformation_config(self) -> DataTransformationConfig:
         config = self.config.data_transformation
         create_directories([config.root_dir])
@@ -90,7 +112,10 @@ class ConfigurationManager:
             root_dir= config.root_dir,
             data_path=config.data_path,
             test_size=config.test_size,
-            random_state=config.random_state
+            random_state=config.random_state,
+            float_dtype=self.config.float_dtype,
+            all_schema=self.schema,
+            chunk_size=config.chunk_size
         )
         return data_transformation_config
     
@@ -109,6 +134,28 @@ class ConfigurationManager:
             scoring= config.scoring,
             available_models = config.available_models,
             target_column = config.target_column,   
+            logistic_regularization_path = bool(config.logistic_regularization_path),
+            fold_cache_dtype = config.fold_cache_dtype or self.config.float_dtype,
+            score_cache = bool(config.score_cache),
+            score_cache_path = config.score_cache_path,
+            score_cache_max_entries = int(config.score_cache_max_entries),
+            log_all_models = bool(config.log_all_models),
+            resume = bool(config.resume),
+            checkpoint_dir = config.checkpoint_dir,
+            parallel_backend = config.parallel_backend,
+            scheduler_address = config.scheduler_address,
+            worker_resources = dict(config.worker_resources or {}),
+            search_subsample = bool(config.search_subsample),
+            subsample_size = int(config.subsample_size),
+            subsample_top_k = int(config.subsample_top_k),
+            subsample_stratify_columns = list(config.subsample_stratify_columns),
+            profile_batch_size = int(config.profile_batch_size),
+            max_predict_latency_ms = config.max_predict_latency_ms,
+            max_model_size_mb = config.max_model_size_mb,
+            stacking = bool(config.stacking),
+            float_dtype = self.config.float_dtype,
+            use_selected_features = bool(config.use_selected_features),
+            selected_features_path = config.selected_features_path,
 
             params = params
         )
@@ -125,7 +172,66 @@ class ConfigurationManager:
             model_path = config.model_path,
             experiment_name = "rain-prediction",
             target_column = config.target_column,
-            train_run_id_path = config.train_run_id_path
+            train_run_id_path = config.train_run_id_path,
+            log_model = bool(config.log_model),
+            chunk_size = int(config.chunk_size or 0),
+            score_bins = int(config.score_bins),
+            plots = bool(config.plots),
+            feature_names_path = config.feature_names_path,
+            permutation_importance = bool(config.permutation_importance),
+            importance_scoring = config.importance_scoring,
+            importance_repeats = int(config.importance_repeats),
+            importance_n_jobs = int(config.importance_n_jobs),
+            importance_max_rows = config.importance_max_rows,
+            prune_features = bool(config.prune_features),
+            importance_threshold = float(config.importance_threshold),
+            selected_features_path = config.selected_features_path,
+            compare_top_k = int(config.compare_top_k),
+            model_source = config.model_source,
+            leaderboard_path = config.leaderboard_path,
+            checkpoint_dir = config.checkpoint_dir,
+            compare_n_jobs = int(config.compare_n_jobs),
+            latency_repeats = int(config.latency_repeats)
         )
 
-        return model_evaluation_config
\ No newline at end of file
+        return model_evaluation_config
+
+    def get_incremental_update_config(self) -> IncrementalUpdateConfig:
+        config = self.config.incremental_update
+        create_directories([config.root_dir])
+
+        incremental_update_config = IncrementalUpdateConfig(
+            root_dir = config.root_dir,
+            source = config.source,
+            data_path = config.data_path,
+            train_data_path = config.train_data_path,
+            scaler_path = config.scaler_path,
+            watermark_path = config.watermark_path,
+            model_name = config.model_name,
+            target_column = config.target_column,
+            alpha = float(config.alpha),
+            bootstrap_epochs = int(config.bootstrap_epochs),
+            full_retrain_every_days = int(config.full_retrain_every_days)
+        )
+        return incremental_update_config
+
+    def get_backtesting_config(self) -> BacktestingConfig:
+        config = self.config.backtesting
+        create_directories([config.root_dir])
+
+        backtesting_config = BacktestingConfig(
+            root_dir = config.root_dir,
+            data_path = config.data_path,
+            model_path = config.model_path,
+            feature_names_path = config.feature_names_path,
+            experiment_name = "rain-prediction",
+            target_column = config.target_column,
+            window_type = config.window_type,
+            initial_train_days = int(config.initial_train_days),
+            train_window_days = int(config.train_window_days),
+            test_days = int(config.test_days),
+            step_days = int(config.step_days),
+            warm_start = bool(config.warm_start),
+            n_jobs = int(config.n_jobs)
+        )
+        return backtesting_config
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 @dataclass
 class DataExtractionConfig:
@@ -12,12 +12,16 @@ class DataExtractionConfig:
         lon: The longitude of the location we want to get data from
         start_offset_days: start date is end_date minus this offset
         end_offset_days: End data is based on today minus this offset
+        api_url: URL of the archive API, overridden by the OPEN_METEO_API_URL env variable
+        timeout_seconds: Timeout of the API request
     """
 
     lat: float
     lon: float
     start_offset_days: int
     end_offset_days: int
+    api_url: str
+    timeout_seconds: float
 
 @dataclass
 class ETLDataTransformationConfig:
@@ -42,11 +46,38 @@ class DataIngestionConfig:
     Args:
         root_dir (Path): Directory where Ingestion artifacts will be stored
         local_data_file (Path): Path where the data will be stored
+        float_dtype (str): dtype of the hourly block (float32 or float64)
+        all_schema (dict): Schema of the weather data (schema.yaml)
     """
     root_dir: Path
     local_data_file: Path
+    float_dtype: str
+    all_schema: dict
     
 
+@dataclass
+class DataValidationConfig:
+    """
+    Configuration class for data validation operations.
+
+    Attributes:
+        root_dir: Directory where the validation report is stored
+        unzip_data_dir: Path to the ingested data file
+        STATUS_FILE: File where the validation status is written
+        all_schema: Schema of the weather data (schema.yaml)
+        chunk_size: Rows read per chunk
+        max_out_of_range_ratio: Allowed ratio of values outside the physical range per column
+        max_incomplete_day_ratio: Allowed ratio of days missing some hours of a feature
+    """
+    root_dir: Path
+    unzip_data_dir: Path
+    STATUS_FILE: str
+    all_schema: dict
+    chunk_size: int
+    max_out_of_range_ratio: float
+    max_incomplete_day_ratio: float
+
+
 @dataclass
 class DataTransformationConfig:
     """
@@ -57,11 +88,17 @@ class DataTransformationConfig:
         data_path: Path to the validated data file
         test_size: Proportion of data to use for testing (default: 0.2)
         random_state: Random seed for reproducibility (default: 42)
+        float_dtype: dtype of the hourly block and of the written features (float32 or float64)
+        all_schema: Schema of the weather data (schema.yaml)
+        chunk_size: Rows per chunk in streaming mode, 0 loads the whole file
     """
     root_dir: Path
     data_path: Path
     test_size: float
     random_state: int
+    float_dtype: str
+    all_schema: dict
+    chunk_size: int
 
 
 @dataclass
@@ -73,6 +110,38 @@ class ModelTrainerConfig:
     This class contains all the parameters and paths needed for training
     machine learning models.
 
+    Attributes:
+        root_dir: Directory where training artifacts will be stored
+        train_data_path: Path to the transformed training data
+        test_data_path: Path to the transformed test data
+        model_name: File name of the saved best model
+        target_column: Name of the target column
+        cross_validation: Number of CV folds
+        scoring: Scoring used to rank the candidates (e.g. roc_auc)
+        available_models: Estimator families to search, keys of params.model_params
+        logistic_regularization_path: Fit the logistic regression C grid as one warm-started path per fold
+        fold_cache_dtype: dtype of the memory-mapped CV matrix of the families that fit float32 as is (float_dtype unless overridden)
+        score_cache: Reuse CV fold scores of candidates already evaluated on identical data
+        score_cache_path: SQLite file of the fold score cache
+        score_cache_max_entries: Entries kept in the cache, least recently used ones are evicted
+        log_all_models: Log the best model of every family to MLflow, not only the overall winner
+        resume: Skip families and candidates finished by an interrupted run
+        checkpoint_dir: Directory of the per-family and per-candidate checkpoints
+        parallel_backend: joblib backend of the searches (loky, dask or ray)
+        scheduler_address: Address of the dask scheduler or ray cluster, local for an in-process one
+        worker_resources: Resources requested by each dask/ray task
+        search_subsample: Search on a stratified subsample, then re-score the top candidates on all rows
+        subsample_size: Rows of the subsample
+        subsample_top_k: Candidates per family re-scored on all rows
+        subsample_stratify_columns: Columns stratified on, next to the target, when subsampling
+        profile_batch_size: Rows used to profile the batch predict latency of each family winner
+        max_predict_latency_ms: Latency budget of the selected model, None for no limit
+        max_model_size_mb: Size budget of the selected model, None for no limit
+        stacking: Stack the family winners with a logistic meta-learner on their out-of-fold predictions
+        float_dtype: dtype of the training matrix (float32 or float64)
+        use_selected_features: Train only on the features kept by the last permutation importance
+        selected_features_path: JSON list of those features
+        params: Hyperparameter grids (params.yaml)
     """
     root_dir: Path
     train_data_path: Path
@@ -83,12 +152,61 @@ class ModelTrainerConfig:
     scoring: str
     available_models: List[str]
     target_column: str
+    logistic_regularization_path: bool
+    fold_cache_dtype: str
+    score_cache: bool
+    score_cache_path: Path
+    score_cache_max_entries: int
+    log_all_models: bool
+    resume: bool
+    checkpoint_dir: Path
+    parallel_backend: str
+    scheduler_address: str
+    worker_resources: dict
+    search_subsample: bool
+    subsample_size: int
+    subsample_top_k: int
+    subsample_stratify_columns: List[str]
+    profile_batch_size: int
+    max_predict_latency_ms: Optional[float]
+    max_model_size_mb: Optional[float]
+    stacking: bool
+    float_dtype: str
+    use_selected_features: bool
+    selected_features_path: Path
     params: dict
 
 @dataclass
 class ModelEvaluationConfig:    
     """
     Configuration class for model evaluation operations.
+
+    Attributes:
+        root_dir: Directory where evaluation artifacts will be stored
+        test_data_path: Path to the transformed test data
+        model_path: Path to the model selected by training
+        experiment_name: MLflow experiment
+        target_column: Name of the target column
+        train_run_id_path: File holding the MLflow run id of the training run
+        log_model: Log a copy of the evaluated model to the evaluation run
+        chunk_size: Rows per chunk when streaming the test file, 0 loads it at once
+        score_bins: Histogram bins of the chunked ROC/PR curves
+        plots: Render the ROC/PR/confusion-matrix plots in a background process
+        feature_names_path: Columns the model was trained on, in training order
+        permutation_importance: Compute the permutation importance of each feature on the test set
+        importance_scoring: Scoring of the permutation importance
+        importance_repeats: Shuffles per feature
+        importance_n_jobs: Worker processes the features are split across, -1 for all cores
+        importance_max_rows: Test rows sampled for the importance, None uses all of them
+        prune_features: Write the features above importance_threshold to selected_features_path
+        importance_threshold: Mean importance a feature needs to be kept
+        selected_features_path: JSON list of the kept features
+        compare_top_k: Also score this many best leaderboard models on the test set, 0 turns it off
+        model_source: Where the compared models are loaded from, mlflow runs or local checkpoints
+        leaderboard_path: CV leaderboard written by training
+        checkpoint_dir: Directory of the training checkpoints
+        compare_n_jobs: Worker processes of the comparison, -1 for all cores
+        latency_repeats: Single-row predictions timed per compared model
     """
     root_dir: Path
     test_data_path: Path
@@ -96,4 +214,89 @@ class ModelEvaluationConfig:
     experiment_name: str
     target_column: str
     experiment_name: str
-    train_run_id_path: Path
\ No newline at end of file
+    train_run_id_path: Path
+    log_model: bool
+    chunk_size: int
+    score_bins: int
+    plots: bool
+    feature_names_path: Path
+    permutation_importance: bool
+    importance_scoring: str
+    importance_repeats: int
+    importance_n_jobs: int
+    importance_max_rows: Optional[int]
+    prune_features: bool
+    importance_threshold: float
+    selected_features_path: Path
+    compare_top_k: int
+    model_source: str
+    leaderboard_path: Path
+    checkpoint_dir: Path
+    compare_n_jobs: int
+    latency_repeats: int
+
+
+@dataclass
+class IncrementalUpdateConfig:
+    """
+    Configuration class for the incremental model update.
+
+    Attributes:
+        root_dir: Directory where the online model, its scaler and its state are stored
+        source: Where new days are read from, database (weather_data table) or csv
+        data_path: Ingested csv, used when source is csv
+        train_data_path: Training data of the last full run, used to bootstrap the online model
+        scaler_path: Scaler fitted by the last full DataTransformation run
+        watermark_path: Latest day seen by the last full DataTransformation run
+        model_name: File name of the published online model
+        target_column: Name of the target column
+        alpha: Regularization strength of the SGD classifier
+        bootstrap_epochs: Passes over the training data when bootstrapping the online model
+        full_retrain_every_days: Age of the last full run after which a full retrain is flagged
+    """
+    root_dir: Path
+    source: str
+    data_path: Path
+    train_data_path: Path
+    scaler_path: Path
+    watermark_path: Path
+    model_name: str
+    target_column: str
+    alpha: float
+    bootstrap_epochs: int
+    full_retrain_every_days: int
+
+
+@dataclass
+class BacktestingConfig:
+    """
+    Configuration class for the rolling-origin backtest.
+
+    Attributes:
+        root_dir: Directory where the backtest results are stored
+        data_path: Ingested raw data, with its date column
+        model_path: Chosen model, refitted on every window
+        feature_names_path: Columns the model was trained on
+        experiment_name: MLflow experiment
+        target_column: Name of the target column
+        window_type: expanding (all days before the origin) or sliding (last train_window_days)
+        initial_train_days: Days before the first origin
+        train_window_days: Length of the sliding window
+        test_days: Days scored after each origin
+        step_days: Days between consecutive origins
+        warm_start: Refit each window from the previous window's model when the estimator allows it
+        n_jobs: Worker processes, -1 for all cores
+    """
+    root_dir: Path
+    data_path: Path
+    model_path: Path
+    feature_names_path: Path
+    experiment_name: str
+    target_column: str
+    window_type: str
+    initial_train_days: int
+    train_window_days: int
+    test_days: int
+    step_days: int
+    warm_start: bool
+    n_jobs: int
@@ -0,0 +1,27 @@
+from src.datascience.config.configuration import ConfigurationManager
+from src.datascience.components.backtesting import Backtesting
+from src.datascience import logger
+
+STAGE_NAME = "Backtesting Stage"
+
+class BacktestingPipeline:
+    def __init__(self):
+        pass
+    def run(self):
+        try:
+            config = ConfigurationManager()
+            backtesting_config = config.get_backtesting_config()
+            backtesting = Backtesting(config=backtesting_config)
+            backtesting.backtest()
+        except Exception as e:
+            raise e 
+
+if __name__ == '__main__':
+    try:
+        logger.info(f"----- Stage {STAGE_NAME} started -----")
+        obj = BacktestingPipeline()
+        obj.run()
+        logger.info(f"----- Stage {STAGE_NAME} completed ----- \n\n")
+    except Exception as e:
+        logger.exception(e)
+        raise e 
@@ -1,6 +1,7 @@
 from src.datascience.config.configuration import ConfigurationManager
 from src.datascience.components.data_ingestion import DataIngestion
 from src.datascience import logger
+from src.datascience.utils.memory import log_peak_rss
 
 STAGE_NAME = "Data Ingestion Stage"
 
@@ -13,6 +14,7 @@ class DataIngestionTrainingPipeline:
             data_ingestion_config = config.get_data_ingestion_config()
             data_ingestion = DataIngestion(config=data_ingestion_config)
             data_ingestion.ingest_data()
+            log_peak_rss(STAGE_NAME)
         except Exception as e:
             raise e
 
@@ -1,10 +1,11 @@
 from src.datascience.config.configuration import ConfigurationManager
 from src.datascience.components.data_transformation import DataTransformation
 from src.datascience import logger
+from src.datascience.utils.memory import log_peak_rss
 from pathlib import Path
 
 
-STAGE_NAME = "Data Validation Stage"
+STAGE_NAME = "Data Transformation Stage"
 
 class DataTransformationDataPipeline:
     def __init__(self):
@@ -14,9 +15,13 @@ class DataTransformationDataPipeline:
             config = ConfigurationManager()
             data_transformation_config = config.get_data_transformation_config()
             data_transformation = DataTransformation(config=data_transformation_config)
-            data_transformation.feature_extraction()
-            data_transformation.feature_transformation()
-            data_transformation.train_test_split_()
+            if data_transformation_config.chunk_size:
+                data_transformation.stream_transform()
+            else:
+                data_transformation.feature_extraction()
+                data_transformation.feature_transformation()
+                data_transformation.train_test_split_()
+            log_peak_rss(STAGE_NAME)
 
         except Exception as e: 
             raise e  
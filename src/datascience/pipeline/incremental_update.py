@@ -0,0 +1,27 @@
+from src.datascience.config.configuration import ConfigurationManager
+from src.datascience.components.incremental_update import IncrementalModelUpdater
+from src.datascience import logger
+
+STAGE_NAME = "Incremental Update Stage"
+
+class IncrementalUpdatePipeline:
+    def __init__(self):
+        pass
+    def run(self):
+        try:
+            config = ConfigurationManager()
+            incremental_update_config = config.get_incremental_update_config()
+            incremental_update = IncrementalModelUpdater(config=incremental_update_config)
+            incremental_update.update()
+        except Exception as e:
+            raise e 
+
+if __name__ == '__main__':
+    try:
+        logger.info(f"----- Stage {STAGE_NAME} started -----")
+        obj = IncrementalUpdatePipeline()
+        obj.run()
+        logger.info(f"----- Stage {STAGE_NAME} completed ----- \n\n")
+    except Exception as e:
+        logger.exception(e)
+        raise e 
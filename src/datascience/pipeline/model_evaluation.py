@@ -1,3 +1,4 @@
+import argparse
 from src.datascience.config.configuration import ConfigurationManager
 from src.datascience import logger
 from src.datascience.components.model_evaluation import ModelEvaluation
@@ -6,12 +7,15 @@ STAGE_NAME = "Model Evaluation Stage"
 
 
 class ModelEvaluationPipeline:
-    def __init__(self):
-        pass
+    def __init__(self, plots: bool = None):
+        # None keeps the plots setting of config.yaml
+        self.plots = plots
     def run(self):
         try: 
             config = ConfigurationManager()
             model_evaluation_config = config.get_model_evaluation_config()
+            if self.plots is not None:
+                model_evaluation_config.plots = self.plots
             model_evaluation = ModelEvaluation(config=model_evaluation_config)
             model_evaluation.evaluate()
             
@@ -19,12 +23,15 @@ class ModelEvaluationPipeline:
             raise e
         
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=STAGE_NAME)
+    parser.add_argument("--no-plots", action="store_true", help="Skip the ROC/PR/confusion-matrix plots (e.g. in CI)")
+    args = parser.parse_args()
+
     try:
         logger.info(f"----- Stage {STAGE_NAME} started -----")
-        obj = ModelEvaluationPipeline()
+        obj = ModelEvaluationPipeline(plots=False if args.no_plots else None)
         obj.run()
         logger.info(f"----- Stage {STAGE_NAME} completed ----- \n\n")
     except Exception as e:
         logger.exception(e)
         raise e 
-
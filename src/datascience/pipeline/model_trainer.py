@@ -1,5 +1,6 @@
 from src.datascience.config.configuration import ConfigurationManager
 from src.datascience import logger
+from src.datascience.utils.memory import log_peak_rss
 from src.datascience.components.model_training import ModelTrainer
 
 STAGE_NAME = "Model Training Stage"
@@ -13,6 +14,7 @@ class ModelTrainingPipeline:
             model_trainer_config = config.get_model_trainer_config()
             model_trainer = ModelTrainer(config=model_trainer_config)
             model_trainer.train()
+            log_peak_rss(STAGE_NAME)
         except Exception as e:
             raise e 
 
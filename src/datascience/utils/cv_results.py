@@ -0,0 +1,97 @@
+import json
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import List
+from src.datascience import logger
+
+
+def _typed_param_column(values: list) -> pd.Series:
+    """
+    Converts one param_<name> column to the narrowest Parquet-friendly type.
+
+    Columns whose values are all bools, or all numbers, keep that type (missing values
+    become nulls). Mixed columns such as gamma ("scale", 0.01) are stored as strings; the
+    exact values are always available in the params column.
+    """
+    present = [v for v in values if v is not None]
+    if present and all(isinstance(v, (bool, np.bool_)) for v in present):
+        return pd.Series(values, dtype="boolean")
+    if present and all(isinstance(v, (int, float, np.number)) and not isinstance(v, (bool, np.bool_)) for v in present):
+        if all(isinstance(v, (int, np.integer)) for v in present):
+            return pd.Series(values, dtype="Int64")
+        return pd.Series(values, dtype="Float64")
+    return pd.Series([None if v is None else str(v) for v in values], dtype="string")
+
+
+def cv_results_to_frame(cv_results: dict, model_name: str, run_id: str = "") -> pd.DataFrame:
+    """
+    Converts GridSearchCV-style cv_results into a typed DataFrame.
+
+    Args:
+        cv_results (dict): cv_results_ of a fitted search
+        model_name (str): Name of the estimator family
+        run_id (str): MLflow run the results belong to
+
+    Returns:
+        pd.DataFrame: One row per candidate
+    """
+    params = list(cv_results["params"])
+    frame = pd.DataFrame({
+        "model": pd.Series([model_name] * len(params), dtype="string"),
+        "run_id": pd.Series([run_id] * len(params), dtype="string"),
+        "candidate": np.arange(len(params), dtype=np.int32),
+    })
+
+    for key, values in cv_results.items():
+        if key == "params":
+            continue
+        if key.startswith("param_"):
+            # filled(None) would use the default object fill value "?", so apply the mask by hand
+            values = np.ma.asarray(values, dtype=object)
+            mask = np.ma.getmaskarray(values)
+            values = [None if masked else value for value, masked in zip(values.data.tolist(), mask)]
+            frame[key] = _typed_param_column(values)
+        else:
+            frame[key] = np.asarray(values)
+
+    # Exact parameter values, so candidates can be rebuilt with set_params
+    frame["params"] = pd.Series([json.dumps(p, default=str, sort_keys=True) for p in params], dtype="string")
+    return frame
+
+
+def save_cv_results(cv_results: dict, path: Path, model_name: str, run_id: str = "") -> Path:
+    """
+    Saves cv_results as a typed Parquet file.
+
+    Returns:
+        Path: Path of the written file
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    cv_results_to_frame(cv_results, model_name, run_id).to_parquet(path, index=False)
+    logger.info(f"cv_results of {model_name} saved at {path}")
+    return path
+
+
+def load_cv_leaderboard(paths: List[Path]) -> pd.DataFrame:
+    """
+    Merges saved cv_results into a single leaderboard across runs and estimators.
+
+    Args:
+        paths (List[Path]): Parquet files or directories containing them
+
+    Returns:
+        pd.DataFrame: All candidates sorted by mean_test_score, with an overall_rank column
+    """
+    files = []
+    for path in map(Path, paths):
+        files.extend(sorted(path.glob("*.parquet")) if path.is_dir() else [path])
+
+    if not files:
+        raise FileNotFoundError(f"No cv_results parquet files found in {paths}")
+
+    leaderboard = pd.concat([pd.read_parquet(f) for f in files], ignore_index=True)
+    leaderboard = leaderboard.sort_values("mean_test_score", ascending=False, na_position="last", ignore_index=True)
+    leaderboard["overall_rank"] = np.arange(1, len(leaderboard) + 1, dtype=np.int32)
+    return leaderboard
@@ -0,0 +1,55 @@
+import resource
+import sys
+import pandas as pd
+from src.datascience import logger
+
+
+def hourly_columns(schema) -> list:
+    """
+    Names of the hourly block described in schema.yaml, e.g. temperature_2m_1 ... temperature_2m_24.
+    """
+    return [f"{feat}_{hour}" for feat in schema.HOURLY_FEATURES for hour in range(1, int(schema.HOURS) + 1)]
+
+
+def read_weather_csv(path, schema, float_dtype: str = "float32", **kwargs):
+    """
+    Reads the raw weather data with the hourly block parsed directly as float_dtype and the
+    date column as datetime64, instead of float64 and Python objects.
+
+    Extra keyword arguments go to pd.read_csv (e.g. chunksize).
+    """
+    return pd.read_csv(
+        path,
+        dtype={col: float_dtype for col in hourly_columns(schema)},
+        parse_dates=[schema.DATE_COLUMN],
+        **kwargs
+    )
+
+
+def apply_dtype_policy(df: pd.DataFrame, schema, float_dtype: str = "float32") -> pd.DataFrame:
+    """
+    Casts a weather DataFrame already in memory (e.g. read from the database) to the dtype
+    policy: hourly block as float_dtype and the date as datetime64.
+    """
+    columns = [col for col in hourly_columns(schema) if col in df.columns]
+    df[columns] = df[columns].astype(float_dtype)
+    if schema.DATE_COLUMN in df.columns:
+        df[schema.DATE_COLUMN] = pd.to_datetime(df[schema.DATE_COLUMN])
+    return df
+
+
+def peak_rss_mb() -> float:
+    """
+    Peak resident set size of the current process so far, in MB.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on Linux
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def log_peak_rss(stage: str):
+    """
+    Logs the peak RSS of the process. It is a high-water mark, so run a stage on its own
+    (python -m src.datascience.pipeline.<stage>) to measure that stage alone.
+    """
+    logger.info(f"{stage} peak RSS: {peak_rss_mb():.0f} MB")
@@ -0,0 +1,181 @@
+import numpy as np
+
+LABELS = ("0", "1")
+
+
+def _curves_from_counts(tps: np.ndarray, fps: np.ndarray, thresholds: np.ndarray) -> dict:
+    """
+    Builds ROC and PR curves from cumulative true/false positive counts at decreasing thresholds.
+    """
+    n_pos, n_neg = tps[-1], fps[-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fpr = np.r_[0.0, fps / n_neg]
+        tpr = np.r_[0.0, tps / n_pos]
+        precision = tps / (tps + fps)
+        recall = tps / n_pos
+
+    if n_pos == 0 or n_neg == 0:
+        # ROC AUC is undefined with a single class in the data
+        roc_auc = float("nan")
+    else:
+        roc_auc = float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2))
+    # Without positives average_precision_score warns and returns 0
+    average_precision = float(np.sum(np.diff(np.r_[0.0, recall]) * precision)) if n_pos else 0.0
+
+    return {
+        "fpr": fpr,
+        "tpr": tpr,
+        "roc_thresholds": np.r_[np.inf, thresholds],
+        # Increasing thresholds, ending at (recall 0, precision 1) like precision_recall_curve
+        "precision": np.r_[precision[::-1], 1.0],
+        "recall": np.r_[recall[::-1], 0.0],
+        "roc_auc": roc_auc,
+        "average_precision": average_precision,
+    }
+
+
+def binary_curves(y_true, y_score) -> dict:
+    """
+    ROC curve, PR curve, ROC AUC and average precision from a single sort of the scores.
+
+    Gives the same values as roc_curve/roc_auc_score and precision_recall_curve/
+    average_precision_score (without dropping intermediate points), which each sort again.
+
+    Returns:
+        dict: fpr, tpr, roc_thresholds, precision, recall, roc_auc and average_precision
+    """
+    y_true = np.asarray(y_true)
+    y_score = np.asarray(y_score)
+
+    order = np.argsort(y_score, kind="mergesort")[::-1]
+    y_score = y_score[order]
+    y_true = y_true[order]
+
+    # Last index of every distinct score, ties share a threshold
+    threshold_idxs = np.r_[np.flatnonzero(np.diff(y_score)), y_true.size - 1]
+    tps = np.cumsum(y_true, dtype=np.float64)[threshold_idxs]
+    fps = 1 + threshold_idxs - tps
+    return _curves_from_counts(tps, fps, y_score[threshold_idxs])
+
+
+def confusion_from_labels(y_true, y_pred) -> np.ndarray:
+    """
+    2x2 confusion matrix of 0/1 labels, rows are true labels and columns predictions.
+    """
+    codes = 2 * np.asarray(y_true, dtype=np.int64) + np.asarray(y_pred, dtype=np.int64)
+    return np.bincount(codes, minlength=4).reshape(2, 2)
+
+
+def report_from_confusion(confusion: np.ndarray, labels=None) -> dict:
+    """
+    Same dict as classification_report(output_dict=True) for 0/1 labels, computed from
+    the confusion matrix instead of the labels.
+
+    Args:
+        confusion (np.ndarray): 2x2 confusion matrix from confusion_from_labels
+        labels (list, optional): Labels to report, as in classification_report. By default
+            only the labels present in the true or predicted values are reported, so a
+            window without rain has no "1" entry and its averages cover class "0" only.
+
+    Returns:
+        dict: Per-label precision, recall, f1-score and support, plus the averages
+    """
+    confusion = np.asarray(confusion, dtype=np.float64)
+    if labels is None:
+        labels = np.flatnonzero(confusion.sum(axis=0) + confusion.sum(axis=1))
+    labels = np.asarray(labels, dtype=np.int64)
+    support = confusion.sum(axis=1)[labels]
+    predicted = confusion.sum(axis=0)[labels]
+    true_positives = np.diag(confusion)[labels]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(predicted > 0, true_positives / predicted, 0.0)
+        recall = np.where(support > 0, true_positives / support, 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+
+    report = {
+        LABELS[label]: {
+            "precision": float(precision[i]),
+            "recall": float(recall[i]),
+            "f1-score": float(f1[i]),
+            "support": float(support[i]),
+        }
+        for i, label in enumerate(labels)
+    }
+    total = support.sum()
+    if np.isin(np.flatnonzero(confusion.sum(axis=0) + confusion.sum(axis=1)), labels).all():
+        report["accuracy"] = float(np.trace(confusion) / confusion.sum()) if total else 0.0
+    else:
+        # Like classification_report, a subset of the labels gets a micro average instead
+        tp, n_predicted = true_positives.sum(), predicted.sum()
+        micro_precision = float(tp / n_predicted) if n_predicted else 0.0
+        micro_recall = float(tp / total) if total else 0.0
+        micro_sum = micro_precision + micro_recall
+        report["micro avg"] = {
+            "precision": micro_precision,
+            "recall": micro_recall,
+            "f1-score": 2 * micro_precision * micro_recall / micro_sum if micro_sum else 0.0,
+            "support": float(total),
+        }
+    report["macro avg"] = {
+        "precision": float(precision.mean()),
+        "recall": float(recall.mean()),
+        "f1-score": float(f1.mean()),
+        "support": float(total),
+    }
+    weights = support / total if total else np.zeros(len(labels))
+    report["weighted avg"] = {
+        "precision": float(precision @ weights),
+        "recall": float(recall @ weights),
+        "f1-score": float(f1 @ weights),
+        "support": float(total),
+    }
+    return report
+
+
+class StreamingBinaryMetrics:
+    """
+    Accumulates the confusion matrix and per-class histograms of scores in [0, 1] over
+    chunks of data, so metrics of a test file larger than memory can be computed without
+    keeping the scores.
+
+    ROC and PR curves use the histogram bin edges as thresholds: scores falling in the
+    same bin are treated as ties, so ROC AUC and average precision are exact up to the
+    bin resolution (1 / n_bins).
+    """
+
+    def __init__(self, n_bins: int = 10000):
+        self.n_bins = int(n_bins)
+        self.confusion = np.zeros((2, 2), dtype=np.int64)
+        self.positive_counts = np.zeros(self.n_bins, dtype=np.int64)
+        self.negative_counts = np.zeros(self.n_bins, dtype=np.int64)
+        self.has_scores = True
+
+    def update(self, y_true, y_pred, y_score=None):
+        """
+        Adds one chunk. y_score must be in [0, 1] (probabilities, or decision scores passed
+        through a sigmoid); without scores only the confusion matrix is accumulated.
+        """
+        y_true = np.asarray(y_true, dtype=np.int64)
+        self.confusion += confusion_from_labels(y_true, y_pred)
+
+        if y_score is None:
+            self.has_scores = False
+            return
+        bins = np.minimum((np.asarray(y_score) * self.n_bins).astype(np.int64), self.n_bins - 1)
+        self.positive_counts += np.bincount(bins[y_true == 1], minlength=self.n_bins)
+        self.negative_counts += np.bincount(bins[y_true == 0], minlength=self.n_bins)
+
+    def curves(self) -> dict:
+        """
+        ROC/PR curves and their areas from the accumulated histograms, None without scores.
+        """
+        if not self.has_scores:
+            return None
+        # Walk the bins from the highest scores down, skipping empty bins
+        positives, negatives = self.positive_counts[::-1], self.negative_counts[::-1]
+        non_empty = (positives + negatives) > 0
+        thresholds = (np.arange(self.n_bins)[::-1] / self.n_bins)[non_empty]
+        tps = np.cumsum(positives)[non_empty].astype(np.float64)
+        fps = np.cumsum(negatives)[non_empty].astype(np.float64)
+        return _curves_from_counts(tps, fps, thresholds)
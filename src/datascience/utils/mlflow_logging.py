@@ -0,0 +1,218 @@
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
+import mlflow.sklearn
+from mlflow.entities import Metric, Param
+from mlflow.store.artifact.artifact_repository_registry import get_artifact_repository
+from mlflow.tracking import MlflowClient
+from src.datascience import logger
+
+# Limits of a single MlflowClient.log_batch request
+MAX_PARAMS_PER_BATCH = 100
+MAX_METRICS_PER_BATCH = 1000
+
+
+class AsyncMlflowLogger:
+    """
+    Background MLflow logger.
+
+    Params and metrics are queued and sent by a background thread through log_batch,
+    grouped per run, instead of one request per value. Artifacts, figures and models
+    are uploaded by a pool of threads so the caller never waits on the network.
+
+    Runs are created with start_run and only terminated in close(), after every queued
+    value and upload of the run has been sent. Works with any tracking URI, including a
+    local file store (e.g. MLFLOW_TRACKING_URI=file:./mlruns).
+    """
+
+    _STOP = object()
+
+    def __init__(self, experiment_id: str, max_workers: int = 4):
+        self.client = MlflowClient()
+        self.experiment_id = experiment_id
+
+        self._queue = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mlflow-upload")
+        self._uploads = []
+        self._runs = {}  # run_id -> status requested by end_run (None while still open)
+        self._errors = []
+        self._closed = False
+        # Serializes log_batch with the run reads of the upload threads, see _artifact_repo
+        self._store_lock = threading.Lock()
+        self._artifact_repos = {}
+        self._tmp_dir = tempfile.mkdtemp(prefix="mlflow-async-")
+
+        self._worker = threading.Thread(target=self._drain, name="mlflow-batch", daemon=True)
+        self._worker.start()
+
+    def start_run(self, run_name: str) -> str:
+        """
+        Creates a run synchronously and returns its id.
+        """
+        run = self.client.create_run(self.experiment_id, run_name=run_name)
+        self._runs[run.info.run_id] = None
+        self._artifact_repos[run.info.run_id] = get_artifact_repository(run.info.artifact_uri)
+        return run.info.run_id
+
+    def started(self, run_id: str) -> bool:
+        """
+        Whether the run was created by this logger, as opposed to an earlier session.
+        """
+        return run_id in self._runs
+
+    def end_run(self, run_id: str, status: str = "FINISHED"):
+        """
+        Marks a run as done. It is terminated once its pending logging has been sent.
+        """
+        self._runs[run_id] = status
+
+    def log_params(self, run_id: str, params: dict):
+        for key, value in params.items():
+            self._queue.put((run_id, Param(key, str(value))))
+
+    def log_metrics(self, run_id: str, metrics: dict, step: int = 0):
+        timestamp = int(time.time() * 1000)
+        for key, value in metrics.items():
+            self._queue.put((run_id, Metric(key, float(value), timestamp, step)))
+
+    def log_artifact(self, run_id: str, local_path: str, artifact_path: str = None):
+        self._submit(lambda: self._artifact_repo(run_id).log_artifact(local_path, artifact_path))
+
+    def log_figure(self, run_id: str, figure, artifact_file: str):
+        """
+        Renders the figure to a temporary file on the calling thread (matplotlib is not
+        thread safe) and uploads it in the background.
+        """
+        local_dir = tempfile.mkdtemp(dir=self._tmp_dir)
+        local_path = os.path.join(local_dir, os.path.basename(artifact_file))
+        figure.savefig(local_path)
+        artifact_dir = os.path.dirname(artifact_file) or None
+        self._submit(lambda: self._artifact_repo(run_id).log_artifact(local_path, artifact_dir))
+
+    def log_model(self, run_id: str, model, artifact_path: str):
+        """
+        Saves an sklearn model in MLflow format and uploads it in the background.
+        The model can be loaded back with mlflow.sklearn.load_model(f"runs:/{run_id}/{artifact_path}").
+        """
+        def _save_and_upload():
+            local_path = os.path.join(tempfile.mkdtemp(dir=self._tmp_dir), artifact_path)
+            mlflow.sklearn.save_model(model, path=local_path)
+            self._artifact_repo(run_id).log_artifacts(local_path, artifact_path)
+
+        self._submit(_save_and_upload)
+
+    def _artifact_repo(self, run_id: str):
+        """
+        Artifact repository of a run, known from start_run or read once for runs of an
+        earlier session. MlflowClient.log_artifact would read the run on every new run id,
+        and a file store reads every metric file then, including one that log_batch is
+        still writing, so the read holds the same lock as log_batch.
+        """
+        if run_id not in self._artifact_repos:
+            with self._store_lock:
+                artifact_uri = self.client.get_run(run_id).info.artifact_uri
+            self._artifact_repos[run_id] = get_artifact_repository(artifact_uri)
+        return self._artifact_repos[run_id]
+
+    def _submit(self, fn, *args):
+        def _run():
+            try:
+                fn(*args)
+            except Exception as e:
+                logger.error(f"MLflow upload failed: {e}")
+                self._errors.append(e)
+
+        self._uploads.append(self._executor.submit(_run))
+
+    def _drain(self):
+        """
+        Background loop that groups queued params/metrics per run and sends them with log_batch.
+        """
+        stop = False
+        while not stop:
+            items = [self._queue.get()]
+            # Pick up everything queued in the meantime so it goes out in the same batch
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            batches = defaultdict(lambda: {"params": [], "metrics": []})
+            for item in items:
+                if item is self._STOP:
+                    stop = True
+                    continue
+                run_id, entity = item
+                kind = "params" if isinstance(entity, Param) else "metrics"
+                batches[run_id][kind].append(entity)
+
+            for run_id, batch in batches.items():
+                try:
+                    self._send_batch(run_id, batch["params"], batch["metrics"])
+                except Exception as e:
+                    logger.error(f"MLflow log_batch failed for run {run_id}: {e}")
+                    self._errors.append(e)
+
+            for _ in items:
+                self._queue.task_done()
+
+    def _send_batch(self, run_id: str, params: list, metrics: list):
+        # Params can only be logged once per run, keep the last value of duplicated keys
+        params = list({param.key: param for param in params}.values())
+        with self._store_lock:
+            for start in range(0, len(params), MAX_PARAMS_PER_BATCH):
+                self.client.log_batch(run_id, params=params[start:start + MAX_PARAMS_PER_BATCH])
+            for start in range(0, len(metrics), MAX_METRICS_PER_BATCH):
+                self.client.log_batch(run_id, metrics=metrics[start:start + MAX_METRICS_PER_BATCH])
+
+    def flush(self):
+        """
+        Blocks until every queued param/metric and every upload has been sent.
+        """
+        self._queue.join()
+        wait(self._uploads)
+        self._uploads = []
+
+    def close(self, status: str = "FINISHED"):
+        """
+        Flushes everything, terminates the runs and stops the background threads.
+
+        Background errors are only raised when closing a successful run. When closing
+        after a failure (any other status), they are logged instead, so they do not
+        replace the exception the caller is handling.
+
+        Args:
+            status (str): Status of runs that were not explicitly ended (e.g. "FAILED")
+
+        Raises:
+            RuntimeError: If status is "FINISHED" and any logging call failed in the background
+        """
+        if self._closed:
+            return
+        self._closed = True
+        succeeded = status == "FINISHED"
+        try:
+            self.flush()
+            for run_id, run_status in self._runs.items():
+                self.client.set_terminated(run_id, status=run_status or status)
+        except Exception as e:
+            if succeeded:
+                raise
+            logger.error(f"MLflow runs could not be terminated: {e}")
+        finally:
+            self._queue.put(self._STOP)
+            self._worker.join()
+            self._executor.shutdown(wait=True)
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+
+        if self._errors:
+            message = f"{len(self._errors)} MLflow logging calls failed, first error: {self._errors[0]}"
+            if succeeded:
+                raise RuntimeError(message)
+            logger.error(message)
@@ -0,0 +1,104 @@
+import importlib.util
+from contextlib import contextmanager
+import joblib
+from joblib.parallel import get_active_backend
+from src.datascience import logger
+
+# scheduler_address value that starts a throwaway cluster inside the current process
+LOCAL_CLUSTER = "local"
+
+# Module each distributed backend needs, installed with the extras of setup.py (pip install -e .[dask])
+BACKEND_MODULES = {"dask": "dask.distributed", "ray": "ray"}
+
+
+def check_backend(name: str):
+    """
+    Fails fast when the configured backend is unknown or its package is not installed,
+    before any data is loaded.
+
+    Raises:
+        ValueError: If the backend name is unknown
+        ImportError: If dask or ray is not installed
+    """
+    if name == "loky":
+        return
+    if name not in BACKEND_MODULES:
+        raise ValueError(f"Unknown parallel backend '{name}', expected loky, dask or ray")
+    try:
+        installed = importlib.util.find_spec(BACKEND_MODULES[name]) is not None
+    except ModuleNotFoundError:
+        # The parent package (dask) is missing
+        installed = False
+    if not installed:
+        raise ImportError(
+            f"parallel_backend '{name}' needs {BACKEND_MODULES[name]}, install it with pip install -e .[{name}] "
+            f"or set model_trainer.parallel_backend to loky"
+        )
+
+
+@contextmanager
+def parallel_backend(name: str = "loky", scheduler_address: str = None, worker_resources: dict = None, scatter: list = None):
+    """
+    Runs every joblib Parallel call inside the block (GridSearchCV, the custom searches,
+    random forests, ...) on the configured backend.
+
+    Args:
+        name (str): "loky" (local processes), "dask" or "ray"
+        scheduler_address (str): Address of the cluster. "local" or None starts an in-process
+            cluster, which is how the distributed backends can be tested on one machine.
+        worker_resources (dict): Resources each task requests, e.g. {"CPU": 1} for ray or
+            {"MEMORY": 2e9} for dask workers started with matching --resources
+        scatter (list): Large arguments (the training matrix) sent once to the dask workers
+            instead of with every task
+
+    Raises:
+        ValueError: If the backend name is unknown
+        ImportError: If dask or ray is not installed
+    """
+    check_backend(name)
+    worker_resources = dict(worker_resources or {})
+
+    if name == "loky":
+        yield
+        return
+
+    if name == "dask":
+        from dask.distributed import Client
+
+        if scheduler_address in (None, LOCAL_CLUSTER):
+            client = Client(processes=False)
+        else:
+            client = Client(scheduler_address)
+        logger.info(f"Using dask cluster at {client.scheduler.address} ({len(client.scheduler_info()['workers'])} workers)")
+
+        kwargs = {"resources": worker_resources} if worker_resources else {}
+        try:
+            with joblib.parallel_backend("dask", client=client, scatter=scatter, **kwargs):
+                yield
+        finally:
+            client.close()
+        return
+
+    if name == "ray":
+        import ray
+        from ray.util.joblib import register_ray
+
+        address = None if scheduler_address == LOCAL_CLUSTER else scheduler_address
+        ray.init(address=address, ignore_reinit_error=True)
+        register_ray()
+        logger.info(f"Using ray cluster with resources {ray.cluster_resources()}")
+
+        kwargs = {"ray_remote_args": worker_resources} if worker_resources else {}
+        try:
+            with joblib.parallel_backend("ray", **kwargs):
+                yield
+        finally:
+            ray.shutdown()
+
+
+def supports_streaming() -> bool:
+    """
+    Whether the active joblib backend can return results as they complete.
+    """
+    backend, _ = get_active_backend()
+    return bool(backend.supports_return_generator)
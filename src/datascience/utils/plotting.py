@@ -0,0 +1,104 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+import numpy as np
+
+# Repository root, so the rendering process can import src regardless of its working directory
+REPO_ROOT = Path(__file__).resolve().parents[3]
+
+
+def render_evaluation_plots(curves: dict, confusion, out_dir: str) -> list:
+    """
+    Renders the ROC, PR and confusion-matrix plots of an evaluation to PNG files with the
+    non-interactive Agg backend, from the curve arrays computed by the evaluation.
+
+    Args:
+        curves (dict): Output of binary_curves / StreamingBinaryMetrics.curves, or None
+        confusion: 2x2 confusion matrix
+        out_dir (str): Directory where the PNG files are written
+
+    Returns:
+        list: Paths of the written files
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from sklearn.metrics import RocCurveDisplay, PrecisionRecallDisplay, ConfusionMatrixDisplay
+
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+
+    def _save(display, file_name):
+        display.plot()
+        path = os.path.join(out_dir, file_name)
+        plt.gcf().savefig(path)
+        plt.close("all")
+        paths.append(path)
+
+    if curves is not None:
+        _save(RocCurveDisplay(fpr=curves["fpr"], tpr=curves["tpr"], roc_auc=curves["roc_auc"]), "roc_curve.png")
+        _save(
+            PrecisionRecallDisplay(
+                precision=curves["precision"], recall=curves["recall"], average_precision=curves["average_precision"]
+            ),
+            "pr_curve.png"
+        )
+    _save(ConfusionMatrixDisplay(confusion_matrix=confusion), "confusion_matrix.png")
+    return paths
+
+
+class BackgroundPlotRenderer:
+    """
+    Renders the evaluation plots in a separate Python process while the caller goes on.
+
+    The curves are handed over as an .npz file and the child runs this module with
+    python -m, so it never re-imports the caller's __main__ (main.py runs its stages at
+    import time) and never inherits the MLflow logging threads.
+    """
+
+    def __init__(self, curves: dict, confusion, out_dir: str):
+        os.makedirs(out_dir, exist_ok=True)
+        self.inputs_path = os.path.join(out_dir, "plot_inputs.npz")
+
+        arrays = {"confusion": np.asarray(confusion)}
+        if curves is not None:
+            arrays.update({f"curve_{key}": np.asarray(value) for key, value in curves.items()})
+        np.savez(self.inputs_path, **arrays)
+
+        env = dict(os.environ, MPLBACKEND="Agg")
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(REPO_ROOT), env.get("PYTHONPATH")]))
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "src.datascience.utils.plotting", self.inputs_path, out_dir],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            env=env
+        )
+
+    def wait(self) -> list:
+        """
+        Waits for the rendering process.
+
+        Returns:
+            list: Paths of the written PNG files
+
+        Raises:
+            RuntimeError: If rendering failed
+        """
+        stdout, stderr = self.process.communicate()
+        os.remove(self.inputs_path)
+        if self.process.returncode != 0:
+            raise RuntimeError(f"Plot rendering failed: {stderr.strip()}")
+        return json.loads(stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    inputs_path, out_dir = sys.argv[1], sys.argv[2]
+    with np.load(inputs_path) as inputs:
+        curves = {key[len("curve_"):]: inputs[key] for key in inputs.files if key.startswith("curve_")} or None
+        if curves is not None:
+            curves = {key: value.item() if value.ndim == 0 else value for key, value in curves.items()}
+        paths = render_evaluation_plots(curves, inputs["confusion"], out_dir)
+    print(json.dumps(paths))
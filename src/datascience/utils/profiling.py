@@ -0,0 +1,62 @@
+import os
+import tempfile
+import time
+import joblib
+import numpy as np
+
+
+def _median_ms(fn, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.median(timings))
+
+
+def profile_model(model, X_sample, repeats: int = 20) -> dict:
+    """
+    Measures the serving cost of a fitted model the way app.py uses it.
+
+    Args:
+        model: Fitted estimator
+        X_sample: Rows used for the batch latency, the first one is used for the single-row latency
+        repeats (int): Number of timed calls, the median is reported
+
+    Returns:
+        dict: size_mb (joblib file), load_ms, single_predict_ms, batch_predict_ms and
+        batch_rows_per_s, using predict_proba when available
+    """
+    predict = model.predict_proba if hasattr(model, "predict_proba") else model.predict
+    X_sample = np.asarray(X_sample)
+    row = X_sample[:1]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "model.joblib")
+        joblib.dump(model, path)
+        size_mb = os.path.getsize(path) / 1024 ** 2
+        load_ms = _median_ms(lambda: joblib.load(path), max(1, repeats // 4))
+
+    # Warm-up call so lazy initialisation is not counted
+    predict(row)
+    single_predict_ms = _median_ms(lambda: predict(row), repeats)
+    batch_predict_ms = _median_ms(lambda: predict(X_sample), max(1, repeats // 4))
+
+    return {
+        "size_mb": size_mb,
+        "load_ms": load_ms,
+        "single_predict_ms": single_predict_ms,
+        "batch_predict_ms": batch_predict_ms,
+        "batch_rows_per_s": len(X_sample) / (batch_predict_ms / 1000) if batch_predict_ms > 0 else float("inf"),
+    }
+
+
+def within_budget(profile: dict, max_latency_ms: float = None, max_size_mb: float = None) -> bool:
+    """
+    Whether a profile meets the single-row latency and size budgets (None means no limit).
+    """
+    if max_latency_ms is not None and profile["single_predict_ms"] > max_latency_ms:
+        return False
+    if max_size_mb is not None and profile["size_mb"] > max_size_mb:
+        return False
+    return True
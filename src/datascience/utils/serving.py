@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import Pipeline
+from sklearn.svm import SVC, NuSVC
+
+
+def predict_once(model, row: dict, features: list[str]):
+    """
+    Scores one hand-typed row the way app.py does: values coerced to numbers and the
+    columns put in the training order, missing ones filled with 0.
+
+    Returns:
+        tuple: (label, score, is_prob, DataFrame passed to the model)
+    """
+    df = pd.DataFrame([row]).apply(pd.to_numeric, errors="coerce")
+    df = df.reindex(columns=features, fill_value=0.0)
+    y = model.predict(df)[0]
+    score = None
+    is_prob = False
+    if hasattr(model, "predict_proba"):
+        score = float(model.predict_proba(df)[:, 1][0])
+        is_prob = True
+    elif hasattr(model, "decision_function"):
+        score = float(model.decision_function(df)[0])
+        is_prob = False
+    return int(y), score, is_prob, df
+
+
+def _predict_follows_proba(model) -> bool:
+    # SVC and NuSVC predict from the decision function, and their Platt-scaled
+    # probabilities can put a row close to the boundary on the other side of 0.5
+    final = model[-1] if isinstance(model, Pipeline) else model
+    return not isinstance(final, (SVC, NuSVC))
+
+
+def score_and_label(model, X):
+    """
+    Single inference pass: positive-class scores and the labels predict would return.
+
+    Labels are derived from the scores (argmax of predict_proba, sign of decision_function)
+    instead of a second predict call, except for models whose predict does not follow
+    their probabilities (SVC/NuSVC), which also call predict.
+
+    Returns:
+        tuple: (y_score or None, y_pred, whether y_score is a probability)
+    """
+    if hasattr(model, "predict_proba"):
+        y_score = model.predict_proba(X)[:, 1]
+        if not _predict_follows_proba(model):
+            return y_score, model.predict(X), True
+        # argmax of the two probabilities, ties go to the first class like predict
+        return y_score, model.classes_[(y_score > 0.5).astype(int)], True
+    if hasattr(model, "decision_function"):
+        y_score = model.decision_function(X)
+        return y_score, model.classes_[(y_score > 0).astype(int)], False
+    return None, model.predict(X), False
+
+
+def prepare_batch(df: pd.DataFrame, features: list[str]):
+    """
+    Validates an uploaded batch and puts its columns in the training order in one step.
+
+    Non-numeric values become NaN, and rows with a missing or non-finite feature are
+    marked invalid instead of failing the whole file.
+
+    Returns:
+        tuple: (features DataFrame in training order, boolean array of valid rows)
+
+    Raises:
+        ValueError: If feature columns are missing from the file
+    """
+    missing = [col for col in features if col not in df.columns]
+    if missing:
+        raise ValueError(f"Missing columns: {', '.join(missing)}")
+
+    X = df[features]
+    non_numeric = [col for col in features if not pd.api.types.is_numeric_dtype(X[col])]
+    if non_numeric:
+        X = X.assign(**{col: pd.to_numeric(X[col], errors="coerce") for col in non_numeric})
+    X = X.astype("float64")
+    valid = np.isfinite(X.to_numpy()).all(axis=1)
+    return X, valid
+
+
+def score_batch(model, X: pd.DataFrame, chunk_size: int = 50_000):
+    """
+    Scores a prepared batch chunk by chunk, so the caller can report progress. Each chunk
+    goes through score_and_label, so labels come from the scores instead of a second pass.
+
+    Yields:
+        tuple: (rows scored so far, labels of the chunk, scores of the chunk or None)
+    """
+    # ModelTrainer fits on plain arrays in the feature_names.json order, which X already has
+    values = X.to_numpy()
+    for start in range(0, len(values), chunk_size):
+        scores, labels, _ = score_and_label(model, values[start:start + chunk_size])
+        yield min(start + chunk_size, len(values)), labels, scores
+
+
+# Virtual feature of the what-if grid, it moves wind_dir_sin and wind_dir_cos together
+WIND_DIRECTION = "wind_direction (degrees)"
+
+
+def what_if_grid(row: dict, features: list[str], axes: dict):
+    """
+    Grid of inputs around one row: every combination of the axis values, the other
+    features as in the row.
+
+    Args:
+        row (dict): Current input row
+        features (list[str]): Columns in the training order
+        axes (dict): One or two feature names mapped to the values to try; WIND_DIRECTION
+            takes degrees and sets wind_dir_sin and wind_dir_cos
+
+    Returns:
+        tuple: (DataFrame of the axis values, one row per grid point, feature matrix in training order)
+    """
+    names = list(axes)
+    mesh = np.meshgrid(*[np.asarray(values, dtype=float) for values in axes.values()], indexing="ij")
+    grid = pd.DataFrame({name: values.ravel() for name, values in zip(names, mesh)})
+
+    base = pd.DataFrame([row]).apply(pd.to_numeric, errors="coerce").reindex(columns=features, fill_value=0.0)
+    X = np.repeat(base.to_numpy(dtype=float), len(grid), axis=0)
+    column = {feat: i for i, feat in enumerate(features)}
+    for name in names:
+        if name == WIND_DIRECTION:
+            radians = np.radians(grid[name].to_numpy() % 360.0)
+            X[:, column["wind_dir_sin"]] = np.sin(radians)
+            X[:, column["wind_dir_cos"]] = np.cos(radians)
+        else:
+            X[:, column[name]] = grid[name].to_numpy()
+    return grid, X
+
+
+def score_grid(model, X: np.ndarray):
+    """
+    Scores a whole what-if grid in one call.
+
+    Returns:
+        tuple: (scores, is_prob), probabilities of rain when the model has predict_proba
+    """
+    if hasattr(model, "predict_proba"):
+        return model.predict_proba(X)[:, 1], True
+    return model.decision_function(X), False
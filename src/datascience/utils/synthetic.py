@@ -0,0 +1,149 @@
+import numpy as np
+import pandas as pd
+
+# Hourly variables requested from the archive API, in the order DataExtraction asks for them
+HOURLY_FEATURES = [
+    "temperature_2m",
+    "relative_humidity_2m",
+    "precipitation",
+    "cloud_cover",
+    "wind_speed_10m",
+    "wind_direction_10m",
+    "shortwave_radiation",
+    "surface_pressure",
+    "sunshine_duration",
+    "et0_fao_evapotranspiration"
+]
+
+# Decimals of the values returned by Open-Meteo
+_DECIMALS = {
+    "temperature_2m": 1,
+    "relative_humidity_2m": 0,
+    "precipitation": 1,
+    "cloud_cover": 0,
+    "wind_speed_10m": 1,
+    "wind_direction_10m": 0,
+    "shortwave_radiation": 0,
+    "surface_pressure": 1,
+    "sunshine_duration": 0,
+    "et0_fao_evapotranspiration": 2,
+}
+
+
+def _simulate(days: int, location: int, start_date: str, seed: int) -> dict:
+    """
+    Hourly weather of one location as arrays of shape (days, 24).
+
+    A daily wet/dry regime (AR(1)) drives humidity, cloud cover, pressure and the chance
+    of rain; temperature and radiation follow the season and the hour of the day. Every
+    location has its own climate and random stream, so its series does not depend on how
+    many locations are generated.
+    """
+    rng = np.random.default_rng([seed, location])
+    dates = pd.date_range(start_date, periods=days, freq="D")
+    day_of_year = dates.dayofyear.to_numpy()[:, None]
+    hour = np.arange(24)[None, :]
+
+    # Climate of the location
+    mean_temp = rng.uniform(5, 25)
+    seasonal_amplitude = rng.uniform(3, 12)
+    wetness = rng.uniform(-0.5, 0.5)
+    prevailing_wind = rng.uniform(0, 360)
+    elevation_pressure = 1013 - rng.uniform(0, 60)
+
+    # Daily wet/dry regime and temperature anomaly, both persistent over a few days
+    regime = np.empty(days)
+    anomaly = np.empty(days)
+    regime[0], anomaly[0] = rng.normal(), rng.normal(0, 2)
+    shocks = rng.normal(size=(days, 2))
+    for d in range(1, days):
+        regime[d] = 0.7 * regime[d - 1] + 0.71 * shocks[d, 0]
+        anomaly[d] = 0.8 * anomaly[d - 1] + 1.2 * shocks[d, 1]
+    wet = (regime + wetness)[:, None]
+
+    season = np.cos(2 * np.pi * (day_of_year - 200) / 365.25)
+    daylight = np.clip(np.sin(np.pi * (hour - 6) / 12), 0, None) * (0.8 + 0.2 * season)
+
+    cloud_cover = np.clip(50 + 30 * wet + rng.normal(0, 15, (days, 24)), 0, 100)
+    temperature = (
+        mean_temp + seasonal_amplitude * season + anomaly[:, None]
+        + 5 * np.sin(np.pi * (hour - 9) / 12) * (1 - cloud_cover / 200)
+        + rng.normal(0, 0.5, (days, 24))
+    )
+    humidity = np.clip(70 + 12 * wet - 1.5 * (temperature - temperature.mean(axis=1, keepdims=True))
+                       + rng.normal(0, 5, (days, 24)), 5, 100)
+
+    # Rain is likelier on wet days and in humid, cloudy hours; amounts are skewed
+    rain_chance = 1 / (1 + np.exp(-(1.5 * wet + 0.05 * (humidity - 85) + 0.03 * (cloud_cover - 70) - 2.5)))
+    precipitation = np.where(rng.random((days, 24)) < rain_chance, rng.gamma(0.6, 1.5, (days, 24)), 0.0)
+
+    wind_speed = rng.gamma(2.0, 4.0 + 1.5 * np.abs(wet)) * (1 + 0.3 * daylight)
+    wind_direction = (prevailing_wind + np.degrees(rng.vonmises(0, 2.0, (days, 24)))) % 360
+    shortwave_radiation = 900 * daylight * (1 - 0.75 * cloud_cover / 100)
+    surface_pressure = elevation_pressure - 6 * wet + rng.normal(0, 0.8, (days, 24))
+    sunshine_duration = 3600 * np.clip(daylight * 3, 0, 1) * np.clip(1 - cloud_cover / 90, 0, 1)
+    et0 = np.clip(0.0009 * shortwave_radiation * (1 + temperature / 40) * (1 - humidity / 150), 0, 5)
+
+    values = {
+        "temperature_2m": temperature,
+        "relative_humidity_2m": humidity,
+        "precipitation": precipitation,
+        "cloud_cover": cloud_cover,
+        "wind_speed_10m": wind_speed,
+        "wind_direction_10m": wind_direction,
+        "shortwave_radiation": shortwave_radiation,
+        "surface_pressure": surface_pressure,
+        "sunshine_duration": sunshine_duration,
+        "et0_fao_evapotranspiration": et0,
+    }
+    return {"dates": dates, **{feat: np.round(values[feat], _DECIMALS[feat]) for feat in HOURLY_FEATURES}}
+
+
+def generate_hourly(days: int, location: int = 0, start_date: str = "2020-01-01", seed: int = 42) -> pd.DataFrame:
+    """
+    Hourly data of one location shaped like the archive API response, i.e. like
+    pd.DataFrame(response.json()["hourly"]) in DataExtraction: a time column
+    ("2020-01-01T00:00") and one column per hourly variable.
+
+    Args:
+        days (int): Number of days
+        location (int): Index of the location, each one has its own climate
+        start_date (str): First day
+        seed (int): Random seed
+
+    Returns:
+        pd.DataFrame: days * 24 rows
+    """
+    sim = _simulate(days, location, start_date, seed)
+    times = (sim["dates"].to_numpy()[:, None] + np.arange(24) * np.timedelta64(1, "h")).ravel()
+    hourly = {"time": pd.DatetimeIndex(times).strftime("%Y-%m-%dT%H:%M")}
+    hourly.update({feat: sim[feat].ravel() for feat in HOURLY_FEATURES})
+    return pd.DataFrame(hourly)
+
+
+def generate_daily(days: int, locations: int = 1, start_date: str = "2020-01-01", seed: int = 42) -> pd.DataFrame:
+    """
+    The same data flattened like the weather_data table and data.csv: one row per day and
+    location with the date and temperature_2m_1 ... et0_fao_evapotranspiration_24.
+
+    The weather_data table holds one location and is keyed by date. With several locations
+    the dates repeat, one block of days per location, so a location column (0, 1, ...)
+    after the date keeps the rows unique on (location, date), the LOCATION_COLUMN of
+    schema.yaml.
+
+    Returns:
+        pd.DataFrame: days * locations rows, 241 columns (242 with several locations)
+    """
+    blocks = []
+    for location in range(locations):
+        sim = _simulate(days, location, start_date, seed)
+        # (days, 24) per feature -> (days, features * 24), feature-major like the ETL output
+        block = pd.DataFrame(
+            np.concatenate([sim[feat] for feat in HOURLY_FEATURES], axis=1),
+            columns=[f"{feat}_{hour}" for feat in HOURLY_FEATURES for hour in range(1, 25)]
+        )
+        block.insert(0, "date", sim["dates"].strftime("%Y-%m-%d"))
+        if locations > 1:
+            block.insert(1, "location", location)
+        blocks.append(block)
+    return pd.concat(blocks, ignore_index=True)
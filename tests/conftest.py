@@ -0,0 +1,25 @@
+import os
+import pytest
+from src.datascience.config.configuration import ConfigurationManager
+from src.datascience.utils.synthetic import generate_daily
+
+
+@pytest.fixture
+def transformation_config(tmp_path):
+    """
+    DataTransformationConfig of config.yaml pointed at a small synthetic data.csv in tmp_path.
+    """
+    data_path = tmp_path / "data.csv"
+    generate_daily(days=400, locations=3).to_csv(data_path, index=False)
+    config = ConfigurationManager().get_data_transformation_config()
+    config.root_dir = str(tmp_path)
+    config.data_path = str(data_path)
+    return config
+
+
+@pytest.fixture
+def mlflow_file_store(tmp_path, monkeypatch):
+    """
+    Local MLflow file store, so the components log without a tracking server.
+    """
+    monkeypatch.setenv("MLFLOW_TRACKING_URI", f"file:{os.path.join(tmp_path, 'mlruns')}")
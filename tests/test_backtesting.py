@@ -0,0 +1,50 @@
+import json
+import joblib
+import pandas as pd
+import pytest
+from sklearn.linear_model import LogisticRegression
+from src.datascience.components.backtesting import Backtesting
+from src.datascience.components.data_transformation import DataTransformation
+from src.datascience.config.configuration import ConfigurationManager
+
+# What prune_features dropped in the reported run
+PRUNED = ["wind_speed_10m_avg", "wind_dir_sin", "wind_dir_cos"]
+
+
+@pytest.fixture
+def backtesting_config(tmp_path, transformation_config, mlflow_file_store):
+    """
+    Backtest of a logistic regression trained on a pruned feature list.
+    """
+    transformation = DataTransformation(transformation_config)
+    transformation.feature_extraction()
+    transformation.feature_transformation()
+    transformation.train_test_split_()
+
+    train = pd.read_csv(tmp_path / "train.csv")
+    features = [col for col in train.columns if col not in ["rain", *PRUNED]]
+    model = LogisticRegression(max_iter=1000).fit(train[features].to_numpy(), train["rain"].to_numpy())
+    joblib.dump(model, tmp_path / "best_model.joblib")
+    (tmp_path / "feature_names.json").write_text(json.dumps(features))
+
+    config = ConfigurationManager().get_backtesting_config()
+    config.root_dir = str(tmp_path)
+    config.data_path = transformation_config.data_path
+    config.model_path = str(tmp_path / "best_model.joblib")
+    config.feature_names_path = str(tmp_path / "feature_names.json")
+    config.initial_train_days = 200
+    config.test_days = 50
+    config.step_days = 50
+    config.n_jobs = 2
+    return config
+
+
+@pytest.mark.parametrize("warm_start", [True, False])
+def test_backtest_pruned_features(backtesting_config, tmp_path, warm_start):
+    backtesting_config.warm_start = warm_start
+    results = Backtesting(backtesting_config).backtest()
+
+    assert len(results) == 4
+    assert results["roc_auc"].between(0.5, 1.0).all()
+    summary = json.loads((tmp_path / "backtest.json").read_text())["summary"]
+    assert summary["windows"] == 4
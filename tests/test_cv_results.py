@@ -0,0 +1,59 @@
+import json
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.model_selection import GridSearchCV
+from sklearn.svm import SVC
+from src.datascience.utils.cv_results import load_cv_leaderboard, save_cv_results
+
+
+@pytest.fixture(scope="module")
+def svc_results():
+    X, y = make_classification(n_samples=200, n_features=4, random_state=0)
+    # Mixed gamma ("scale", 0.1), a kernel that does not use gamma, ints and bools
+    grid = [
+        {"kernel": ["rbf"], "gamma": ["scale", 0.1], "C": [1, 10], "shrinking": [True]},
+        {"kernel": ["linear"], "C": [1], "shrinking": [False]},
+    ]
+    return GridSearchCV(SVC(), grid, cv=3, scoring="roc_auc").fit(X, y).cv_results_
+
+
+def test_parquet_round_trip(svc_results, tmp_path):
+    path = save_cv_results(svc_results, tmp_path / "cv_results" / "svm-run1.parquet", model_name="svm", run_id="run1")
+    frame = pd.read_parquet(path)
+
+    assert len(frame) == 5
+    assert (frame["model"] == "svm").all() and (frame["run_id"] == "run1").all()
+    np.testing.assert_allclose(frame["mean_test_score"], svc_results["mean_test_score"])
+    np.testing.assert_array_equal(frame["rank_test_score"], svc_results["rank_test_score"])
+
+    assert frame["param_C"].dtype == "Int64"
+    assert frame["param_shrinking"].dtype == "boolean"
+    # Mixed types are stored as strings, and the kernel that does not use gamma gets a null
+    assert frame["param_gamma"].dtype == "string"
+    assert frame["param_gamma"].isna().sum() == 1
+    # The exact values are kept in params
+    assert [json.loads(p) for p in frame["params"]] == [
+        json.loads(json.dumps(p, default=str, sort_keys=True)) for p in svc_results["params"]
+    ]
+
+
+def test_leaderboard_merges_runs_and_families(svc_results, tmp_path):
+    results_dir = tmp_path / "cv_results"
+    save_cv_results(svc_results, results_dir / "svm-run1.parquet", model_name="svm", run_id="run1")
+    other = dict(svc_results, mean_test_score=np.asarray(svc_results["mean_test_score"]) + 1.0)
+    save_cv_results(other, results_dir / "svm-run2.parquet", model_name="svm", run_id="run2")
+    extra = save_cv_results(svc_results, tmp_path / "elsewhere.parquet", model_name="svm_copy", run_id="run3")
+
+    leaderboard = load_cv_leaderboard([results_dir, extra])
+
+    assert len(leaderboard) == 15
+    assert leaderboard["mean_test_score"].is_monotonic_decreasing
+    assert (leaderboard["run_id"].iloc[:5] == "run2").all()
+    np.testing.assert_array_equal(leaderboard["overall_rank"], np.arange(1, 16))
+
+
+def test_leaderboard_without_files(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_cv_leaderboard([tmp_path])
@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+from src.datascience.components.data_transformation import DataTransformation
+
+
+def _split(config):
+    transformation = DataTransformation(config)
+    if config.chunk_size:
+        transformation.stream_transform()
+    else:
+        transformation.feature_extraction()
+        transformation.feature_transformation()
+        transformation.train_test_split_()
+    return pd.read_csv(f"{config.root_dir}/train.csv"), pd.read_csv(f"{config.root_dir}/test.csv")
+
+
+@pytest.mark.parametrize("chunk_size", [97, 500])
+def test_stream_split_keeps_class_ratios(transformation_config, chunk_size):
+    train, test = _split(transformation_config)
+
+    transformation_config.chunk_size = chunk_size
+    stream_train, stream_test = _split(transformation_config)
+
+    assert len(stream_train) + len(stream_test) == len(train) + len(test)
+    # Both are stratified: each class is split at test_size up to one row
+    for label in (0, 1):
+        assert abs((stream_test["rain"] == label).sum() - (test["rain"] == label).sum()) <= 1
+        assert abs((stream_train["rain"] == label).sum() - (train["rain"] == label).sum()) <= 1
+    assert stream_test["rain"].mean() == pytest.approx(test["rain"].mean(), abs=0.01)
+
+
+def test_stream_split_does_not_depend_on_chunk_size(transformation_config):
+    transformation_config.chunk_size = 97
+    _, test = _split(transformation_config)
+
+    transformation_config.chunk_size = 500
+    _, other = _split(transformation_config)
+
+    pd.testing.assert_frame_equal(test, other)
@@ -0,0 +1,50 @@
+import json
+from pathlib import Path
+import pandas as pd
+import pytest
+from src.datascience.components.data_validation import DataValidation, DataValidationError
+from src.datascience.config.configuration import ConfigurationManager
+from src.datascience.utils.synthetic import generate_daily
+
+
+@pytest.fixture
+def validation_config(tmp_path):
+    """
+    DataValidationConfig of config.yaml pointed at tmp_path, small chunks so rows repeat across chunks.
+    """
+    config = ConfigurationManager().get_data_validation_config()
+    config.root_dir = str(tmp_path)
+    config.unzip_data_dir = str(tmp_path / "data.csv")
+    config.STATUS_FILE = str(tmp_path / "status.txt")
+    config.chunk_size = 100
+    return config
+
+
+def _report(config):
+    return json.loads((Path(config.root_dir) / "validation_report.json").read_text())
+
+
+def test_multi_location_data_passes(validation_config):
+    generate_daily(days=150, locations=3).to_csv(validation_config.unzip_data_dir, index=False)
+
+    assert DataValidation(validation_config).validate()
+    assert _report(validation_config)["duplicated_keys"] == 0
+
+
+def test_repeated_location_and_date_fails(validation_config):
+    data = generate_daily(days=150, locations=3)
+    # The same (location, date) again, in a later chunk
+    pd.concat([data, data.iloc[[10]]]).to_csv(validation_config.unzip_data_dir, index=False)
+
+    with pytest.raises(DataValidationError):
+        DataValidation(validation_config).validate()
+    assert _report(validation_config)["duplicated_keys"] == 1
+
+
+def test_repeated_date_without_location_fails(validation_config):
+    data = generate_daily(days=150, locations=3).drop(columns=["location"])
+    data.to_csv(validation_config.unzip_data_dir, index=False)
+
+    with pytest.raises(DataValidationError):
+        DataValidation(validation_config).validate()
+    assert _report(validation_config)["duplicated_keys"] > 0
@@ -0,0 +1,94 @@
+import time
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold
+from src.datascience.components.fold_score_cache import FoldScoreCache, fingerprint_data
+from src.datascience.components.model_search import CachedGridSearchCV
+
+PARAM_GRID = {"C": [0.1, 1, 10], "max_iter": [2000]}
+
+
+@pytest.fixture
+def data():
+    X, y = make_classification(n_samples=400, n_features=6, random_state=0)
+    return X, y, list(StratifiedKFold(n_splits=3).split(X, y))
+
+
+def _search(cache, X, y, folds, param_grid=PARAM_GRID):
+    return CachedGridSearchCV(
+        LogisticRegression(), param_grid, cv=folds, scoring="roc_auc", n_jobs=1,
+        cache=cache, data_hash=fingerprint_data(X, y)
+    ).fit(X, y)
+
+
+def test_second_search_only_reads_the_cache(data, tmp_path):
+    X, y, folds = data
+    cache = FoldScoreCache(tmp_path / "cache.sqlite")
+
+    first = _search(cache, X, y, folds)
+    assert (first.cache_hits_, first.cache_misses_) == (0, 9)
+
+    second = _search(cache, X, y, folds)
+    assert (second.cache_hits_, second.cache_misses_) == (9, 0)
+    np.testing.assert_array_equal(second.cv_results_["mean_test_score"], first.cv_results_["mean_test_score"])
+    # Timings come from the cache too, so the report still shows what the fits cost
+    np.testing.assert_array_equal(second.cv_results_["mean_fit_time"], first.cv_results_["mean_fit_time"])
+
+    # A larger grid only fits the new candidate
+    third = _search(cache, X, y, folds, {**PARAM_GRID, "C": [0.1, 1, 10, 100]})
+    assert (third.cache_hits_, third.cache_misses_) == (9, 3)
+
+
+def test_changed_data_misses_the_cache(data, tmp_path):
+    X, y, folds = data
+    cache = FoldScoreCache(tmp_path / "cache.sqlite")
+    _search(cache, X, y, folds)
+
+    X_changed = X.copy()
+    X_changed[0, 0] += 1.0
+    assert fingerprint_data(X_changed, y) != fingerprint_data(X, y)
+    # Same dtype change alone gives a new fingerprint as well
+    assert fingerprint_data(X.astype(np.float32), y) != fingerprint_data(X, y)
+
+    search = _search(cache, X_changed, y, folds)
+    assert (search.cache_hits_, search.cache_misses_) == (0, 9)
+
+
+def test_key_depends_on_params_fold_and_scoring(data):
+    X, y, folds = data
+    estimator, test = LogisticRegression(), folds[0][1]
+    key = FoldScoreCache.make_key(estimator, {"C": 1}, test, "roc_auc", "hash")
+
+    assert FoldScoreCache.make_key(LogisticRegression(), {"C": 1}, test.copy(), "roc_auc", "hash") == key
+    assert FoldScoreCache.make_key(estimator, {"C": 10}, test, "roc_auc", "hash") != key
+    assert FoldScoreCache.make_key(estimator, {"C": 1}, folds[1][1], "roc_auc", "hash") != key
+    assert FoldScoreCache.make_key(estimator, {"C": 1}, test, "accuracy", "hash") != key
+    assert FoldScoreCache.make_key(LogisticRegression(tol=1e-6), {"C": 1}, test, "roc_auc", "hash") != key
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = FoldScoreCache(tmp_path / "cache.sqlite", max_entries=3)
+    # Access times are wall-clock, keep them apart on coarse clocks
+    for step in ({"a": (0.1, 1.0, 0.1), "b": (0.2, 1.0, 0.1)}, {"c": (0.3, 1.0, 0.1)}):
+        cache.put_many(step)
+        time.sleep(0.01)
+    # Reading a refreshes its access time, so b is now the oldest
+    cache.get_many(["a"])
+    time.sleep(0.01)
+    cache.put_many({"d": (0.4, 1.0, 0.1)})
+
+    found = cache.get_many(["a", "b", "c", "d"])
+    assert sorted(found) == ["a", "c", "d"]
+    assert found["d"] == (0.4, 1.0, 0.1)
+
+
+def test_failed_fits_are_cached_as_nan(tmp_path):
+    cache = FoldScoreCache(tmp_path / "cache.sqlite")
+    cache.put_many({"failed": (np.nan, 0.5, 0.0)})
+
+    score, fit_time, _ = cache.get_many(["failed", "missing"])["failed"]
+    assert np.isnan(score) and fit_time == 0.5
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.hit_rate == 0.5
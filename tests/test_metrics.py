@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+from sklearn.metrics import average_precision_score, classification_report, roc_auc_score
+from src.datascience.utils.metrics import (
+    binary_curves,
+    confusion_from_labels,
+    report_from_confusion,
+    StreamingBinaryMetrics,
+)
+
+
+def _assert_same_report(report, expected):
+    assert report.keys() == expected.keys()
+    for key, value in expected.items():
+        assert report[key] == pytest.approx(value)
+
+
+def _labels(seed, n=500, rate=0.3):
+    rng = np.random.default_rng(seed)
+    y_true = (rng.random(n) < rate).astype(int)
+    # Rounded scores so some of them tie
+    y_score = np.round(np.clip(0.3 * y_true + rng.random(n) * 0.7, 0, 1), 2)
+    return y_true, y_score, (y_score > 0.5).astype(int)
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_curves_match_sklearn(seed):
+    y_true, y_score, _ = _labels(seed)
+    curves = binary_curves(y_true, y_score)
+    assert curves["roc_auc"] == pytest.approx(roc_auc_score(y_true, y_score), abs=1e-12)
+    assert curves["average_precision"] == pytest.approx(average_precision_score(y_true, y_score), abs=1e-12)
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_curves_of_a_single_class():
+    y_true, y_score = np.zeros(50, dtype=int), np.linspace(0, 1, 50)
+    curves = binary_curves(y_true, y_score)
+    # roc_auc_score raises here, so the undefined value is reported as nan
+    assert np.isnan(curves["roc_auc"])
+    assert curves["average_precision"] == average_precision_score(y_true, y_score)
+
+
+@pytest.mark.filterwarnings("ignore::sklearn.exceptions.UndefinedMetricWarning")
+@pytest.mark.parametrize("case", ["both", "no_rain", "no_rain_predicted", "never_predicted_rain"])
+def test_report_matches_classification_report(case):
+    y_true, _, y_pred = _labels(0)
+    if case == "no_rain":
+        y_true, y_pred = np.zeros_like(y_true), np.zeros_like(y_pred)
+    elif case == "no_rain_predicted":
+        y_true = np.zeros_like(y_true)
+    elif case == "never_predicted_rain":
+        y_pred = np.zeros_like(y_pred)
+
+    report = report_from_confusion(confusion_from_labels(y_true, y_pred))
+    expected = classification_report(y_true.astype(str), y_pred.astype(str), output_dict=True)
+    _assert_same_report(report, expected)
+
+
+@pytest.mark.filterwarnings("ignore::sklearn.exceptions.UndefinedMetricWarning")
+@pytest.mark.parametrize("labels", [[0, 1], [1], [0]])
+def test_report_with_explicit_labels(labels):
+    y_true, _, y_pred = _labels(1)
+    y_true = np.zeros_like(y_true)
+
+    report = report_from_confusion(confusion_from_labels(y_true, y_pred), labels=labels)
+    expected = classification_report(y_true, y_pred, labels=labels, target_names=[str(l) for l in labels],
+                                     output_dict=True)
+    _assert_same_report(report, expected)
+
+
+def test_streaming_matches_in_memory():
+    y_true, y_score, y_pred = _labels(2)
+    streaming = StreamingBinaryMetrics(n_bins=100)
+    for chunk in np.array_split(np.arange(len(y_true)), 7):
+        streaming.update(y_true[chunk], y_pred[chunk], y_score[chunk])
+
+    np.testing.assert_array_equal(streaming.confusion, confusion_from_labels(y_true, y_pred))
+    # Scores have two decimals, so 100 bins lose nothing but the ties on bin edges
+    curves = streaming.curves()
+    assert curves["roc_auc"] == pytest.approx(roc_auc_score(y_true, y_score), abs=1e-2)
+    assert curves["average_precision"] == pytest.approx(average_precision_score(y_true, y_score), abs=1e-2)
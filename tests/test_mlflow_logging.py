@@ -0,0 +1,93 @@
+import os
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+import mlflow
+import mlflow.sklearn
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+from src.datascience.utils.mlflow_logging import MAX_METRICS_PER_BATCH, AsyncMlflowLogger
+
+
+@pytest.fixture
+def tracker(mlflow_file_store):
+    """
+    AsyncMlflowLogger on a fresh experiment of the local file store.
+    """
+    # The components set the tracking URI globally, point it at this test's store
+    mlflow.set_tracking_uri(os.environ["MLFLOW_TRACKING_URI"])
+    experiment = mlflow.set_experiment("async-logger-test")
+    tracker = AsyncMlflowLogger(experiment.experiment_id)
+    yield tracker
+    tracker.close(status="FAILED")
+
+
+def test_logs_reach_the_file_store(tracker, tmp_path):
+    run_id = tracker.start_run(run_name="train:test")
+    other_id = tracker.start_run(run_name="train:other")
+    tracker.log_params(run_id, {"C": 1.0, "solver": "lbfgs"})
+    # More values than a single log_batch request takes
+    for step in range(MAX_METRICS_PER_BATCH + 10):
+        tracker.log_metrics(run_id, {"loss": 1.0 / (step + 1)}, step=step)
+
+    artifact = tmp_path / "report.json"
+    artifact.write_text("{}")
+    tracker.log_artifact(run_id, str(artifact))
+    figure = plt.figure()
+    tracker.log_figure(run_id, figure, "plots/figure.png")
+    plt.close(figure)
+    model = LogisticRegression().fit(np.array([[0.0], [1.0], [2.0], [3.0]]), [0, 0, 1, 1])
+    tracker.log_model(run_id, model, artifact_path="model")
+    tracker.end_run(other_id, status="KILLED")
+    tracker.close()
+
+    client = tracker.client
+    run = client.get_run(run_id)
+    assert run.info.status == "FINISHED"
+    assert run.data.params == {"C": "1.0", "solver": "lbfgs"}
+    assert len(client.get_metric_history(run_id, "loss")) == MAX_METRICS_PER_BATCH + 10
+    assert sorted(a.path for a in client.list_artifacts(run_id)) == ["model", "plots", "report.json"]
+    assert [a.path for a in client.list_artifacts(run_id, "plots")] == ["plots/figure.png"]
+    loaded = mlflow.sklearn.load_model(f"runs:/{run_id}/model")
+    np.testing.assert_array_equal(loaded.predict([[0.0], [3.0]]), [0, 1])
+    assert client.get_run(other_id).info.status == "KILLED"
+
+
+def test_background_errors_raise_on_success(tracker):
+    run_id = tracker.start_run(run_name="train:test")
+    tracker.log_params(run_id, {"C": 1.0})
+    tracker.log_params("not-a-run", {"C": 1.0})
+
+    with pytest.raises(RuntimeError, match="1 MLflow logging calls failed"):
+        tracker.close()
+    # The valid run was still sent and terminated
+    assert tracker.client.get_run(run_id).data.params == {"C": "1.0"}
+    assert tracker.client.get_run(run_id).info.status == "FINISHED"
+
+
+def test_background_errors_are_only_logged_on_failure(tracker):
+    run_id = tracker.start_run(run_name="train:test")
+    tracker.log_artifact(run_id, "missing_file.json")
+
+    # Closing after a failure must not replace the caller's exception
+    tracker.close(status="FAILED")
+    assert tracker.client.get_run(run_id).info.status == "FAILED"
+    # A second close is a no-op
+    tracker.close()
+
+
+def test_uploads_to_a_run_of_an_earlier_session(tracker, tmp_path):
+    # A resumed training logs the winner model to a run created by a previous logger
+    run_id = tracker.client.create_run(tracker.experiment_id, run_name="train:earlier").info.run_id
+    artifact = tmp_path / "report.json"
+    artifact.write_text("{}")
+    for step in range(50):
+        tracker.log_metrics(run_id, {"loss": float(step)}, step=step)
+        tracker.log_artifact(run_id, str(artifact), artifact_path=f"reports/{step}")
+    tracker.close()
+
+    assert len(tracker.client.list_artifacts(run_id, "reports")) == 50
+    assert len(tracker.client.get_metric_history(run_id, "loss")) == 50
+    # Only runs started by this logger are terminated by it
+    assert tracker.client.get_run(run_id).info.status == "RUNNING"
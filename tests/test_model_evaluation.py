@@ -0,0 +1,71 @@
+import json
+import joblib
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from src.datascience.components.data_transformation import DataTransformation
+from src.datascience.components.model_evaluation import ModelEvaluation
+from src.datascience.components.stacking import StackedEnsemble
+from src.datascience.config.configuration import ConfigurationManager
+
+
+@pytest.fixture
+def evaluation_config(tmp_path, transformation_config, mlflow_file_store):
+    """
+    Evaluation of a StackedEnsemble saved as the best model, on the synthetic train/test split.
+    """
+    transformation = DataTransformation(transformation_config)
+    transformation.feature_extraction()
+    transformation.feature_transformation()
+    transformation.train_test_split_()
+
+    train = pd.read_csv(tmp_path / "train.csv")
+    features = [col for col in train.columns if col != "rain"]
+    ensemble = StackedEnsemble(
+        {"logistic_regression": LogisticRegression(max_iter=2000),
+         "random_forest": RandomForestClassifier(n_estimators=20, max_depth=5, random_state=42)},
+        cv=3
+    ).fit(train[features].to_numpy(), train["rain"].to_numpy())
+
+    model_path = tmp_path / "best_model.joblib"
+    joblib.dump(ensemble, model_path)
+    (tmp_path / "feature_names.json").write_text(json.dumps(features))
+
+    config = ConfigurationManager().get_model_evaluation_config()
+    config.root_dir = str(tmp_path)
+    config.test_data_path = str(tmp_path / "test.csv")
+    config.model_path = str(model_path)
+    config.train_run_id_path = str(tmp_path / "train_run_id.txt")
+    config.feature_names_path = str(tmp_path / "feature_names.json")
+    config.selected_features_path = str(tmp_path / "selected_features.json")
+    config.plots = False
+    config.log_model = True
+    config.permutation_importance = True
+    config.importance_repeats = 2
+    config.importance_n_jobs = 2
+    config.compare_top_k = 0
+    return config
+
+
+def test_evaluate_stacked_best_model(evaluation_config, tmp_path):
+    ModelEvaluation(evaluation_config).evaluate()
+
+    metrics = json.loads((tmp_path / "test_metrics.json").read_text())["metrics"]
+    assert 0.5 < metrics["roc_auc"] <= 1.0
+
+    importance = json.loads((tmp_path / "permutation_importance.json").read_text())
+    assert importance["baseline_score"] == pytest.approx(metrics["roc_auc"])
+    features = json.loads((tmp_path / "feature_names.json").read_text())
+    assert sorted(row["feature"] for row in importance["features"]) == sorted(features)
+
+
+def test_compare_top_k_skips_missing_leaderboard(evaluation_config, tmp_path):
+    evaluation_config.compare_top_k = 3
+    evaluation_config.compare_n_jobs = 2
+    evaluation_config.leaderboard_path = str(tmp_path / "missing_leaderboard.json")
+    assert ModelEvaluation(evaluation_config)._compare_top_k(run_id="") is None
+
+    (tmp_path / "cv_leaderboard.json").write_text("[]")
+    evaluation_config.leaderboard_path = str(tmp_path / "cv_leaderboard.json")
+    assert ModelEvaluation(evaluation_config)._compare_top_k(run_id="") is None
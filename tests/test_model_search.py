@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import GridSearchCV, StratifiedKFold
+from src.datascience.components.fold_score_cache import FoldScoreCache, fingerprint_data
+from src.datascience.components.model_search import CachedGridSearchCV, LogisticPathSearchCV
+
+PARAM_GRID = [
+    {"solver": ["lbfgs"], "C": [0.001, 0.01, 0.1, 1, 10], "max_iter": [5000]},
+    {"solver": ["liblinear"], "penalty": ["l1", "l2"], "C": [0.01, 1], "max_iter": [5000]},
+]
+
+
+@pytest.fixture
+def data():
+    X, y = make_classification(n_samples=600, n_features=8, n_informative=4, random_state=0)
+    folds = list(StratifiedKFold(n_splits=4).split(X, y))
+    return X, y, folds
+
+
+def _scores_by_params(search):
+    results = search.cv_results_
+    return {repr(sorted(params.items())): score for params, score in zip(results["params"], results["mean_test_score"])}
+
+
+def test_path_search_matches_grid_search(data):
+    X, y, folds = data
+    grid = GridSearchCV(LogisticRegression(), PARAM_GRID, cv=folds, scoring="roc_auc").fit(X, y)
+    path = LogisticPathSearchCV(LogisticRegression(), PARAM_GRID, cv=folds, scoring="roc_auc", n_jobs=2).fit(X, y)
+
+    expected, actual = _scores_by_params(grid), _scores_by_params(path)
+    assert actual.keys() == expected.keys()
+    # Warm starts stop at a slightly different point than cold fits
+    np.testing.assert_allclose([actual[key] for key in expected], list(expected.values()), rtol=0, atol=1e-4)
+    assert path.best_score_ == pytest.approx(grid.best_score_, abs=1e-4)
+
+
+def test_cache_keeps_path_and_grid_scores_apart(data, tmp_path):
+    X, y, folds = data
+    cache = FoldScoreCache(tmp_path / "cache.sqlite")
+    kwargs = {"cv": folds, "scoring": "roc_auc", "n_jobs": 1, "cache": cache, "data_hash": fingerprint_data(X, y)}
+    n_pairs = sum(len(grid["C"]) * len(grid.get("penalty", [None])) for grid in PARAM_GRID) * len(folds)
+
+    path = LogisticPathSearchCV(LogisticRegression(), PARAM_GRID, **kwargs).fit(X, y)
+    assert (path.cache_hits_, path.cache_misses_) == (0, n_pairs)
+
+    # Same candidates and folds, but fitted from scratch: none of the warm-started scores apply
+    grid = CachedGridSearchCV(LogisticRegression(), PARAM_GRID, **kwargs).fit(X, y)
+    assert (grid.cache_hits_, grid.cache_misses_) == (0, n_pairs)
+
+    assert LogisticPathSearchCV(LogisticRegression(), PARAM_GRID, **kwargs).fit(X, y).cache_hits_ == n_pairs
+    assert CachedGridSearchCV(LogisticRegression(), PARAM_GRID, **kwargs).fit(X, y).cache_hits_ == n_pairs
@@ -0,0 +1,98 @@
+import json
+import sqlite3
+from pathlib import Path
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from box import ConfigBox
+from mlflow.tracking import MlflowClient
+from src.datascience.components.data_transformation import DataTransformation
+from src.datascience.components.model_training import ModelTrainer
+from src.datascience.config.configuration import ConfigurationManager
+
+GRID = {
+    "model_params": {
+        "logistic_regression": [{"solver": ["lbfgs"], "C": [0.1, 1], "max_iter": [1000]}],
+        "random_forest": {"n_estimators": [20], "max_depth": [5]},
+    }
+}
+
+
+@pytest.fixture
+def trainer_config(tmp_path, transformation_config, mlflow_file_store):
+    """
+    ModelTrainerConfig with two small grids on the synthetic train split, resume on.
+    """
+    transformation = DataTransformation(transformation_config)
+    transformation.feature_extraction()
+    transformation.feature_transformation()
+    transformation.train_test_split_()
+
+    root_dir = tmp_path / "model_trainer"
+    root_dir.mkdir()
+    config = ConfigurationManager().get_model_trainer_config()
+    config.root_dir = str(root_dir)
+    config.train_data_path = str(tmp_path / "train.csv")
+    config.test_data_path = str(tmp_path / "test.csv")
+    config.available_models = list(GRID["model_params"])
+    config.params = ConfigBox(GRID)
+    config.cross_validation = 3
+    config.score_cache_path = str(root_dir / "score_cache.sqlite")
+    config.checkpoint_dir = str(root_dir / "checkpoints")
+    config.parallel_backend = "loky"
+    config.search_subsample = False
+    config.use_selected_features = False
+    config.stacking = False
+    config.resume = True
+    config.log_all_models = False
+    config.max_predict_latency_ms = None
+    config.max_model_size_mb = None
+    return config
+
+
+def _selection_runs(client):
+    experiment = client.get_experiment_by_name("rain-prediction")
+    runs = client.search_runs([experiment.experiment_id], "attributes.run_name = 'train:selection'")
+    return sorted(runs, key=lambda run: run.info.start_time)
+
+
+def test_resume_with_changed_budget(trainer_config):
+    ModelTrainer(trainer_config).train()
+    first_run_id = (Path(trainer_config.root_dir) / "train_run_id.txt").read_text()
+
+    # Both families come from their checkpoints, so the winner's run is the finished one above
+    trainer_config.max_model_size_mb = 100.0
+    trainer_config.max_predict_latency_ms = 1000.0
+    ModelTrainer(trainer_config).train()
+    assert (Path(trainer_config.root_dir) / "train_run_id.txt").read_text() == first_run_id
+
+    client = MlflowClient()
+    first, second = _selection_runs(client)
+    assert first.data.params["selected_run_id"] == second.data.params["selected_run_id"] == first_run_id
+    assert first.data.params["max_model_size_mb"] == "None"
+    assert second.data.params["max_model_size_mb"] == "100.0"
+    assert second.info.status == "FINISHED"
+
+    leaderboard = json.loads((Path(trainer_config.root_dir) / "cv_leaderboard.json").read_text())
+    winner = next(entry for entry in leaderboard if entry["selected"])
+    # The winner model stays in its own family run, not in the selection runs
+    assert winner["model"] in [artifact.path for artifact in client.list_artifacts(first_run_id)]
+    assert client.list_artifacts(second.info.run_id) == []
+
+
+def test_stacking_on_family_winners_oof(trainer_config):
+    trainer_config.stacking = True
+    trainer_config.score_cache = True
+    ModelTrainer(trainer_config).train()
+
+    n_rows = len(pd.read_csv(trainer_config.train_data_path))
+    for name in GRID["model_params"]:
+        oof = joblib.load(Path(trainer_config.checkpoint_dir) / f"{name}.joblib")["oof_predictions"]
+        assert oof.shape == (n_rows,) and oof.dtype == np.float32 and np.isfinite(oof).all()
+    assert (Path(trainer_config.checkpoint_dir) / "stacking.joblib").exists()
+
+    # The fold score cache only keeps scores and timings
+    with sqlite3.connect(trainer_config.score_cache_path) as conn:
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(fold_scores)")]
+    assert columns == ["key", "score", "fit_time", "score_time", "last_access"]
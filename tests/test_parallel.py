@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from joblib.parallel import get_active_backend
+from sklearn.datasets import make_classification
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold
+from src.datascience.components.model_search import CachedGridSearchCV
+from src.datascience.utils import parallel
+from src.datascience.utils.parallel import LOCAL_CLUSTER, check_backend, parallel_backend
+
+PARAM_GRID = {"C": [0.01, 0.1, 1, 10], "max_iter": [2000]}
+
+
+def _search(X, y):
+    folds = list(StratifiedKFold(n_splits=3).split(X, y))
+    return CachedGridSearchCV(LogisticRegression(), PARAM_GRID, cv=folds, scoring="roc_auc", n_jobs=-1).fit(X, y)
+
+
+def test_cached_grid_search_on_local_dask_cluster():
+    pytest.importorskip("dask.distributed")
+    X, y = make_classification(n_samples=500, n_features=6, random_state=0)
+
+    # "local" starts dask.distributed.Client(processes=False) inside the test process
+    with parallel_backend("dask", scheduler_address=LOCAL_CLUSTER, scatter=[X, y]):
+        assert type(get_active_backend()[0]).__name__ == "DaskDistributedBackend"
+        on_dask = _search(X, y)
+    on_loky = _search(X, y)
+
+    np.testing.assert_allclose(on_dask.cv_results_["mean_test_score"], on_loky.cv_results_["mean_test_score"])
+    assert on_dask.best_params_ == on_loky.best_params_
+
+
+def test_missing_backend_fails_fast(monkeypatch):
+    monkeypatch.setitem(parallel.BACKEND_MODULES, "ray", "not_installed_backend.module")
+    with pytest.raises(ImportError, match=r"pip install -e \.\[ray\]"):
+        check_backend("ray")
+    with pytest.raises(ImportError):
+        with parallel_backend("ray"):
+            pass
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError, match="Unknown parallel backend"):
+        check_backend("threads")
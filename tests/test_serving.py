@@ -0,0 +1,19 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.linear_model import LogisticRegression
+from sklearn.svm import SVC
+from src.datascience.utils.serving import score_batch
+
+
+@pytest.mark.filterwarnings("ignore::FutureWarning")
+@pytest.mark.parametrize("model", [LogisticRegression(), SVC(probability=True, random_state=0), SVC()])
+def test_score_batch_labels_match_predict(model):
+    X, y = make_classification(n_samples=2000, n_features=5, random_state=0)
+    model.fit(X, y)
+
+    chunks = list(score_batch(model, pd.DataFrame(X), chunk_size=700))
+
+    assert [done for done, _, _ in chunks] == [700, 1400, 2000]
+    np.testing.assert_array_equal(np.concatenate([labels for _, labels, _ in chunks]), model.predict(X))